@@ -0,0 +1,26 @@
+"""Add thumbnail worker lease to documents
+
+Revision ID: add_document_thumbnail_lease
+Revises: add_verification_codes
+Create Date: 2026-10-19 00:00:09.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "add_document_thumbnail_lease"
+down_revision = "add_verification_codes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "document",
+        sa.Column("thumbnail_locked_until", sa.DateTime(), nullable=True),
+    )
+
+
+def downgrade():
+    op.drop_column("document", "thumbnail_locked_until")
@@ -0,0 +1,58 @@
+"""Add first-page thumbnails to documents
+
+Revision ID: add_document_thumbnails
+Revises: add_image_dimensions
+Create Date: 2026-10-19 00:00:06.000000
+
+"""
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "add_document_thumbnails"
+down_revision = "add_image_dimensions"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "document",
+        sa.Column(
+            "thumbnail_status",
+            sqlmodel.sql.sqltypes.AutoString(length=20),
+            nullable=False,
+            server_default="unavailable",
+        ),
+    )
+    op.add_column(
+        "document",
+        sa.Column(
+            "thumbnail_path",
+            sqlmodel.sql.sqltypes.AutoString(length=512),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_document_thumbnail_pending",
+        "document",
+        ["created_at"],
+        unique=False,
+        postgresql_where=sa.text("thumbnail_status = 'pending'"),
+    )
+    # Existing PDFs are rendered by the thumbnail worker in the background
+    op.execute(
+        "UPDATE document SET thumbnail_status = 'pending' "
+        "WHERE mime_type = 'application/pdf'"
+    )
+
+
+def downgrade():
+    op.drop_index(
+        "ix_document_thumbnail_pending",
+        table_name="document",
+        postgresql_where=sa.text("thumbnail_status = 'pending'"),
+    )
+    op.drop_column("document", "thumbnail_path")
+    op.drop_column("document", "thumbnail_status")
@@ -0,0 +1,42 @@
+"""Add email outbox
+
+Revision ID: add_email_outbox
+Revises: add_document_thumbnails
+Create Date: 2026-10-19 00:00:07.000000
+
+"""
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "add_email_outbox"
+down_revision = "add_document_thumbnails"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "emailoutbox",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("email_to", sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+        sa.Column("subject", sqlmodel.sql.sqltypes.AutoString(length=500), nullable=False),
+        sa.Column("html_content", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("last_error", sqlmodel.sql.sqltypes.AutoString(length=500), nullable=True),
+        sa.Column("next_attempt_at", sa.DateTime(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_emailoutbox_next_attempt_at"),
+        "emailoutbox",
+        ["next_attempt_at"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index(op.f("ix_emailoutbox_next_attempt_at"), table_name="emailoutbox")
+    op.drop_table("emailoutbox")
@@ -0,0 +1,40 @@
+"""Add file deletion queue table
+
+Revision ID: add_file_deletion_queue
+Revises: add_listing_indexes
+Create Date: 2026-10-19 00:00:02.000000
+
+"""
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "add_file_deletion_queue"
+down_revision = "add_listing_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "filedeletion",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("file_path", sqlmodel.sql.sqltypes.AutoString(length=512), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("last_error", sqlmodel.sql.sqltypes.AutoString(length=500), nullable=True),
+        sa.Column("next_attempt_at", sa.DateTime(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_filedeletion_next_attempt_at"),
+        "filedeletion",
+        ["next_attempt_at"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index(op.f("ix_filedeletion_next_attempt_at"), table_name="filedeletion")
+    op.drop_table("filedeletion")
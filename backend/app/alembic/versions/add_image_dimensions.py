@@ -0,0 +1,28 @@
+"""Add width and height to news and person images
+
+Revision ID: add_image_dimensions
+Revises: add_image_placeholders
+Create Date: 2026-10-19 00:00:05.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "add_image_dimensions"
+down_revision = "add_image_placeholders"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing rows are filled by scripts/backfill_image_dimensions.py
+    for table in ("newsimage", "personimage"):
+        op.add_column(table, sa.Column("width", sa.Integer(), nullable=True))
+        op.add_column(table, sa.Column("height", sa.Integer(), nullable=True))
+
+
+def downgrade():
+    for table in ("personimage", "newsimage"):
+        op.drop_column(table, "height")
+        op.drop_column(table, "width")
@@ -0,0 +1,36 @@
+"""Add placeholder previews to news and person images
+
+Revision ID: add_image_placeholders
+Revises: add_image_processing_jobs
+Create Date: 2026-10-19 00:00:04.000000
+
+"""
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "add_image_placeholders"
+down_revision = "add_image_processing_jobs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "newsimage",
+        sa.Column(
+            "placeholder", sqlmodel.sql.sqltypes.AutoString(length=1024), nullable=True
+        ),
+    )
+    op.add_column(
+        "personimage",
+        sa.Column(
+            "placeholder", sqlmodel.sql.sqltypes.AutoString(length=1024), nullable=True
+        ),
+    )
+
+
+def downgrade():
+    op.drop_column("personimage", "placeholder")
+    op.drop_column("newsimage", "placeholder")
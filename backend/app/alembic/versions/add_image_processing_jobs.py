@@ -0,0 +1,59 @@
+"""Add news image processing status and image job queue
+
+Revision ID: add_image_processing_jobs
+Revises: add_file_deletion_queue
+Create Date: 2026-10-19 00:00:03.000000
+
+"""
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "add_image_processing_jobs"
+down_revision = "add_file_deletion_queue"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "newsimage",
+        sa.Column(
+            "status",
+            sqlmodel.sql.sqltypes.AutoString(length=20),
+            nullable=False,
+            server_default="ready",
+        ),
+    )
+    op.add_column(
+        "newsimage",
+        sa.Column(
+            "processing_error",
+            sqlmodel.sql.sqltypes.AutoString(length=500),
+            nullable=True,
+        ),
+    )
+    op.create_table(
+        "imagejob",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("image_id", sa.Uuid(), nullable=False),
+        sa.Column("source_path", sqlmodel.sql.sqltypes.AutoString(length=512), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("locked_until", sa.DateTime(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["image_id"], ["newsimage.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_imagejob_image_id"), "imagejob", ["image_id"], unique=False)
+    op.create_index(
+        op.f("ix_imagejob_locked_until"), "imagejob", ["locked_until"], unique=False
+    )
+
+
+def downgrade():
+    op.drop_index(op.f("ix_imagejob_locked_until"), table_name="imagejob")
+    op.drop_index(op.f("ix_imagejob_image_id"), table_name="imagejob")
+    op.drop_table("imagejob")
+    op.drop_column("newsimage", "processing_error")
+    op.drop_column("newsimage", "status")
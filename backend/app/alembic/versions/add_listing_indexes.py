@@ -0,0 +1,56 @@
+"""Add indexes for news, news image, document and person listing queries
+
+Revision ID: add_listing_indexes
+Revises: add_rate_limit_counter
+Create Date: 2026-10-19 00:00:01.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "add_listing_indexes"
+down_revision = "add_rate_limit_counter"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Public feed: WHERE is_published IS true
+    # ORDER BY published_at DESC NULLS LAST, created_at DESC
+    op.create_index(
+        "ix_news_published_feed",
+        "news",
+        [sa.text("published_at DESC NULLS LAST"), sa.text("created_at DESC")],
+        unique=False,
+        postgresql_where=sa.text("is_published IS true"),
+    )
+    # Admin list: ORDER BY created_at DESC
+    op.create_index(
+        "ix_news_created_at", "news", [sa.text("created_at DESC")], unique=False
+    )
+    # Images of a news item: WHERE news_id = ? ORDER BY "order"
+    op.create_index(
+        "ix_newsimage_news_id_order", "newsimage", ["news_id", "order"], unique=False
+    )
+    # Documents by category: WHERE category_id = ? ORDER BY created_at DESC
+    op.create_index(
+        "ix_document_category_id_created_at",
+        "document",
+        ["category_id", sa.text("created_at DESC")],
+        unique=False,
+    )
+    op.create_index(
+        "ix_document_created_at", "document", [sa.text("created_at DESC")], unique=False
+    )
+    # Persons by position (position delete/reassign)
+    op.create_index("ix_person_position_id", "person", ["position_id"], unique=False)
+
+
+def downgrade():
+    op.drop_index("ix_person_position_id", table_name="person")
+    op.drop_index("ix_document_created_at", table_name="document")
+    op.drop_index("ix_document_category_id_created_at", table_name="document")
+    op.drop_index("ix_newsimage_news_id_order", table_name="newsimage")
+    op.drop_index("ix_news_created_at", table_name="news")
+    op.drop_index("ix_news_published_feed", table_name="news")
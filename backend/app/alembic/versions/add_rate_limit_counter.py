@@ -0,0 +1,39 @@
+"""Add shared rate limit counter table
+
+Revision ID: add_rate_limit_counter
+Revises: f9b5d0d0cca0
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "add_rate_limit_counter"
+down_revision = "f9b5d0d0cca0"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "ratelimitcounter",
+        sa.Column("key", sqlmodel.sql.sqltypes.AutoString(length=512), nullable=False),
+        sa.Column("value", sa.Integer(), nullable=False),
+        sa.Column("expires_at", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("key"),
+    )
+    op.create_index(
+        op.f("ix_ratelimitcounter_expires_at"),
+        "ratelimitcounter",
+        ["expires_at"],
+        unique=False,
+    )
+    # Counters are disposable: skip WAL writes for every hit
+    op.execute("ALTER TABLE ratelimitcounter SET UNLOGGED")
+
+
+def downgrade():
+    op.drop_index(op.f("ix_ratelimitcounter_expires_at"), table_name="ratelimitcounter")
+    op.drop_table("ratelimitcounter")
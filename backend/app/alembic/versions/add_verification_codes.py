@@ -0,0 +1,40 @@
+"""Add verification code table
+
+Revision ID: add_verification_codes
+Revises: add_email_outbox
+Create Date: 2026-10-19 00:00:08.000000
+
+"""
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "add_verification_codes"
+down_revision = "add_email_outbox"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "verificationcode",
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column("email", sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+        sa.Column("code", sqlmodel.sql.sqltypes.AutoString(length=16), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["user.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "email"),
+    )
+    op.create_index(
+        op.f("ix_verificationcode_expires_at"),
+        "verificationcode",
+        ["expires_at"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index(op.f("ix_verificationcode_expires_at"), table_name="verificationcode")
+    op.drop_table("verificationcode")
@@ -1,16 +1,20 @@
 """FastAPI dependencies for authentication and database access."""
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 from typing import Annotated
 
 import jwt
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jwt.exceptions import InvalidTokenError
 from pydantic import ValidationError
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import settings
-from app.core.db import engine
+from app.core.db import async_engine, async_replica_engine, engine
+from app.core.db_routing import prefers_primary, replica_health
 from app.core.security import ALGORITHM
 from app.models import User
 from app.schemas import TokenPayload
@@ -36,7 +40,61 @@ def get_db() -> Generator[Session, None, None]:
         yield session
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Async database session dependency.
+
+    Used by read-heavy public routes so that waiting on PostgreSQL does not
+    hold a threadpool thread. Relationships are not lazy-loaded in async
+    sessions: load related rows explicitly.
+
+    Yields:
+        Async database session
+    """
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
+
+
+async def get_async_read_db(
+    request: Request,
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Async read-only session dependency routed to the replica.
+
+    Falls back to the primary when no replica is configured, the replica is
+    unreachable, or the client has just written data (read-your-writes).
+
+    Yields:
+        Async database session bound to the replica or the primary
+    """
+    connection = None
+    if (
+        async_replica_engine is not None
+        and not prefers_primary(request)
+        and replica_health.is_available()
+    ):
+        try:
+            connection = await async_replica_engine.connect()
+        except DBAPIError:
+            replica_health.mark_down()
+        except PoolTimeoutError:
+            pass
+
+    if connection is None:
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            yield session
+        return
+
+    try:
+        async with AsyncSession(bind=connection, expire_on_commit=False) as session:
+            yield session
+    finally:
+        await connection.close()
+
+
 SessionDep = Annotated[Session, Depends(get_db)]
+AsyncSessionDep = Annotated[AsyncSession, Depends(get_async_db)]
+AsyncReadSessionDep = Annotated[AsyncSession, Depends(get_async_read_db)]
 TokenDep = Annotated[str, Depends(reusable_oauth2)]
 
 
@@ -0,0 +1,124 @@
+"""Fast JSON responses for trusted database output and stored file responses."""
+from collections.abc import AsyncIterator, Iterable, Iterator, Sequence
+from typing import Any, Literal
+from urllib.parse import quote
+
+import orjson
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import (
+    FileResponse,
+    RedirectResponse,
+    Response,
+    StreamingResponse,
+)
+from sqlalchemy import Row
+
+from app.core.storage import LocalStorage, storage
+
+# Match pydantic's JSON output for UTC datetimes
+_ORJSON_OPTIONS = orjson.OPT_UTC_Z
+
+
+class FastJSONResponse(Response):
+    """
+    JSON response rendered with orjson.
+
+    Returning this response from a route skips ``response_model`` validation
+    and serialization entirely, so it must only wrap data that already has the
+    shape of the declared model (rows read from our own database). Keep
+    ``response_model`` on the route for the OpenAPI schema.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=_ORJSON_OPTIONS)
+
+
+def row_dicts(rows: Iterable[Row[Any]]) -> list[dict[str, Any]]:
+    """Convert column rows (``select(Model.a, Model.b)``) to plain dicts."""
+    return [dict(row._mapping) for row in rows]
+
+
+def group_rows(
+    rows: Sequence[dict[str, Any]], key: str
+) -> dict[Any, list[dict[str, Any]]]:
+    """Group row dicts by ``key``, preserving row order inside each group."""
+    grouped: dict[Any, list[dict[str, Any]]] = {}
+    for row in rows:
+        grouped.setdefault(row[key], []).append(row)
+    return grouped
+
+
+def content_disposition(
+    disposition_type: Literal["inline", "attachment"], filename: str
+) -> str:
+    """Build a Content-Disposition header the way FileResponse does."""
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"{disposition_type}; filename*=utf-8''{quoted}"
+    return f'{disposition_type}; filename="{filename}"'
+
+
+async def stream_in_threadpool(iterator: Iterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Pull chunks of a blocking iterator on the threadpool, for StreamingResponse.
+
+    Unlike passing the iterator to StreamingResponse directly, the iterator
+    is closed as soon as the response ends - including when the client
+    disconnects - so open files and connections are released immediately
+    instead of when the generator is garbage collected.
+    """
+    sentinel = object()
+    try:
+        while True:
+            # Not cancellable mid-call: the thread finishes its chunk before
+            # the cancellation arrives here, so close() below cannot race it
+            chunk = await run_in_threadpool(next, iterator, sentinel)
+            if chunk is sentinel:
+                break
+            yield chunk  # type: ignore[misc]
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            close()
+
+
+def stored_file_response(
+    key: str,
+    *,
+    media_type: str,
+    filename: str,
+    content_disposition_type: Literal["inline", "attachment"] = "attachment",
+) -> Response:
+    """
+    Serve a file from upload storage.
+
+    Local storage sends the file from disk; backends with presigned URLs
+    (S3) redirect the client to the bucket so the bytes bypass the API.
+    The caller checks that the file exists.
+    """
+    if isinstance(storage, LocalStorage):
+        return FileResponse(
+            path=storage.path(key),
+            media_type=media_type,
+            filename=filename,
+            content_disposition_type=content_disposition_type,
+        )
+    url = storage.presigned_url(
+        key,
+        filename=filename,
+        content_type=media_type,
+        inline=content_disposition_type == "inline",
+    )
+    if url:
+        return RedirectResponse(url, status_code=307)
+    return StreamingResponse(
+        stream_in_threadpool(storage.get_stream(key)),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": content_disposition(
+                content_disposition_type, filename
+            )
+        },
+    )
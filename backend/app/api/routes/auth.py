@@ -22,6 +22,7 @@ from app.core.security import (
 )
 from app.repositories.user_repository import authenticate, get_user_by_email
 from app.schemas import Message, NewPassword, Token
+from app.services.email_outbox_service import email_outbox_service
 from app.services.email_service import email_service
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -91,9 +92,11 @@ async def recover_password(
     # Only send email if user exists and is active
     if user and user.is_active:
         password_reset_token = generate_password_reset_token(email=email)
-        await email_service.send_password_reset_email(
-            email_to=user.email, email=email, token=password_reset_token
+        email_service.queue_password_reset_email(
+            session, email_to=user.email, email=email, token=password_reset_token
         )
+        session.commit()
+        email_outbox_service.notify()
     # Return same message regardless of whether user exists
     return Message(message="If the email exists, a password recovery email has been sent")
 
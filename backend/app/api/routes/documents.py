@@ -5,11 +5,18 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Annotated, Any
 
-from fastapi import APIRouter, File, Form, UploadFile
-from fastapi.responses import FileResponse
-from sqlmodel import Session, func, select
-
-from app.api.deps import CurrentUser, SessionDep
+from fastapi import APIRouter, File, Form, Query, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
+from sqlmodel import Session, col, func, select
+
+from app.api.deps import AsyncReadSessionDep, CurrentUser, SessionDep
+from app.api.responses import (
+    content_disposition,
+    stored_file_response,
+    stream_in_threadpool,
+)
+from app.core.config import settings
 from app.core.db import engine
 from app.core.errors import (
     BadRequestError,
@@ -18,7 +25,13 @@ from app.core.errors import (
     ForbiddenError,
     NotFoundError,
 )
-from app.models import Document, DocumentCategory
+from app.core.storage import storage
+from app.models import (
+    DOCUMENT_THUMBNAIL_PENDING,
+    DOCUMENT_THUMBNAIL_READY,
+    Document,
+    DocumentCategory,
+)
 from app.schemas import (
     DocumentCategoriesPublic,
     DocumentCategoryCreate,
@@ -30,6 +43,11 @@ from app.schemas import (
     Message,
 )
 from app.services.document_service import SignatureInfo, document_service
+from app.services.document_thumbnail_service import (
+    FALLBACK_ICON_SVG,
+    document_thumbnail_service,
+)
+from app.services.file_cleanup_service import file_cleanup_service
 
 router = APIRouter(prefix="/documents", tags=["documents"])
 
@@ -69,14 +87,14 @@ def read_categories(
 
 
 @public_router.get("/public/categories", response_model=DocumentCategoriesPublic)
-def read_public_categories(
-    session: SessionDep,
+async def read_public_categories(
+    session: AsyncReadSessionDep,
     skip: int = 0,
     limit: int = 100,
 ) -> Any:
     """Get all document categories (public)."""
     count_statement = select(func.count()).select_from(DocumentCategory)
-    count = session.exec(count_statement).one()
+    count = (await session.exec(count_statement)).one()
 
     statement = (
         select(DocumentCategory)
@@ -84,7 +102,7 @@ def read_public_categories(
         .limit(limit)
         .order_by(DocumentCategory.name)
     )
-    categories = session.exec(statement).all()
+    categories = (await session.exec(statement)).all()
 
     return DocumentCategoriesPublic(
         data=[
@@ -228,6 +246,7 @@ def read_documents(
                 file_path=d.file_path,
                 file_size=d.file_size,
                 mime_type=d.mime_type,
+                thumbnail_status=d.thumbnail_status,
                 category_id=d.category_id,
                 category=DocumentCategoryPublic(
                     id=d.category.id,
@@ -248,8 +267,8 @@ def read_documents(
 
 
 @public_router.get("/public", response_model=DocumentsPublic)
-def read_public_documents(
-    session: SessionDep,
+async def read_public_documents(
+    session: AsyncReadSessionDep,
     category_id: uuid.UUID | None = None,
     skip: int = 0,
     limit: int = 100,
@@ -261,14 +280,14 @@ def read_public_documents(
         statement = statement.where(Document.category_id == category_id)
 
     count_statement = select(func.count()).select_from(statement.subquery())
-    count = session.exec(count_statement).one()
+    count = (await session.exec(count_statement)).one()
 
     statement = statement.order_by(Document.created_at.desc()).offset(skip).limit(limit)  # type: ignore[union-attr]
-    documents = session.exec(statement).all()
+    documents = (await session.exec(statement)).all()
 
     for doc in documents:
         if doc.category_id:
-            doc.category = session.get(DocumentCategory, doc.category_id)  # type: ignore[assignment]
+            doc.category = await session.get(DocumentCategory, doc.category_id)  # type: ignore[assignment]
 
     return DocumentsPublic(
         data=[
@@ -279,6 +298,7 @@ def read_public_documents(
                 file_path=d.file_path,
                 file_size=d.file_size,
                 mime_type=d.mime_type,
+                thumbnail_status=d.thumbnail_status,
                 category_id=d.category_id,
                 category=DocumentCategoryPublic(
                     id=d.category.id,
@@ -325,28 +345,8 @@ async def create_document(
                 ErrorCode.CATEGORY_INVALID_ID, "Invalid category_id format"
             )
 
-    # Save file
-    file_path, file_size = document_service.save_document(file)
-
-    # Determine MIME type
-    file_ext = Path(file.filename or "").suffix.lower()
-    mime_type_map = {
-        ".pdf": "application/pdf",
-        ".doc": "application/msword",
-        ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        ".xls": "application/vnd.ms-excel",
-        ".xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        ".ppt": "application/vnd.ms-powerpoint",
-        ".pptx": "application/vnd.openxmlformats-officedocument.presentationml.presentation",
-        ".txt": "text/plain",
-        ".rtf": "application/rtf",
-        ".odt": "application/vnd.oasis.opendocument.text",
-        ".ods": "application/vnd.oasis.opendocument.spreadsheet",
-        ".odp": "application/vnd.oasis.opendocument.presentation",
-    }
-    mime_type = mime_type_map.get(
-        file_ext, file.content_type or "application/octet-stream"
-    )
+    # Save file; the type is detected from its content
+    file_path, file_size, mime_type = document_service.save_document(file)
 
     # Create document record
     document = Document(
@@ -358,9 +358,12 @@ async def create_document(
         category_id=category.id if category else None,
         owner_id=current_user.id,
     )
+    if document_thumbnail_service.wants_thumbnail(mime_type):
+        document.thumbnail_status = DOCUMENT_THUMBNAIL_PENDING
     session.add(document)
     session.commit()
     session.refresh(document)
+    document_thumbnail_service.notify()
 
     # Load relationships
     if category:
@@ -373,6 +376,7 @@ async def create_document(
         file_path=document.file_path,
         file_size=document.file_size,
         mime_type=document.mime_type,
+        thumbnail_status=document.thumbnail_status,
         category_id=document.category_id,
         category=DocumentCategoryPublic(
             id=category.id,
@@ -427,6 +431,7 @@ def read_document(
         file_path=document.file_path,
         file_size=document.file_size,
         mime_type=document.mime_type,
+        thumbnail_status=document.thumbnail_status,
         category_id=document.category_id,
         category=DocumentCategoryPublic(
             id=category.id,
@@ -442,33 +447,140 @@ def read_document(
     )
 
 
+@public_router.get("/export", response_class=StreamingResponse)
+async def export_documents(
+    session: AsyncReadSessionDep,
+    category_id: uuid.UUID | None = None,
+    ids: Annotated[list[uuid.UUID] | None, Query()] = None,
+    compress: bool = False,
+) -> StreamingResponse:
+    """Download documents of a category, or selected documents, as one ZIP archive. Public endpoint.
+
+    The archive is streamed while it is built, without temporary files.
+    Stored entries (default) suit PDFs and office files, which are already
+    compressed, and let the response carry a Content-Length.
+
+    Args:
+        category_id: Export all documents of this category
+        ids: Export these documents (combined with category_id if both are given)
+        compress: Deflate entries; the archive size is then not known in advance
+    """
+    if category_id is None and not ids:
+        raise BadRequestError(
+            ErrorCode.DOCUMENT_EXPORT_INVALID, "Specify category_id or ids"
+        )
+
+    archive_name = "documents"
+    statement = select(Document)
+    if category_id is not None:
+        category = await session.get(DocumentCategory, category_id)
+        if not category:
+            raise NotFoundError(ErrorCode.CATEGORY_NOT_FOUND, "Category not found")
+        archive_name = category.name.replace("/", "_").replace("\\", "_")
+        statement = statement.where(Document.category_id == category_id)
+    if ids:
+        statement = statement.where(col(Document.id).in_(ids))
+
+    max_files = settings.DOCUMENT_EXPORT_MAX_FILES
+    statement = statement.order_by(Document.created_at.desc()).limit(max_files + 1)  # type: ignore[union-attr]
+    documents = (await session.exec(statement)).all()
+    if len(documents) > max_files:
+        raise BadRequestError(
+            ErrorCode.DOCUMENT_EXPORT_TOO_LARGE,
+            f"At most {max_files} documents can be exported at once",
+        )
+
+    archive = await run_in_threadpool(
+        document_service.build_archive, documents, compress=compress
+    )
+    if not archive.entries:
+        raise NotFoundError(ErrorCode.DOCUMENT_NOT_FOUND, "No documents to export")
+    if sum(entry.size for entry in archive.entries) > settings.DOCUMENT_EXPORT_MAX_SIZE:
+        raise BadRequestError(
+            ErrorCode.DOCUMENT_EXPORT_TOO_LARGE,
+            f"Export exceeds {settings.DOCUMENT_EXPORT_MAX_SIZE // 1024 // 1024}MB",
+        )
+
+    headers = {"Content-Disposition": content_disposition("attachment", f"{archive_name}.zip")}
+    content_length = archive.content_length()
+    if content_length is not None:
+        headers["Content-Length"] = str(content_length)
+    return StreamingResponse(
+        stream_in_threadpool(iter(archive)),
+        media_type="application/zip",
+        headers=headers,
+    )
+
+
 @public_router.get("/{document_id}/file")
-def get_document_file(
+async def get_document_file(
+    session: AsyncReadSessionDep,
     document_id: uuid.UUID,
     inline: bool = False,
-) -> FileResponse:
+) -> Response:
     """Download or view document file. Public endpoint.
 
     Args:
         document_id: Document UUID
         inline: If True, opens file in browser (for preview). If False, downloads file.
     """
-    with Session(engine) as session:
-        document = session.get(Document, document_id)
-        if not document:
-            raise NotFoundError(ErrorCode.DOCUMENT_NOT_FOUND, "Document not found")
+    document = await session.get(Document, document_id)
+    if not document:
+        raise NotFoundError(ErrorCode.DOCUMENT_NOT_FOUND, "Document not found")
+
+    if not await run_in_threadpool(storage.exists, document.file_path):
+        raise NotFoundError(ErrorCode.DOCUMENT_FILE_NOT_FOUND, "File not found")
 
-        file_path = document_service.UPLOAD_DIR / document.file_path
-        if not file_path.exists():
-            raise NotFoundError(ErrorCode.DOCUMENT_FILE_NOT_FOUND, "File not found")
+    return stored_file_response(
+        document.file_path,
+        media_type=document.mime_type,
+        filename=document.file_name,
+        content_disposition_type="inline" if inline else "attachment",
+    )
+
+
+@public_router.get("/{document_id}/thumbnail", response_class=Response)
+async def get_document_thumbnail(
+    session: AsyncReadSessionDep,
+    document_id: uuid.UUID,
+) -> Response:
+    """Get first-page preview image of a document. Public endpoint.
+
+    Returns a JPEG for PDFs whose thumbnail is rendered, a generic SVG
+    document icon otherwise (still pending, not a PDF, or not renderable).
+    """
+    document = await session.get(Document, document_id)
+    if not document:
+        raise NotFoundError(ErrorCode.DOCUMENT_NOT_FOUND, "Document not found")
 
-        return FileResponse(
-            path=str(file_path),
-            filename=document.file_name,
-            media_type=document.mime_type,
-            content_disposition_type="inline" if inline else "attachment",
+    thumbnail_path = document.thumbnail_path
+    if (
+        document.thumbnail_status != DOCUMENT_THUMBNAIL_READY
+        or not thumbnail_path
+        or not await run_in_threadpool(storage.exists, thumbnail_path)
+    ):
+        # Short cache: a pending thumbnail shows up once rendered
+        return Response(
+            FALLBACK_ICON_SVG,
+            media_type="image/svg+xml",
+            headers={"Cache-Control": "public, max-age=300"},
         )
 
+    response = stored_file_response(
+        thumbnail_path,
+        media_type="image/jpeg",
+        filename=f"{Path(document.file_name).stem}.jpg",
+        content_disposition_type="inline",
+    )
+    # Documents are never replaced, so neither is their thumbnail; a redirect
+    # to a presigned URL must not outlive the URL
+    response.headers["Cache-Control"] = (
+        f"public, max-age={settings.DOCUMENT_THUMBNAIL_CACHE_SECONDS}"
+        if response.status_code == 200
+        else "private, max-age=60"
+    )
+    return response
+
 
 @public_router.get("/{document_id}/signature", response_model=SignatureInfo)
 def get_document_signature(
@@ -549,6 +661,7 @@ def update_document(
         file_path=document.file_path,
         file_size=document.file_size,
         mime_type=document.mime_type,
+        thumbnail_status=document.thumbnail_status,
         category_id=document.category_id,
         category=DocumentCategoryPublic(
             id=category.id,
@@ -579,10 +692,10 @@ def delete_document(
     if not current_user.is_superuser and document.owner_id != current_user.id:
         raise ForbiddenError(ErrorCode.DOCUMENT_FORBIDDEN, "Not enough permissions")
 
-    # Delete file from disk
-    document_service.delete_document(document.file_path)
-
-    # Delete from database
+    # Queue files for deletion and delete from database
+    file_cleanup_service.enqueue(session, document.file_path)
+    if document.thumbnail_path:
+        file_cleanup_service.enqueue(session, document.thumbnail_path)
     session.delete(document)
     session.commit()
 
@@ -1,31 +1,71 @@
+import asyncio
+import logging
 import uuid
-from pathlib import Path
 from typing import Annotated, Any
 
 from fastapi import APIRouter, File, HTTPException, UploadFile
-from fastapi.responses import FileResponse
-from sqlmodel import Session, select
+from fastapi.responses import Response
+from sqlalchemy import and_, case, update
+from sqlmodel import Session, col, func, select
 
 from app.api.deps import CurrentUser, SessionDep
+from app.api.responses import stored_file_response
+from app.core.config import settings
 from app.core.db import engine
 from app.core.errors import BadRequestError, ErrorCode, ForbiddenError, NotFoundError
-from app.models import News, NewsImage
-from app.schemas import Message, NewsImageList, NewsImagePublic
-from app.services.image_service import image_service
+from app.models import (
+    IMAGE_STATUS_PROCESSING,
+    IMAGE_STATUS_READY,
+    ImageJob,
+    News,
+    NewsImage,
+)
+from app.schemas import (
+    Message,
+    NewsImageBulkUploadResult,
+    NewsImageList,
+    NewsImageOrderUpdate,
+    NewsImagePublic,
+    NewsImageStatusPublic,
+    NewsImageUploadResult,
+)
+from app.services.file_cleanup_service import file_cleanup_service
+from app.services.image_job_service import image_job_service
+from app.services.image_service import ProcessedImage, image_service
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/news/{news_id}/images", tags=["images"])
 
 public_router = APIRouter(prefix="/news/{news_id}/images", tags=["images"])
 
 
+def _order_stats(session: Session, news_id: uuid.UUID) -> tuple[int, int]:
+    """Get (max order, image count) for a news item; max order is -1 if empty."""
+    max_order, count = session.exec(
+        select(func.coalesce(func.max(NewsImage.order), -1), func.count()).where(
+            NewsImage.news_id == news_id
+        )
+    ).one()
+    return max_order, count
+
+
 @router.post("/", response_model=NewsImagePublic)
 async def upload_image(
     news_id: uuid.UUID,
     file: Annotated[UploadFile, File()],
     session: SessionDep,
     current_user: CurrentUser,
+    process_async: bool = False,
 ) -> Any:
-    """Upload an image for a news item."""
+    """
+    Upload an image for a news item.
+
+    With ``process_async`` the raw upload is stored and the image is returned
+    at once in ``processing`` status; resizing and conversion run in the
+    background job queue. Poll ``GET /{image_id}/status`` until the status is
+    ``ready`` or ``failed``.
+    """
     news = session.get(News, news_id)
     if not news:
         raise NotFoundError(ErrorCode.NEWS_NOT_FOUND, "News not found")
@@ -33,39 +73,129 @@ async def upload_image(
     if not current_user.is_superuser and news.owner_id != current_user.id:
         raise ForbiddenError(ErrorCode.NEWS_FORBIDDEN, "Not enough permissions")
 
-    statement = select(NewsImage).where(NewsImage.news_id == news_id)
-    existing_images = session.exec(statement).all()
-    max_order = max([img.order for img in existing_images], default=-1)
-    is_first_image = len(existing_images) == 0
+    max_order, image_count = _order_stats(session, news_id)
 
-    file_path, file_size = image_service.save_image(file, news_id)
-
-    file_ext = Path(file_path).suffix.lower()
-    mime_type_map = {
-        ".jpg": "image/jpeg",
-        ".jpeg": "image/jpeg",
-        ".png": "image/png",
-        ".webp": "image/webp",
-        ".gif": "image/gif",
-    }
-    mime_type = mime_type_map.get(file_ext, file.content_type or "image/jpeg")
+    if process_async:
+        raw_path, file_path = image_service.save_raw_image(file, news_id)
+        processed = ProcessedImage(file_size=0)
+    else:
+        file_path, processed = image_service.save_image(file, news_id)
 
     image = NewsImage(
         news_id=news_id,
         file_name=file.filename or "image",
         file_path=file_path,
-        file_size=file_size,
-        mime_type=mime_type,
+        file_size=processed.file_size,
+        width=processed.width,
+        height=processed.height,
+        placeholder=processed.placeholder,
+        mime_type=image_service.OUTPUT_MIME_TYPE,
         order=max_order + 1,
-        is_main=is_first_image,
+        is_main=image_count == 0,
+        status=IMAGE_STATUS_PROCESSING if process_async else IMAGE_STATUS_READY,
     )
     session.add(image)
+    if process_async:
+        image_job_service.enqueue(session, image, raw_path)
     session.commit()
     session.refresh(image)
+    if process_async:
+        image_job_service.notify()
 
     return image
 
 
+@router.post("/bulk", response_model=NewsImageBulkUploadResult)
+async def upload_images(
+    news_id: uuid.UUID,
+    files: Annotated[list[UploadFile], File()],
+    session: SessionDep,
+    current_user: CurrentUser,
+) -> Any:
+    """
+    Upload several images for a news item in one request.
+
+    Files are processed in parallel on the image worker pool and stored in
+    the order they were sent; all rows are inserted in one batch. A file that
+    fails validation or processing is reported in its result entry and does
+    not affect the others.
+    """
+    news = session.get(News, news_id)
+    if not news:
+        raise NotFoundError(ErrorCode.NEWS_NOT_FOUND, "News not found")
+
+    if not current_user.is_superuser and news.owner_id != current_user.id:
+        raise ForbiddenError(ErrorCode.NEWS_FORBIDDEN, "Not enough permissions")
+
+    if len(files) > settings.MAX_BULK_UPLOAD_FILES:
+        raise BadRequestError(
+            ErrorCode.NEWS_IMAGE_TOO_MANY_FILES,
+            f"Too many files. Maximum: {settings.MAX_BULK_UPLOAD_FILES}",
+        )
+    # Release the read transaction while images are being processed
+    session.commit()
+
+    outcomes = await asyncio.gather(
+        *(image_service.run_in_pool(image_service.save_image, f, news_id) for f in files),
+        return_exceptions=True,
+    )
+
+    # Lock the news row so concurrent uploads get distinct orders
+    news = session.get(News, news_id, with_for_update=True, populate_existing=True)
+    saved_paths = [r[0] for r in outcomes if isinstance(r, tuple)]
+    if not news:
+        file_cleanup_service.enqueue(session, *saved_paths)
+        session.commit()
+        raise NotFoundError(ErrorCode.NEWS_NOT_FOUND, "News not found")
+    max_order, image_count = _order_stats(session, news_id)
+
+    results: list[NewsImageUploadResult] = []
+    new_images: list[NewsImage] = []
+    for file, outcome in zip(files, outcomes, strict=True):
+        file_name = file.filename or "image"
+        if isinstance(outcome, BaseException):
+            if isinstance(outcome, HTTPException):
+                error = str(outcome.detail)
+            else:
+                logger.error("Failed to save image %s", file_name, exc_info=outcome)
+                error = "Failed to save image"
+            results.append(
+                NewsImageUploadResult(file_name=file_name, success=False, error=error)
+            )
+            continue
+        file_path, processed = outcome
+        image = NewsImage(
+            news_id=news_id,
+            file_name=file_name,
+            file_path=file_path,
+            file_size=processed.file_size,
+            width=processed.width,
+            height=processed.height,
+            placeholder=processed.placeholder,
+            mime_type=image_service.OUTPUT_MIME_TYPE,
+            order=max_order + 1 + len(new_images),
+            is_main=image_count == 0 and not new_images,
+        )
+        new_images.append(image)
+        # All values are set client-side: built now, the response needs no
+        # reload of the rows expired by the commit
+        results.append(
+            NewsImageUploadResult(
+                file_name=file_name,
+                success=True,
+                image=NewsImagePublic.model_validate(image),
+            )
+        )
+
+    # One multi-row INSERT for all images
+    session.add_all(new_images)
+    session.commit()
+
+    return NewsImageBulkUploadResult(
+        data=results, uploaded=len(new_images), failed=len(results) - len(new_images)
+    )
+
+
 @router.get("/", response_model=NewsImageList)
 def get_images(
     news_id: uuid.UUID,
@@ -87,11 +217,27 @@ def get_images(
     return NewsImageList(data=list(images), count=count)
 
 
+@router.get("/{image_id}/status", response_model=NewsImageStatusPublic)
+def get_image_status(
+    news_id: uuid.UUID,
+    image_id: uuid.UUID,
+    session: SessionDep,
+) -> Any:
+    """Get processing status of an image uploaded with ``process_async``."""
+    image = session.get(NewsImage, image_id)
+    if not image or image.news_id != news_id:
+        raise NotFoundError(ErrorCode.NEWS_IMAGE_NOT_FOUND, "Image not found")
+
+    return NewsImageStatusPublic(
+        id=image.id, status=image.status, error=image.processing_error
+    )
+
+
 @public_router.get("/{image_id}/file")
 def get_image_file(
     news_id: uuid.UUID,
     image_id: uuid.UUID,
-) -> FileResponse:
+) -> Response:
     """
     Get image file.
     Public endpoint - no authentication required as images are part of public news.
@@ -102,45 +248,19 @@ def get_image_file(
             raise NotFoundError(ErrorCode.NEWS_NOT_FOUND, "News not found")
 
         image = session.get(NewsImage, image_id)
-        if not image or image.news_id != news_id:
+        if (
+            not image
+            or image.news_id != news_id
+            or image.status != IMAGE_STATUS_READY
+        ):
             raise NotFoundError(ErrorCode.NEWS_IMAGE_NOT_FOUND, "Image not found")
 
-        upload_dir = image_service.UPLOAD_DIR
-        file_path = upload_dir / image.file_path
-
-        possible_paths = [
-            file_path,
-            file_path.with_suffix(".jpg"),
-        ]
-
-        news_dir = image_service.get_upload_path(news_id)
-        file_name = Path(image.file_path).name
-        possible_paths.append(news_dir / file_name)
-
-        jpg_name = Path(file_name).stem + ".jpg"
-        possible_paths.append(news_dir / jpg_name)
-
-        png_name = Path(file_name).stem + ".png"
-        possible_paths.append(news_dir / png_name)
-
-        found_path = None
-        for path in possible_paths:
-            if path.exists() and path.is_file():
-                found_path = path
-                break
+        key = image_service.find_file(image.file_path)
+        if key is None:
+            raise HTTPException(status_code=404, detail="Image file not found")
 
-        if not found_path:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Image file not found. Checked paths: {[str(p) for p in possible_paths[:3]]}"
-            )
-
-        file_path = found_path
-
-        return FileResponse(
-            path=str(file_path),
-            media_type=image.mime_type,
-            filename=image.file_name,
+        return stored_file_response(
+            key, media_type=image.mime_type, filename=image.file_name
         )
 
 
@@ -163,16 +283,67 @@ def delete_image(
     if not image or image.news_id != news_id:
         raise NotFoundError(ErrorCode.NEWS_IMAGE_NOT_FOUND, "Image not found")
 
-    file_path = image_service.UPLOAD_DIR / image.file_path
-    if file_path.exists():
-        file_path.unlink()
-
+    # Raw upload of an unfinished background job goes too
+    job_paths = session.exec(
+        select(ImageJob.source_path).where(ImageJob.image_id == image.id)
+    ).all()
+    file_cleanup_service.enqueue(session, image.file_path, *job_paths)
     session.delete(image)
     session.commit()
 
     return Message(message="Image deleted successfully")
 
 
+@router.put("/order", response_model=NewsImageList)
+def set_images_order(
+    news_id: uuid.UUID,
+    order_in: NewsImageOrderUpdate,
+    session: SessionDep,
+    current_user: CurrentUser,
+) -> Any:
+    """
+    Apply full image ordering in one request.
+
+    ``image_ids`` must list every image of the news item exactly once; the
+    first one becomes the main image.
+    """
+    news = session.get(News, news_id, with_for_update=True)
+    if not news:
+        raise NotFoundError(ErrorCode.NEWS_NOT_FOUND, "News not found")
+
+    if not current_user.is_superuser and news.owner_id != current_user.id:
+        raise ForbiddenError(ErrorCode.NEWS_FORBIDDEN, "Not enough permissions")
+
+    image_ids = set(
+        session.exec(select(NewsImage.id).where(NewsImage.news_id == news_id)).all()
+    )
+    if len(order_in.image_ids) != len(image_ids) or set(order_in.image_ids) != image_ids:
+        raise BadRequestError(
+            ErrorCode.NEWS_IMAGE_INVALID_ORDER,
+            "Ordering must contain every image of the news item exactly once",
+        )
+
+    session.execute(
+        update(NewsImage)
+        .where(NewsImage.news_id == news_id)  # type: ignore[arg-type]
+        .values(
+            order=case(
+                {image_id: i for i, image_id in enumerate(order_in.image_ids)},
+                value=NewsImage.id,
+            ),
+            is_main=NewsImage.id == order_in.image_ids[0],
+        )
+    )
+    session.commit()
+
+    images = session.exec(
+        select(NewsImage)
+        .where(NewsImage.news_id == news_id)
+        .order_by(NewsImage.order)  # type: ignore[arg-type]
+    ).all()
+    return NewsImageList(data=list(images), count=len(images))
+
+
 @router.put("/{image_id}/reorder")
 def reorder_image(
     news_id: uuid.UUID,
@@ -182,7 +353,8 @@ def reorder_image(
     current_user: CurrentUser,
 ) -> NewsImagePublic:
     """Change image order."""
-    news = session.get(News, news_id)
+    # Lock the news row: concurrent image reorders of one news item serialize
+    news = session.get(News, news_id, with_for_update=True)
     if not news:
         raise NotFoundError(ErrorCode.NEWS_NOT_FOUND, "News not found")
 
@@ -193,35 +365,27 @@ def reorder_image(
     if not image or image.news_id != news_id:
         raise NotFoundError(ErrorCode.NEWS_IMAGE_NOT_FOUND, "Image not found")
 
-    statement = select(NewsImage).where(NewsImage.news_id == news_id)
-    all_images = session.exec(statement).all()
-
-    if new_order < 0 or new_order >= len(all_images):
+    image_count = session.exec(
+        select(func.count()).select_from(NewsImage).where(NewsImage.news_id == news_id)
+    ).one()
+    if new_order < 0 or new_order >= image_count:
         raise BadRequestError(ErrorCode.NEWS_IMAGE_INVALID_ORDER, "Invalid order")
 
+    # Move the image and shift the images in between by one, in one statement;
+    # the image that ends up first becomes main
     old_order = image.order
-    if new_order > old_order:
-        for img in all_images:
-            if old_order < img.order <= new_order:
-                img.order -= 1
-    elif new_order < old_order:
-        for img in all_images:
-            if new_order <= img.order < old_order:
-                img.order += 1
-
-    image.order = new_order
-    session.add(image)
-    session.flush()
-
-    for img in all_images:
-        img.is_main = False
-
-    updated_images = session.exec(select(NewsImage).where(NewsImage.news_id == news_id)).all()
-    first_image = next((img for img in updated_images if img.order == 0), None)
-    if first_image:
-        first_image.is_main = True
-        session.add(first_image)
-
+    order = col(NewsImage.order)
+    shifted_order = case(
+        (NewsImage.id == image_id, new_order),
+        (and_(order > old_order, order <= new_order), order - 1),
+        (and_(order >= new_order, order < old_order), order + 1),
+        else_=order,
+    )
+    session.execute(
+        update(NewsImage)
+        .where(NewsImage.news_id == news_id)  # type: ignore[arg-type]
+        .values(order=shifted_order, is_main=shifted_order == 0)
+    )
     session.commit()
     session.refresh(image)
 
@@ -236,7 +400,7 @@ def set_main_image(
     current_user: CurrentUser,
 ) -> NewsImagePublic:
     """Set image as main (for preview)."""
-    news = session.get(News, news_id)
+    news = session.get(News, news_id, with_for_update=True)
     if not news:
         raise NotFoundError(ErrorCode.NEWS_NOT_FOUND, "News not found")
 
@@ -247,16 +411,12 @@ def set_main_image(
     if not image or image.news_id != news_id:
         raise NotFoundError(ErrorCode.NEWS_IMAGE_NOT_FOUND, "Image not found")
 
-    statement = select(NewsImage).where(NewsImage.news_id == news_id)
-    all_images = session.exec(statement).all()
-    for img in all_images:
-        if img.id != image_id:
-            img.is_main = False
-
-    image.is_main = True
-    session.add(image)
+    session.execute(
+        update(NewsImage)
+        .where(NewsImage.news_id == news_id)  # type: ignore[arg-type]
+        .values(is_main=NewsImage.id == image_id)
+    )
     session.commit()
     session.refresh(image)
 
     return image  # type: ignore[return-value]
-
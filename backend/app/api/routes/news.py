@@ -1,15 +1,17 @@
 import uuid
+from collections.abc import Collection
 from datetime import datetime, timezone
-from pathlib import Path
 from typing import Any
 
 from fastapi import APIRouter
 from sqlmodel import func, select
+from sqlmodel.sql.expression import Select
 
-from app.api.deps import CurrentUser, SessionDep
+from app.api.deps import AsyncReadSessionDep, CurrentUser, SessionDep
+from app.api.responses import FastJSONResponse, group_rows, row_dicts
 from app.core.config import settings
 from app.core.errors import ErrorCode, ForbiddenError, NotFoundError
-from app.models import News, NewsImage
+from app.models import IMAGE_STATUS_READY, ImageJob, News, NewsImage, User
 from app.repositories.news_repository import create_news as create_news_repo
 from app.schemas import (
     Message,
@@ -19,145 +21,173 @@ from app.schemas import (
     NewsUpdate,
     UserPublic,
 )
+from app.services.file_cleanup_service import file_cleanup_service
 
 router = APIRouter(prefix="/news", tags=["news"])
 
+# Columns of NewsPublic, UserPublic and NewsImagePublic in response field order.
+# List routes select these directly and encode rows with FastJSONResponse,
+# skipping model construction and response_model validation.
+_NEWS_COLUMNS = (
+    News.title,
+    News.content,
+    News.is_published,
+    News.id,
+    News.owner_id,
+    News.published_at,
+    News.created_at,
+    News.updated_at,
+)
+_OWNER_COLUMNS = (User.email, User.is_active, User.is_superuser, User.nickname, User.id)
+_IMAGE_COLUMNS = (
+    NewsImage.file_name,
+    NewsImage.file_path,
+    NewsImage.file_size,
+    NewsImage.mime_type,
+    NewsImage.order,
+    NewsImage.is_main,
+    NewsImage.status,
+    NewsImage.width,
+    NewsImage.height,
+    NewsImage.placeholder,
+    NewsImage.id,
+    NewsImage.news_id,
+    NewsImage.created_at,
+)
+
+
+def _owners_statement(owner_ids: Collection[uuid.UUID]) -> Select[Any]:
+    return select(*_OWNER_COLUMNS).where(User.id.in_(owner_ids))  # type: ignore[attr-defined]
+
+
+def _images_statement(
+    news_ids: Collection[uuid.UUID], *, ready_only: bool = False
+) -> Select[Any]:
+    statement = (
+        select(*_IMAGE_COLUMNS)
+        .where(NewsImage.news_id.in_(news_ids))  # type: ignore[attr-defined]
+        .order_by(NewsImage.news_id, NewsImage.order)  # type: ignore[arg-type]
+    )
+    if ready_only:
+        statement = statement.where(NewsImage.status == IMAGE_STATUS_READY)
+    return statement
+
+
+def _news_list_payload(
+    news_rows: list[dict[str, Any]],
+    owner_rows: list[dict[str, Any]],
+    image_rows: list[dict[str, Any]],
+    count: int,
+) -> dict[str, Any]:
+    """
+    Assemble NewsPublicList-shaped payload from column rows.
+
+    Args:
+        news_rows: News rows selected with _NEWS_COLUMNS
+        owner_rows: Owner rows selected with _OWNER_COLUMNS
+        image_rows: Image rows selected with _IMAGE_COLUMNS, ordered by order
+        count: Total number of news matching the listing filter
+
+    Returns:
+        Dict ready for FastJSONResponse
+    """
+    owners = {}
+    for owner in owner_rows:
+        owner["is_first_superuser"] = owner["email"] == settings.FIRST_SUPERUSER
+        owners[owner["id"]] = owner
+    images = group_rows(image_rows, "news_id")
+    for row in news_rows:
+        row["owner"] = owners.get(row["owner_id"])
+        row["images"] = images.get(row["id"])
+    return {"data": news_rows, "count": count}
+
+
 public_router = APIRouter(prefix="/news", tags=["news"])
 
 
 @public_router.get("/public", response_model=NewsPublicList)
-def read_public_news(skip: int = 0, limit: int = 10) -> Any:
+async def read_public_news(
+    session: AsyncReadSessionDep, skip: int = 0, limit: int = 10
+) -> Any:
     """
     Retrieve published news. Public endpoint - no authentication required.
     """
-    from sqlmodel import Session
-
-    from app.core.db import engine
-
-    with Session(engine) as session:
-        count_statement = (
-            select(func.count()).select_from(News).where(News.is_published.is_(True))  # type: ignore[union-attr]
-        )
-        count = session.exec(count_statement).one()
-
-        statement = (
-            select(News)
-            .where(News.is_published.is_(True))  # type: ignore[union-attr]
-            .order_by(News.published_at.desc().nulls_last(), News.created_at.desc())  # type: ignore[union-attr]
-            .offset(skip)
-            .limit(limit)
+    count_statement = (
+        select(func.count()).select_from(News).where(News.is_published.is_(True))  # type: ignore[union-attr]
+    )
+    count = (await session.exec(count_statement)).one()
+
+    statement = (
+        select(*_NEWS_COLUMNS)
+        .where(News.is_published.is_(True))  # type: ignore[union-attr]
+        .order_by(News.published_at.desc().nulls_last(), News.created_at.desc())  # type: ignore[union-attr]
+        .offset(skip)
+        .limit(limit)
+    )
+    news_rows = row_dicts((await session.exec(statement)).all())
+    owner_rows: list[dict[str, Any]] = []
+    image_rows: list[dict[str, Any]] = []
+    if news_rows:
+        owner_ids = {row["owner_id"] for row in news_rows}
+        news_ids = [row["id"] for row in news_rows]
+        owner_rows = row_dicts((await session.exec(_owners_statement(owner_ids))).all())
+        image_rows = row_dicts(
+            (await session.exec(_images_statement(news_ids, ready_only=True))).all()
         )
-        news_list = session.exec(statement).all()
 
-        from app.core.config import settings as app_settings
-        from app.models import User
-        from app.schemas import NewsImagePublic
-
-        # Build news list with owner and images
-        news_public_list = []
-        for news_item in news_list:
-            # Load owner and convert to UserPublic
-            owner_public = None
-            if news_item.owner_id:
-                owner = session.get(User, news_item.owner_id)
-                if owner:
-                    owner_dict = owner.model_dump()
-                    owner_dict["is_first_superuser"] = (
-                        owner.email == app_settings.FIRST_SUPERUSER
-                    )
-                    owner_public = UserPublic.model_validate(owner_dict)
-
-            # Load images
-            images = []
-            try:
-                images_statement = (
-                    select(NewsImage)
-                    .where(NewsImage.news_id == news_item.id)
-                    .order_by(NewsImage.order)  # type: ignore[arg-type]
-                )
-                images = session.exec(images_statement).all()
-            except Exception:
-                images = []
-
-            # Create NewsPublic object
-            news_public = NewsPublic(
-                id=news_item.id,
-                title=news_item.title,
-                content=news_item.content,
-                is_published=news_item.is_published,
-                owner_id=news_item.owner_id,
-                owner=owner_public,
-                published_at=news_item.published_at,
-                created_at=news_item.created_at,
-                updated_at=news_item.updated_at,
-                images=[
-                    NewsImagePublic.model_validate(img.model_dump()) for img in images
-                ]
-                if images
-                else None,
-            )
-            news_public_list.append(news_public)
-
-        return NewsPublicList(data=news_public_list, count=count)
+    return FastJSONResponse(
+        _news_list_payload(news_rows, owner_rows, image_rows, count)
+    )
 
 
 @public_router.get("/public/{id}", response_model=NewsPublic)
-def read_public_news_item(id: uuid.UUID) -> Any:
+async def read_public_news_item(session: AsyncReadSessionDep, id: uuid.UUID) -> Any:
     """
     Get published news by ID. Public endpoint - no authentication required.
     """
-    from sqlmodel import Session
-
-    from app.core.db import engine
+    statement = select(News).where(
+        News.id == id,
+        News.is_published.is_(True),  # type: ignore[union-attr]
+    )
+    news_item = (await session.exec(statement)).first()
+    if not news_item:
+        raise NotFoundError(ErrorCode.NEWS_NOT_FOUND, "News not found")
 
-    with Session(engine) as session:
-        statement = select(News).where(
-            News.id == id,
-            News.is_published.is_(True),  # type: ignore[union-attr]
-        )
-        news_item = session.exec(statement).first()
-        if not news_item:
-            raise NotFoundError(ErrorCode.NEWS_NOT_FOUND, "News not found")
+    from app.models import User
+    from app.schemas import NewsImagePublic
 
-        from app.core.config import settings as app_settings
-        from app.models import User
-        from app.schemas import NewsImagePublic
-
-        owner_public = None
-        if news_item.owner_id:
-            owner = session.get(User, news_item.owner_id)
-            if owner:
-                owner_dict = owner.model_dump()
-                owner_dict["is_first_superuser"] = (
-                    owner.email == app_settings.FIRST_SUPERUSER
-                )
-                owner_public = UserPublic.model_validate(owner_dict)
+    owner_public = None
+    if news_item.owner_id:
+        owner = await session.get(User, news_item.owner_id)
+        if owner:
+            owner_dict = owner.model_dump()
+            owner_dict["is_first_superuser"] = owner.email == settings.FIRST_SUPERUSER
+            owner_public = UserPublic.model_validate(owner_dict)
 
-        images = []
-        try:
-            images_statement = (
-                select(NewsImage)
-                .where(NewsImage.news_id == news_item.id)
-                .order_by(NewsImage.order)
-            )
-            images = session.exec(images_statement).all()
-        except Exception:
-            images = []
-
-        return NewsPublic(
-            id=news_item.id,
-            title=news_item.title,
-            content=news_item.content,
-            is_published=news_item.is_published,
-            owner_id=news_item.owner_id,
-            owner=owner_public,
-            published_at=news_item.published_at,
-            created_at=news_item.created_at,
-            updated_at=news_item.updated_at,
-            images=[NewsImagePublic.model_validate(img.model_dump()) for img in images]
-            if images
-            else None,
+    images_statement = (
+        select(NewsImage)
+        .where(
+            NewsImage.news_id == news_item.id,
+            NewsImage.status == IMAGE_STATUS_READY,
         )
+        .order_by(NewsImage.order)  # type: ignore[arg-type]
+    )
+    images = (await session.exec(images_statement)).all()
+
+    return NewsPublic(
+        id=news_item.id,
+        title=news_item.title,
+        content=news_item.content,
+        is_published=news_item.is_published,
+        owner_id=news_item.owner_id,
+        owner=owner_public,
+        published_at=news_item.published_at,
+        created_at=news_item.created_at,
+        updated_at=news_item.updated_at,
+        images=[NewsImagePublic.model_validate(img.model_dump()) for img in images]
+        if images
+        else None,
+    )
 
 
 @router.get("/", response_model=NewsPublicList)
@@ -169,56 +199,24 @@ def read_news(
     """
     count_statement = select(func.count()).select_from(News)
     count = session.exec(count_statement).one()
-    statement = select(News).order_by(News.created_at.desc()).offset(skip).limit(limit)  # type: ignore[union-attr]
-    news_list = session.exec(statement).all()
-
-    from app.models import User
-    from app.schemas import NewsImagePublic
-
-    # Build news list with owner and images
-    news_public_list = []
-    for news_item in news_list:
-        # Load owner and convert to UserPublic
-        owner_public = None
-        if news_item.owner_id:
-            owner = session.get(User, news_item.owner_id)
-            if owner:
-                owner_dict = owner.model_dump()
-                owner_dict["is_first_superuser"] = (
-                    owner.email == settings.FIRST_SUPERUSER
-                )
-                owner_public = UserPublic.model_validate(owner_dict)
-
-        # Load images
-        images = []
-        try:
-            images_statement = (
-                select(NewsImage)
-                .where(NewsImage.news_id == news_item.id)
-                .order_by(NewsImage.order)
-            )
-            images = session.exec(images_statement).all()
-        except Exception:
-            images = []
-
-        # Create NewsPublic object
-        news_public = NewsPublic(
-            id=news_item.id,
-            title=news_item.title,
-            content=news_item.content,
-            is_published=news_item.is_published,
-            owner_id=news_item.owner_id,
-            owner=owner_public,
-            published_at=news_item.published_at,
-            created_at=news_item.created_at,
-            updated_at=news_item.updated_at,
-            images=[NewsImagePublic.model_validate(img.model_dump()) for img in images]
-            if images
-            else None,
-        )
-        news_public_list.append(news_public)
-
-    return NewsPublicList(data=news_public_list, count=count)
+    statement = (
+        select(*_NEWS_COLUMNS)
+        .order_by(News.created_at.desc())  # type: ignore[union-attr]
+        .offset(skip)
+        .limit(limit)
+    )
+    news_rows = row_dicts(session.exec(statement).all())
+    owner_rows: list[dict[str, Any]] = []
+    image_rows: list[dict[str, Any]] = []
+    if news_rows:
+        owner_ids = {row["owner_id"] for row in news_rows}
+        news_ids = [row["id"] for row in news_rows]
+        owner_rows = row_dicts(session.exec(_owners_statement(owner_ids)).all())
+        image_rows = row_dicts(session.exec(_images_statement(news_ids)).all())
+
+    return FastJSONResponse(
+        _news_list_payload(news_rows, owner_rows, image_rows, count)
+    )
 
 
 @router.get("/{id}", response_model=NewsPublic)
@@ -377,7 +375,7 @@ def delete_news(
 ) -> Message:
     """
     Delete news. Regular users can only delete their own news, superusers can delete any.
-    Also deletes all associated image files from the server.
+    Associated image files are queued for background deletion.
     """
     news = session.get(News, id)
     if not news:
@@ -385,26 +383,16 @@ def delete_news(
     if not current_user.is_superuser and news.owner_id != current_user.id:
         raise ForbiddenError(ErrorCode.NEWS_FORBIDDEN, "Not enough permissions")
 
-    # Get all images for this news item
-    images_statement = select(NewsImage).where(NewsImage.news_id == id)
-    images = session.exec(images_statement).all()
-
-    # Delete image files from disk
-    upload_dir = Path(settings.UPLOAD_DIR)
-    if not upload_dir.is_absolute():
-        base_dir = Path(__file__).parent.parent.parent.parent
-        if base_dir.name == "app" and base_dir.parent.name == "app":
-            base_dir = base_dir.parent
-        upload_dir = base_dir / upload_dir
-
-    for image in images:
-        file_path = upload_dir / image.file_path
-        if file_path.exists() and file_path.is_file():
-            try:
-                file_path.unlink()
-            except Exception:
-                # Log error but continue deletion
-                pass
+    # Queue image files for deletion once the rows are gone
+    image_paths = session.exec(
+        select(NewsImage.file_path).where(NewsImage.news_id == id)
+    ).all()
+    job_paths = session.exec(
+        select(ImageJob.source_path)
+        .join(NewsImage)
+        .where(NewsImage.news_id == id)
+    ).all()
+    file_cleanup_service.enqueue(session, *image_paths, *job_paths)
 
     # Delete news (images will be deleted from DB via CASCADE)
     session.delete(news)
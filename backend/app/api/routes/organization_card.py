@@ -3,8 +3,9 @@ from typing import Any
 
 from fastapi import APIRouter, Depends
 from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.api.deps import SessionDep, get_current_active_superuser
+from app.api.deps import AsyncReadSessionDep, SessionDep, get_current_active_superuser
 from app.core.errors import ConflictError, ErrorCode, NotFoundError
 from app.models import OrganizationCard
 from app.schemas import (
@@ -21,6 +22,10 @@ def _get_single_card(session: SessionDep) -> OrganizationCard | None:
     return session.exec(select(OrganizationCard)).first()
 
 
+async def _get_single_card_async(session: AsyncSession) -> OrganizationCard | None:
+    return (await session.exec(select(OrganizationCard))).first()
+
+
 def _normalize_phones(card: OrganizationCard) -> None:
     """Convert legacy string phones to dict format."""
     if card.phones and isinstance(card.phones[0], str):
@@ -31,8 +36,8 @@ def _normalize_phones(card: OrganizationCard) -> None:
 
 
 @public_router.get("/public", response_model=OrganizationCardPublic)
-def read_public_card(session: SessionDep) -> Any:
-    card = _get_single_card(session)
+async def read_public_card(session: AsyncReadSessionDep) -> Any:
+    card = await _get_single_card_async(session)
     if not card:
         raise NotFoundError(ErrorCode.ORG_CARD_NOT_FOUND, "Organization card not found")
     _normalize_phones(card)
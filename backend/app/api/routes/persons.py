@@ -5,7 +5,7 @@ from typing import Any
 from fastapi import APIRouter, Depends, HTTPException
 from sqlmodel import func, select
 
-from app.api.deps import SessionDep, get_current_active_superuser
+from app.api.deps import AsyncReadSessionDep, SessionDep, get_current_active_superuser
 from app.core.errors import ConflictError, ErrorCode, NotFoundError
 from app.models import Person, PersonImage, Position
 from app.schemas import (
@@ -16,7 +16,7 @@ from app.schemas import (
     PersonUpdate,
     PositionPublic,
 )
-from app.services.image_service import image_service
+from app.services.file_cleanup_service import file_cleanup_service
 
 router = APIRouter(prefix="/persons", tags=["persons"])
 
@@ -33,6 +33,9 @@ def _build_person_public(
             file_path=image.file_path,
             file_size=image.file_size,
             mime_type=image.mime_type,
+            width=image.width,
+            height=image.height,
+            placeholder=image.placeholder,
             created_at=image.created_at,
         )
     return PersonPublic(
@@ -67,26 +70,30 @@ def _get_position(session: SessionDep, position_id: uuid.UUID) -> Position:
     "/public",
     response_model=PersonsPublic,
 )
-def read_public_persons(session: SessionDep, skip: int = 0, limit: int = 100) -> Any:
+async def read_public_persons(
+    session: AsyncReadSessionDep, skip: int = 0, limit: int = 100
+) -> Any:
     """Retrieve persons for public pages (without auth)."""
     count_statement = select(func.count()).select_from(Person)
-    count = session.exec(count_statement).one()
+    count = (await session.exec(count_statement)).one()
     statement = (
         select(Person)
         .offset(skip)
         .limit(limit)
         .order_by(Person.last_name, Person.first_name, Person.middle_name)
     )
-    persons = session.exec(statement).all()
+    persons = (await session.exec(statement)).all()
     data = []
     for person in persons:
-        position = session.get(Position, person.position_id)
+        position = await session.get(Position, person.position_id)
         if not position:
             raise HTTPException(
                 status_code=500, detail=f"Position not found for person {person.id}"
             )
-        image = session.exec(
-            select(PersonImage).where(PersonImage.person_id == person.id)
+        image = (
+            await session.exec(
+                select(PersonImage).where(PersonImage.person_id == person.id)
+            )
         ).first()
         data.append(_build_person_public(person, position, image))
     return PersonsPublic(data=data, count=count)
@@ -276,9 +283,7 @@ def delete_person(*, session: SessionDep, person_id: uuid.UUID) -> Any:
         select(PersonImage).where(PersonImage.person_id == person_id)
     ).first()
     if image:
-        file_path = image_service.UPLOAD_DIR / image.file_path
-        if file_path.exists():
-            file_path.unlink()
+        file_cleanup_service.enqueue(session, image.file_path)
     session.delete(person)
     session.commit()
     return {"message": "Person deleted successfully"}
@@ -1,7 +1,7 @@
 import uuid
 from typing import Any
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from sqlmodel import func, select
 
 from app.api.deps import (
@@ -39,6 +39,7 @@ from app.schemas import (
     UserUpdate,
     UserUpdateMe,
 )
+from app.services.email_outbox_service import email_outbox_service
 from app.services.email_service import email_service
 from app.services.verification_service import verification_service
 
@@ -87,7 +88,6 @@ def read_users(
 async def create_user(
     *,
     session: SessionDep,
-    background_tasks: BackgroundTasks,
     user_in: UserCreate,
     current_user: CurrentUser,
 ) -> Any:
@@ -122,11 +122,11 @@ async def create_user(
     if settings.emails_enabled and user_in.email:
         # Don't send password in email for security - user should set it themselves
         # or use password reset if needed
-        background_tasks.add_task(
-            email_service.send_new_account_email_sync,
-            email_to=user_in.email,
-            username=user_in.email,
+        email_service.queue_new_account_email(
+            session, email_to=user_in.email, username=user_in.email
         )
+        session.commit()
+        email_outbox_service.notify()
     return user
 
 
@@ -167,7 +167,6 @@ def update_user_me(
 async def request_email_verification_code(
     *,
     session: SessionDep,
-    background_tasks: BackgroundTasks,
     request: EmailVerificationRequest,
     current_user: CurrentUser,
 ) -> Any:
@@ -202,11 +201,11 @@ async def request_email_verification_code(
             raise BadRequestError(
                 ErrorCode.USER_EMAIL_NOT_SET, "Current email address is not set"
             )
-        background_tasks.add_task(
-            email_service.send_email_verification_code_sync,
-            email_to=current_user.email,
-            code=code,
+        email_service.queue_email_verification_code(
+            session, email_to=current_user.email, code=code
         )
+        session.commit()
+        email_outbox_service.notify()
 
     return Message(
         message="Verification code has been sent to your current email address"
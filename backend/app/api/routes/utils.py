@@ -1,26 +1,88 @@
-"""Utility routes for health checks and IP blocking management."""
+"""Utility routes for health checks, metrics, IP blocking and rate limit diagnostics."""
 
+import secrets
 from time import time
-from typing import Any
-
-from fastapi import APIRouter, Depends, HTTPException
-
-from app.api.deps import get_current_active_superuser
-from app.core.security import get_ip_blocking_middleware
-from app.schemas import BlockedIPInfo, BlockedIPsList, Message
+from typing import Annotated, Any
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.api.deps import get_current_active_superuser, get_current_user
+from app.core.config import settings
+from app.core.db import async_engine, async_replica_engine, engine
+from app.core.db_pool import pool_status
+from app.core.metrics import CONTENT_TYPE, registry
+from app.core.security import (
+    get_ip_blocking_middleware,
+    get_rate_limit_latency_tracker,
+)
+from app.schemas import (
+    BlockedIPInfo,
+    BlockedIPsList,
+    DatabasePoolStatus,
+    HealthCheck,
+    Message,
+    RateLimitLatencyInfo,
+    RateLimitLatencyList,
+)
 
 router = APIRouter(prefix="/utils", tags=["utils"])
 
 
-@router.get("/health-check/")
-async def health_check() -> bool:
+@router.get("/health-check/", response_model=HealthCheck)
+async def health_check() -> Any:
     """
     Health check endpoint.
 
     Returns:
-        True if service is healthy
+        Service status with sync, async and replica (if configured) database
+        pool gauges (checked-out connections, overflow, checkout wait time)
+    """
+    return HealthCheck(
+        db_pool=DatabasePoolStatus(**pool_status(engine)),
+        async_db_pool=DatabasePoolStatus(**pool_status(async_engine.sync_engine)),
+        replica_db_pool=DatabasePoolStatus(
+            **pool_status(async_replica_engine.sync_engine)
+        )
+        if async_replica_engine
+        else None,
+    )
+
+
+def _check_superuser(token: str) -> None:
+    with Session(engine) as session:
+        get_current_active_superuser(get_current_user(session, token))
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics(authorization: Annotated[str | None, Header()] = None) -> Response:
     """
-    return True
+    Metrics of this process in the Prometheus text format.
+
+    Requires ``Authorization: Bearer <METRICS_TOKEN>`` or a superuser's access
+    token; only a local environment without METRICS_TOKEN serves it openly,
+    and production does not serve it at all without METRICS_TOKEN. Runs on
+    the event loop so the request threadpool gauges describe the loop serving
+    the application.
+
+    Raises:
+        HTTPException: If the token is missing or wrong, or metrics are
+            disabled
+    """
+    token = settings.METRICS_TOKEN
+    if not token and settings.ENVIRONMENT == "production":
+        raise HTTPException(status_code=404, detail="Not Found")
+    if token:
+        allowed = secrets.compare_digest(authorization or "", f"Bearer {token}")
+    else:
+        allowed = settings.ENVIRONMENT == "local"
+    if not allowed:
+        scheme, _, credentials = (authorization or "").partition(" ")
+        if scheme.lower() != "bearer" or not credentials:
+            raise HTTPException(status_code=403, detail="Invalid metrics token")
+        await run_in_threadpool(_check_superuser, credentials)
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
 
 
 @router.get(
@@ -94,3 +156,31 @@ def unblock_ip(ip_address: str) -> Any:
         raise HTTPException(
             status_code=404, detail=f"IP address {ip_address} is not blocked"
         )
+
+
+@router.get(
+    "/rate-limit-latency/",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_model=RateLimitLatencyList,
+)
+def get_rate_limit_latency() -> Any:
+    """
+    Get rate limit storage latency per route.
+
+    Only accessible by superusers. Collected for shared storages
+    (postgres, file); the in-memory storage is not instrumented.
+
+    Returns:
+        Average and maximum storage latency per rate-limited route
+    """
+    stats = get_rate_limit_latency_tracker().snapshot()
+    routes = [
+        RateLimitLatencyInfo(
+            route=item.route,
+            calls=item.calls,
+            avg_ms=round(item.avg_ms, 3),
+            max_ms=round(item.max_seconds * 1000, 3),
+        )
+        for item in sorted(stats, key=lambda s: s.route)
+    ]
+    return RateLimitLatencyList(storage=settings.RATE_LIMIT_STORAGE, routes=routes)
@@ -48,6 +48,10 @@ class Settings(BaseSettings):
 
     PROJECT_NAME: str
     SENTRY_DSN: HttpUrl | None = None
+    # Bearer token for /utils/metrics (superusers' access tokens work too);
+    # when unset the endpoint is open in local, superuser-only in staging and
+    # not served in production
+    METRICS_TOKEN: str | None = None
     POSTGRES_SERVER: str
     POSTGRES_PORT: int = 5432
     POSTGRES_USER: str
@@ -66,12 +70,59 @@ class Settings(BaseSettings):
             path=self.POSTGRES_DB,
         )
 
+    # Connection pool (per engine; every worker has one sync and one async engine)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 0  # 0 disables the server-side timeout
+    DB_SLOW_QUERY_MS: int = 200  # log statements slower than this; 0 disables
+
+    # Rate limit counters: "memory" (per process), "postgres" (shared through
+    # the main database) or "file" (SQLite file shared by workers on one host)
+    RATE_LIMIT_STORAGE: Literal["memory", "postgres", "file"] = "memory"
+    RATE_LIMIT_FILE_PATH: str = "/tmp/rate_limits.sqlite3"
+    RATE_LIMIT_SWEEP_INTERVAL_SECONDS: int = 60
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def rate_limit_storage_uri(self) -> str:
+        if self.RATE_LIMIT_STORAGE == "postgres":
+            return str(self.SQLALCHEMY_DATABASE_URI)
+        if self.RATE_LIMIT_STORAGE == "file":
+            return f"sqlite:///{self.RATE_LIMIT_FILE_PATH}"
+        return "memory://"
+
+    # Optional streaming replica for public read-only routes
+    POSTGRES_REPLICA_SERVER: str | None = None
+    POSTGRES_REPLICA_PORT: int | None = None
+    REPLICA_STICKY_SECONDS: int = 10  # reads go to primary after a client's write
+    REPLICA_RETRY_SECONDS: int = 30  # skip replica after a failed connection
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def SQLALCHEMY_REPLICA_DATABASE_URI(self) -> PostgresDsn | None:
+        if not self.POSTGRES_REPLICA_SERVER:
+            return None
+        return PostgresDsn.build(
+            scheme="postgresql+psycopg",
+            username=self.POSTGRES_USER,
+            password=self.POSTGRES_PASSWORD,
+            host=self.POSTGRES_REPLICA_SERVER,
+            port=self.POSTGRES_REPLICA_PORT or self.POSTGRES_PORT,
+            path=self.POSTGRES_DB,
+        )
+
     SMTP_TLS: bool = True
     SMTP_SSL: bool = False
     SMTP_PORT: int = 587
     SMTP_HOST: str | None = None
     SMTP_USER: str | None = None
     SMTP_PASSWORD: str | None = None
+    SMTP_TIMEOUT_SECONDS: int = 30
+    # The worker's SMTP connection is closed after this long without a send
+    SMTP_KEEPALIVE_SECONDS: int = 60
     EMAILS_FROM_EMAIL: EmailStr | None = None
     EMAILS_FROM_NAME: str | None = None
 
@@ -82,6 +133,16 @@ class Settings(BaseSettings):
         return self
 
     EMAIL_RESET_TOKEN_EXPIRE_HOURS: int = 48
+    # Email change codes: "database" (shared by all workers) or "memory"
+    # (per process, for single-worker development)
+    VERIFICATION_CODE_STORE: Literal["database", "memory"] = "database"
+    VERIFICATION_CODE_MAX_ATTEMPTS: int = 5  # wrong guesses before the code is dropped
+    VERIFICATION_CODE_MAX_ENTRIES: int = 10_000  # memory store cap
+    # Email outbox drained by the background worker
+    EMAIL_OUTBOX_POLL_INTERVAL_SECONDS: int = 5
+    EMAIL_OUTBOX_BATCH_SIZE: int = 50
+    EMAIL_OUTBOX_LEASE_SECONDS: int = 5 * 60
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = 8
 
     @computed_field  # type: ignore[prop-decorator]
     @property
@@ -92,9 +153,42 @@ class Settings(BaseSettings):
     FIRST_SUPERUSER: EmailStr
     FIRST_SUPERUSER_PASSWORD: str
 
+    # Upload storage: directory UPLOAD_DIR or an S3-compatible bucket (MinIO)
+    STORAGE_BACKEND: Literal["local", "s3"] = "local"
     UPLOAD_DIR: str = "static/uploads"
+    S3_BUCKET: str = ""
+    S3_ENDPOINT_URL: str | None = None  # None for AWS, e.g. http://minio:9000
+    # Endpoint in presigned URLs, when clients reach the bucket under another
+    # host than the API (http://localhost:9000 for the compose MinIO)
+    S3_PUBLIC_ENDPOINT_URL: str | None = None
+    S3_REGION: str | None = None
+    S3_ACCESS_KEY_ID: str | None = None
+    S3_SECRET_ACCESS_KEY: str | None = None
+    S3_PRESIGNED_URL_EXPIRE_SECONDS: int = 60 * 60
     MAX_UPLOAD_SIZE: int = 10 * 1024 * 1024
+    # Decompression bomb limit for uploaded images (width * height)
+    MAX_IMAGE_PIXELS: int = 64 * 1024 * 1024
     MAX_DOCUMENT_SIZE: int = 50 * 1024 * 1024  # 50MB
+    # ZIP export of documents (no ZIP64, so the total must stay below 4 GiB)
+    DOCUMENT_EXPORT_MAX_FILES: int = 500
+    DOCUMENT_EXPORT_MAX_SIZE: int = 2 * 1024 * 1024 * 1024
+    # First-page PDF thumbnails (pdftoppm if installed, embedded scan otherwise)
+    DOCUMENT_THUMBNAIL_POLL_INTERVAL_SECONDS: int = 10
+    DOCUMENT_THUMBNAIL_RENDER_TIMEOUT_SECONDS: int = 30
+    DOCUMENT_THUMBNAIL_LEASE_SECONDS: int = 5 * 60
+    DOCUMENT_THUMBNAIL_CACHE_SECONDS: int = 24 * 60 * 60
+    MAX_BULK_UPLOAD_FILES: int = 50
+    IMAGE_PROCESSING_WORKERS: int = 4
+    # Background image processing queue (upload_image with process_async)
+    IMAGE_JOB_POLL_INTERVAL_SECONDS: int = 5
+    IMAGE_JOB_LEASE_SECONDS: int = 5 * 60
+    IMAGE_JOB_MAX_ATTEMPTS: int = 3
+    # Background removal of deleted upload files and orphan reconciliation
+    FILE_CLEANUP_INTERVAL_SECONDS: int = 10
+    FILE_CLEANUP_BATCH_SIZE: int = 500
+    FILE_CLEANUP_MAX_ATTEMPTS: int = 10
+    UPLOAD_RECONCILE_INTERVAL_SECONDS: int = 24 * 60 * 60  # 0 disables
+    UPLOAD_ORPHAN_MIN_AGE_SECONDS: int = 60 * 60
     ALLOWED_IMAGE_TYPES: list[str] = ["image/jpeg", "image/png", "image/webp", "image/gif"]
     ALLOWED_DOCUMENT_TYPES: list[str] = [
         "application/pdf",
@@ -129,6 +223,7 @@ class Settings(BaseSettings):
         self._check_default_secret(
             "FIRST_SUPERUSER_PASSWORD", self.FIRST_SUPERUSER_PASSWORD
         )
+        self._check_default_secret("METRICS_TOKEN", self.METRICS_TOKEN)
 
         return self
 
@@ -1,13 +1,36 @@
 """Database initialization and configuration."""
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlmodel import Session, create_engine, select
 
 from app.core.config import settings
+from app.core.db_pool import engine_options
+from app.core.metrics import instrument_engine
 from app.models import User
 from app.repositories.user_repository import create_user
 from app.schemas import UserCreate
 from app.services.position_service import ensure_default_position
 
-engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI), **engine_options())
+
+# Same DSN: the psycopg dialect switches to psycopg's async connection class
+async_engine = create_async_engine(
+    str(settings.SQLALCHEMY_DATABASE_URI), **engine_options(is_async=True)
+)
+
+# Read-only replica for public GET routes (None when not configured)
+async_replica_engine = (
+    create_async_engine(
+        str(settings.SQLALCHEMY_REPLICA_DATABASE_URI), **engine_options(is_async=True)
+    )
+    if settings.SQLALCHEMY_REPLICA_DATABASE_URI
+    else None
+)
+
+# Query count and time for /utils/metrics
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
+if async_replica_engine:
+    instrument_engine(async_replica_engine.sync_engine)
 
 
 # make sure all SQLModel models are imported (app.models) before initializing DB
@@ -0,0 +1,117 @@
+"""Connection pool configuration and instrumentation."""
+
+import threading
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any
+
+from sqlalchemy import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, QueuePool
+
+from app.core.config import settings
+
+
+@dataclass
+class PoolWaitSnapshot:
+    """Connection checkout wait statistics."""
+
+    waits: int
+    total_seconds: float
+    max_seconds: float
+
+
+class PoolWaitStats:
+    """Thread-safe accumulator of time spent waiting for a pooled connection."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._waits = 0
+        self._total = 0.0
+        self._max = 0.0
+
+    def record(self, elapsed: float) -> None:
+        with self._lock:
+            self._waits += 1
+            self._total += elapsed
+            if elapsed > self._max:
+                self._max = elapsed
+
+    def snapshot(self) -> PoolWaitSnapshot:
+        with self._lock:
+            return PoolWaitSnapshot(
+                waits=self._waits, total_seconds=self._total, max_seconds=self._max
+            )
+
+
+class _WaitTimingMixin:
+    """Time every checkout, including waits on an exhausted pool."""
+
+    wait_stats: PoolWaitStats
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started = perf_counter()
+        try:
+            return super()._do_get()  # type: ignore[misc, no-any-return]
+        finally:
+            self.wait_stats.record(perf_counter() - started)
+
+
+class InstrumentedQueuePool(_WaitTimingMixin, QueuePool):
+    """QueuePool with checkout wait statistics."""
+
+
+class InstrumentedAsyncQueuePool(_WaitTimingMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool with checkout wait statistics."""
+
+
+def engine_options(*, is_async: bool = False) -> dict[str, Any]:
+    """
+    Build create_engine keyword arguments from settings.
+
+    Each worker process owns one sync and one async pool, so the worst case
+    per worker is ``2 * (DB_POOL_SIZE + DB_MAX_OVERFLOW)`` connections.
+    """
+    options: dict[str, Any] = {
+        "poolclass": InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if settings.DB_STATEMENT_TIMEOUT_MS > 0:
+        options["connect_args"] = {
+            "options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+        }
+    return options
+
+
+def pool_status(engine: Engine) -> dict[str, Any]:
+    """
+    Get pool gauges for an engine.
+
+    Returns:
+        Dict with pool size, checked in/out connections, current overflow
+        and checkout wait statistics
+    """
+    pool = engine.pool
+    status: dict[str, Any] = {
+        "size": pool.size() if isinstance(pool, QueuePool) else 0,
+        "checked_out": pool.checkedout() if isinstance(pool, QueuePool) else 0,
+        "checked_in": pool.checkedin() if isinstance(pool, QueuePool) else 0,
+        "overflow": max(pool.overflow(), 0) if isinstance(pool, QueuePool) else 0,
+        "waits": 0,
+        "avg_wait_ms": 0.0,
+        "max_wait_ms": 0.0,
+    }
+    if isinstance(pool, _WaitTimingMixin):
+        waits = pool.wait_stats.snapshot()
+        status["waits"] = waits.waits
+        if waits.waits:
+            status["avg_wait_ms"] = round(waits.total_seconds / waits.waits * 1000, 3)
+        status["max_wait_ms"] = round(waits.max_seconds * 1000, 3)
+    return status
@@ -0,0 +1,69 @@
+"""Read replica routing: replica health tracking and read-your-writes stickiness."""
+
+import threading
+from collections.abc import Callable
+from time import monotonic
+
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.config import settings
+
+# Cookie telling the API to serve this client's reads from the primary
+READ_PRIMARY_COOKIE = "db_read_primary"
+
+_WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+
+class ReplicaHealth:
+    """
+    Circuit breaker for the read replica.
+
+    After a failed connection attempt the replica is skipped for
+    ``retry_seconds`` and reads go to the primary.
+    """
+
+    def __init__(self, retry_seconds: float) -> None:
+        self.retry_seconds = retry_seconds
+        self._lock = threading.Lock()
+        self._down_until = 0.0
+
+    def is_available(self) -> bool:
+        return monotonic() >= self._down_until
+
+    def mark_down(self) -> None:
+        with self._lock:
+            self._down_until = monotonic() + self.retry_seconds
+
+
+# Global instance
+replica_health = ReplicaHealth(retry_seconds=settings.REPLICA_RETRY_SECONDS)
+
+
+def prefers_primary(request: Request) -> bool:
+    """Check if request comes from a client that has just written data."""
+    return READ_PRIMARY_COOKIE in request.cookies
+
+
+class ReadYourWritesMiddleware(BaseHTTPMiddleware):
+    """
+    Pin a client's reads to the primary for a short time after a write.
+
+    Successful write requests set a short-lived cookie; read-only routes using
+    the replica session check it and fall back to the primary, so editors see
+    their own changes regardless of replication lag.
+    """
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        response: Response = await call_next(request)
+        if request.method in _WRITE_METHODS and response.status_code < 400:
+            response.set_cookie(
+                READ_PRIMARY_COOKIE,
+                "1",
+                max_age=settings.REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite="lax",
+                secure=settings.ENVIRONMENT != "local",
+            )
+        return response
@@ -27,11 +27,14 @@ class ErrorCode:
     # News Images
     NEWS_IMAGE_NOT_FOUND = "NEWS_IMAGE_NOT_FOUND"
     NEWS_IMAGE_INVALID_ORDER = "NEWS_IMAGE_INVALID_ORDER"
+    NEWS_IMAGE_TOO_MANY_FILES = "NEWS_IMAGE_TOO_MANY_FILES"
 
     # Documents
     DOCUMENT_NOT_FOUND = "DOCUMENT_NOT_FOUND"
     DOCUMENT_FILE_NOT_FOUND = "DOCUMENT_FILE_NOT_FOUND"
     DOCUMENT_FORBIDDEN = "DOCUMENT_FORBIDDEN"
+    DOCUMENT_EXPORT_INVALID = "DOCUMENT_EXPORT_INVALID"
+    DOCUMENT_EXPORT_TOO_LARGE = "DOCUMENT_EXPORT_TOO_LARGE"
 
     # Document Categories
     CATEGORY_NOT_FOUND = "CATEGORY_NOT_FOUND"
@@ -0,0 +1,504 @@
+"""
+In-process metrics in the Prometheus text exposition format.
+
+Metrics live in this process only (one registry per worker process) and are
+rendered on scrape; nothing is pushed anywhere. Recording is a dict lookup
+and a few additions under an uncontended lock, so instrumenting a request
+costs a few microseconds.
+"""
+import logging
+import re
+import threading
+from bisect import bisect_left
+from collections.abc import Awaitable, Callable, Iterable, MutableMapping
+from contextvars import ContextVar
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any, TypeVar
+
+import anyio.to_thread
+from sqlalchemy import Engine, event
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; from a cached lookup to a slow export
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+PROCESSING_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+Labels = tuple[str, ...]
+M = TypeVar("M", bound="Metric")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: Labels, values: Labels, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Metric:
+    """Base of the metric types: a name, help text and label names."""
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Labels = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = labels
+        self._lock = threading.Lock()
+
+    def samples(self) -> Iterable[str]:
+        """Sample lines of this metric, without HELP and TYPE."""
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+            *self.samples(),
+        ]
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """Monotonically increasing value per label set."""
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Labels = ()) -> None:
+        super().__init__(name, documentation, labels)
+        self._values: dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            values = list(self._values.items())
+        for labels, value in values:
+            yield (
+                f"{self.name}{_format_labels(self.label_names, labels)} "
+                f"{_format_value(value)}"
+            )
+
+
+class Gauge(Metric):
+    """
+    Value that goes up and down.
+
+    Args:
+        collect: Called on every scrape for the current values, by label set;
+            for state that is cheaper to read than to track (pool sizes)
+    """
+
+    type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Labels = (),
+        *,
+        collect: Callable[[], Iterable[tuple[Labels, float]]] | None = None,
+    ) -> None:
+        super().__init__(name, documentation, labels)
+        self._values: dict[Labels, float] = {}
+        self._collect = collect
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value: float, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            values = dict(self._values)
+        if self._collect is not None:
+            values.update(self._collect())
+        for labels, value in values.items():
+            yield (
+                f"{self.name}{_format_labels(self.label_names, labels)} "
+                f"{_format_value(value)}"
+            )
+
+
+class Histogram(Metric):
+    """Distribution of observed values in cumulative buckets."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Labels = (),
+        *,
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labels)
+        self.buckets = buckets
+        # Per label set: count of each bucket (not cumulative) plus +Inf, sum
+        self._values: dict[Labels, tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        # Bucket upper bounds are inclusive (le)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+            entry[0][index] += 1
+            entry[1][0] += value
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            values = [
+                (labels, list(counts), total[0])
+                for labels, (counts, total) in self._values.items()
+            ]
+        bounds = [*self.buckets, float("inf")]
+        for labels, counts, total in values:
+            cumulative = 0
+            for bound, count in zip(bounds, counts, strict=True):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield (
+                    f"{self.name}_bucket"
+                    f"{_format_labels(self.label_names, labels, le)} {cumulative}"
+                )
+            suffix = _format_labels(self.label_names, labels)
+            yield f"{self.name}_sum{suffix} {_format_value(total)}"
+            yield f"{self.name}_count{suffix} {cumulative}"
+
+
+class Registry:
+    """Ordered collection of the metrics of this process."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"Duplicate metric {metric.name}")
+        self._metrics[metric.name] = metric
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text format."""
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+registry = Registry()
+
+
+def _registered(metric: M) -> M:
+    registry.register(metric)
+    return metric
+
+
+# =============================================================================
+# Application metrics
+# =============================================================================
+
+HTTP_REQUESTS = _registered(
+    Counter(
+        "http_requests_total",
+        "HTTP requests by route template and status code.",
+        ("method", "route", "status"),
+    )
+)
+HTTP_REQUEST_DURATION = _registered(
+    Histogram(
+        "http_request_duration_seconds",
+        "Time from receiving a request to the end of its response body.",
+        ("method", "route"),
+    )
+)
+HTTP_REQUEST_DB_QUERIES = _registered(
+    Histogram(
+        "http_request_db_queries",
+        "Database queries executed while handling one request.",
+        ("route",),
+        buckets=QUERY_COUNT_BUCKETS,
+    )
+)
+HTTP_REQUEST_DB_DURATION = _registered(
+    Histogram(
+        "http_request_db_duration_seconds",
+        "Time spent in database queries while handling one request.",
+        ("route",),
+    )
+)
+DB_QUERY_DURATION = _registered(
+    Histogram(
+        "db_query_duration_seconds",
+        "Duration of every database query, including background workers.",
+    )
+)
+IMAGE_PROCESSING_DURATION = _registered(
+    Histogram(
+        "image_processing_duration_seconds",
+        "Time to process one image or render one document thumbnail.",
+        ("operation",),
+        buckets=PROCESSING_BUCKETS,
+    )
+)
+CACHE_REQUESTS = _registered(
+    Counter(
+        "cache_requests_total",
+        "Cache lookups by cache and result (hit, miss).",
+        ("cache", "result"),
+    )
+)
+EMAIL_DELIVERIES = _registered(
+    Counter(
+        "email_deliveries_total",
+        "Outbox delivery attempts by result (sent, retry, failed).",
+        ("result",),
+    )
+)
+
+
+def _request_threadpool(attribute: str) -> list[tuple[Labels, float]]:
+    """Tokens of the anyio limiter running sync routes and dependencies."""
+    try:
+        limiter = anyio.to_thread.current_default_thread_limiter()
+    except RuntimeError:
+        # Not scraped from the event loop
+        return []
+    return [(("request",), float(getattr(limiter, attribute)))]
+
+
+# Saturated when busy == max: further sync work waits for a free thread
+THREADPOOL_BUSY = _registered(
+    Gauge(
+        "threadpool_busy_threads",
+        "Threads currently running work, by pool.",
+        ("pool",),
+        collect=lambda: _request_threadpool("borrowed_tokens"),
+    )
+)
+THREADPOOL_LIMIT = _registered(
+    Gauge(
+        "threadpool_max_threads",
+        "Maximum number of threads, by pool.",
+        ("pool",),
+        collect=lambda: _request_threadpool("total_tokens"),
+    )
+)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Count a lookup in a named cache; hit ratio = hits / (hits + misses)."""
+    CACHE_REQUESTS.inc(cache, "hit" if hit else "miss")
+
+
+# =============================================================================
+# Per-request database statistics
+# =============================================================================
+
+
+@dataclass(slots=True)
+class RequestStats:
+    """Work done on behalf of the current request."""
+
+    path: str = ""
+    queries: int = 0
+    db_seconds: float = 0.0
+
+
+# Set by MetricsMiddleware; copied into threadpool workers with the context,
+# so sync routes and async (greenlet) sessions update the same object
+_request_stats: ContextVar[RequestStats | None] = ContextVar(
+    "request_stats", default=None
+)
+
+
+def current_request_stats() -> RequestStats | None:
+    """Statistics of the request being handled, None outside of requests."""
+    return _request_stats.get()
+
+
+_SQL_LITERAL = re.compile(
+    r"'(?:[^']|'')*'"  # string
+    r"|%\(\w+\)s|%s|\$\d+"  # bound parameter
+    r"|\b\d+(?:\.\d+)?\b"  # number
+)
+_SQL_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SQL_SPACE = re.compile(r"\s+")
+
+
+def normalize_sql(statement: str) -> str:
+    """
+    Reduce a statement to its shape for logging and grouping.
+
+    Literals and bound parameters become ``?``, IN lists of any length become
+    ``(?, ...)`` and whitespace is collapsed, so the same query from
+    different requests logs identically and no parameter values (emails,
+    tokens) end up in the log.
+    """
+    statement = _SQL_LITERAL.sub("?", statement)
+    statement = _SQL_LIST.sub("(?, ...)", statement)
+    return _SQL_SPACE.sub(" ", statement).strip()
+
+
+def _before_cursor_execute(conn: Any, *_args: Any) -> None:
+    # A connection runs one statement at a time
+    conn.info["query_started"] = perf_counter()
+
+
+def _after_cursor_execute(
+    conn: Any, _cursor: Any, statement: str, *_args: Any
+) -> None:
+    started = conn.info.pop("query_started", None)
+    if started is None:
+        return
+    elapsed = perf_counter() - started
+    DB_QUERY_DURATION.observe(elapsed)
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+    if settings.DB_SLOW_QUERY_MS and elapsed * 1000 >= settings.DB_SLOW_QUERY_MS:
+        logger.warning(
+            "Slow query (%.1f ms) in %s: %s",
+            elapsed * 1000,
+            stats.path if stats is not None else "background task",
+            normalize_sql(statement),
+        )
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Time the queries of an engine (the sync_engine of an async engine).
+
+    Every query feeds db_query_duration_seconds, the statistics of the
+    current request and, above DB_SLOW_QUERY_MS, the slow query log.
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# =============================================================================
+# Middleware
+# =============================================================================
+
+Scope = MutableMapping[str, Any]
+Message = MutableMapping[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+
+_CONDITIONAL_HEADERS = (b"if-none-match", b"if-modified-since")
+
+
+def _server_timing(stats: RequestStats, started: float) -> bytes:
+    total_ms = (perf_counter() - started) * 1000
+    return (
+        f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.queries} queries", '
+        f"app;dur={total_ms:.1f}"
+    ).encode("latin-1")
+
+
+class MetricsMiddleware:
+    """
+    Record latency, status and database work of every HTTP request.
+
+    A plain ASGI middleware rather than BaseHTTPMiddleware: it only wraps
+    send, so streaming responses are not buffered. Requests are labelled with
+    the route template (``/api/v1/news/{news_id}``), which keeps the number of
+    series bounded; static files and unknown paths share the "other" route.
+    Conditional GETs count as hits of the "http_conditional" cache when
+    answered with 304 Not Modified.
+
+    Args:
+        app: Wrapped ASGI application
+        server_timing: Add a ``Server-Timing`` header with the query count
+            and database time of the request, shown by browser dev tools;
+            it reveals database timings to clients, so not for production
+    """
+
+    def __init__(
+        self,
+        app: Callable[[Scope, Receive, Send], Awaitable[None]],
+        *,
+        server_timing: bool = False,
+    ) -> None:
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        stats = RequestStats(path=scope["path"])
+        started = perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing:
+                    # Queries run while streaming the body are not included
+                    message["headers"] = [
+                        *message.get("headers", ()),
+                        (b"server-timing", _server_timing(stats, started)),
+                    ]
+            await send(message)
+
+        token = _request_stats.set(stats)
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = perf_counter() - started
+            _request_stats.reset(token)
+            # Set by FastAPI once the request was matched to an APIRoute
+            route_obj = scope.get("route")
+            route = getattr(route_obj, "path_format", None) or "other"
+            method = scope["method"]
+            HTTP_REQUESTS.inc(method, route, str(status))
+            HTTP_REQUEST_DURATION.observe(elapsed, method, route)
+            HTTP_REQUEST_DB_QUERIES.observe(stats.queries, route)
+            HTTP_REQUEST_DB_DURATION.observe(stats.db_seconds, route)
+            if method == "GET" and any(
+                name in _CONDITIONAL_HEADERS for name, _ in scope["headers"]
+            ):
+                record_cache("http_conditional", status == 304)
@@ -24,6 +24,11 @@ from app.core.security.rate_limit import (
     _rate_limit_exceeded_handler,
     limiter,
 )
+from app.core.security.rate_limit_storage import (
+    RateLimitLatency,
+    RateLimitLatencyTracker,
+    get_rate_limit_latency_tracker,
+)
 
 __all__ = [
     # auth
@@ -48,4 +53,8 @@ __all__ = [
     "RateLimitExceeded",
     "_rate_limit_exceeded_handler",
     "limiter",
+    # rate_limit_storage
+    "RateLimitLatency",
+    "RateLimitLatencyTracker",
+    "get_rate_limit_latency_tracker",
 ]
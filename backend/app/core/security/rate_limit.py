@@ -6,6 +6,9 @@ from slowapi.util import get_remote_address
 
 from app.core.config import settings
 
+# Registers "postgresql+psycopg" and "sqlite" storage schemes with limits
+from app.core.security import rate_limit_storage  # noqa: F401
+
 __all__ = [
     "limiter",
     "_rate_limit_exceeded_handler",
@@ -15,10 +18,17 @@ __all__ = [
 ]
 
 # Initialize limiter
+# Shared storages fall back to in-memory counters while the backend is down
 limiter = Limiter(
     key_func=get_remote_address,
     default_limits=["1000/hour"],
-    storage_uri="memory://",
+    storage_uri=settings.rate_limit_storage_uri,
+    storage_options=(
+        {}
+        if settings.RATE_LIMIT_STORAGE == "memory"
+        else {"sweep_interval": settings.RATE_LIMIT_SWEEP_INTERVAL_SECONDS}
+    ),
+    in_memory_fallback_enabled=settings.RATE_LIMIT_STORAGE != "memory",
 )
 
 # Rate limit configurations based on environment
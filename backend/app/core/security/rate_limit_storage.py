@@ -0,0 +1,251 @@
+"""Shared rate limit storages for slowapi/limits backed by SQL databases."""
+
+import threading
+from dataclasses import dataclass
+from time import perf_counter, time
+from typing import Any
+
+import sqlalchemy as sa
+from limits.storage import Storage
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.models import RateLimitCounter
+
+_counter_table: sa.Table = RateLimitCounter.__table__  # type: ignore[attr-defined]
+
+
+# =============================================================================
+# Latency tracking
+# =============================================================================
+
+
+@dataclass
+class RateLimitLatency:
+    """Accumulated storage latency for a single rate-limited route."""
+
+    route: str
+    calls: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    @property
+    def avg_ms(self) -> float:
+        return (self.total_seconds / self.calls) * 1000 if self.calls else 0.0
+
+
+class RateLimitLatencyTracker:
+    """Thread-safe per-route accumulator of rate limit storage latency."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._routes: dict[str, RateLimitLatency] = {}
+
+    @staticmethod
+    def route_from_key(key: str) -> str:
+        """
+        Extract route scope from limits key.
+
+        Keys look like ``LIMITER/<client>/<endpoint>/<amount>/<multiples>/<unit>``.
+        """
+        parts = key.split("/")
+        return parts[2] if len(parts) > 5 else key
+
+    def record(self, key: str, elapsed: float) -> None:
+        """Record a single storage call for the route owning ``key``."""
+        route = self.route_from_key(key)
+        with self._lock:
+            stats = self._routes.get(route)
+            if stats is None:
+                stats = self._routes[route] = RateLimitLatency(route=route)
+            stats.calls += 1
+            stats.total_seconds += elapsed
+            if elapsed > stats.max_seconds:
+                stats.max_seconds = elapsed
+
+    def snapshot(self) -> list[RateLimitLatency]:
+        """Get copy of collected stats."""
+        with self._lock:
+            return [
+                RateLimitLatency(
+                    route=s.route,
+                    calls=s.calls,
+                    total_seconds=s.total_seconds,
+                    max_seconds=s.max_seconds,
+                )
+                for s in self._routes.values()
+            ]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+
+# Global tracker instance
+_latency_tracker = RateLimitLatencyTracker()
+
+
+def get_rate_limit_latency_tracker() -> RateLimitLatencyTracker:
+    """Get global rate limit latency tracker instance."""
+    return _latency_tracker
+
+
+# =============================================================================
+# Storages
+# =============================================================================
+
+
+class SQLRateLimitStorage(Storage):
+    """
+    Fixed-window counter storage on top of a SQL table.
+
+    Every hit is a single ``INSERT ... ON CONFLICT DO UPDATE ... RETURNING``
+    statement, so increments are atomic across processes and hosts sharing the
+    database. Expired rows are not deleted on every hit: a single batched
+    ``DELETE`` runs at most once per ``sweep_interval`` seconds.
+    """
+
+    STORAGE_SCHEME: list[str] | None = None
+
+    def __init__(
+        self,
+        uri: str | None = None,
+        wrap_exceptions: bool = False,
+        sweep_interval: float = 60,
+        **options: Any,
+    ) -> None:
+        self.engine = sa.create_engine(uri or "", **self._engine_options(**options))
+        self.sweep_interval = float(sweep_interval)
+        self._next_sweep = 0.0
+        self._sweep_lock = threading.Lock()
+        self._insert: Any = (
+            postgresql.insert if self.engine.dialect.name == "postgresql" else sqlite.insert
+        )
+        super().__init__(uri, wrap_exceptions=wrap_exceptions)
+
+    def _engine_options(self, **options: Any) -> dict[str, Any]:
+        return options
+
+    @property
+    def base_exceptions(self) -> type[Exception] | tuple[type[Exception], ...]:
+        return sa.exc.SQLAlchemyError
+
+    def _maybe_sweep(self, connection: sa.Connection, now: float) -> None:
+        """Delete expired counters in one statement, at most once per interval."""
+        if now < self._next_sweep or not self._sweep_lock.acquire(blocking=False):
+            return
+        try:
+            self._next_sweep = now + self.sweep_interval
+            connection.execute(
+                sa.delete(_counter_table).where(_counter_table.c.expires_at <= now)
+            )
+        finally:
+            self._sweep_lock.release()
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        started = perf_counter()
+        now = time()
+        expired = _counter_table.c.expires_at <= now
+        statement = self._insert(_counter_table).values(
+            key=key, value=amount, expires_at=now + expiry
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[_counter_table.c.key],
+            set_={
+                "value": sa.case(
+                    (expired, amount), else_=_counter_table.c.value + amount
+                ),
+                "expires_at": sa.case(
+                    (expired, now + expiry), else_=_counter_table.c.expires_at
+                ),
+            },
+        ).returning(_counter_table.c.value)
+        with self.engine.begin() as connection:
+            value = int(connection.execute(statement).scalar_one())
+            self._maybe_sweep(connection, now)
+        _latency_tracker.record(key, perf_counter() - started)
+        return value
+
+    def get(self, key: str) -> int:
+        started = perf_counter()
+        with self.engine.connect() as connection:
+            value = connection.execute(
+                sa.select(_counter_table.c.value).where(
+                    _counter_table.c.key == key,
+                    _counter_table.c.expires_at > time(),
+                )
+            ).scalar()
+        _latency_tracker.record(key, perf_counter() - started)
+        return int(value or 0)
+
+    def get_expiry(self, key: str) -> float:
+        with self.engine.connect() as connection:
+            expires_at = connection.execute(
+                sa.select(_counter_table.c.expires_at).where(
+                    _counter_table.c.key == key
+                )
+            ).scalar()
+        return float(expires_at) if expires_at is not None else time()
+
+    def check(self) -> bool:
+        try:
+            with self.engine.connect() as connection:
+                connection.execute(sa.text("SELECT 1"))
+            return True
+        except sa.exc.SQLAlchemyError:
+            return False
+
+    def reset(self) -> int | None:
+        with self.engine.begin() as connection:
+            return connection.execute(sa.delete(_counter_table)).rowcount
+
+    def clear(self, key: str) -> None:
+        with self.engine.begin() as connection:
+            connection.execute(
+                sa.delete(_counter_table).where(_counter_table.c.key == key)
+            )
+
+
+class PostgresRateLimitStorage(SQLRateLimitStorage):
+    """
+    Rate limit storage in the application PostgreSQL database.
+
+    Uses the ``ratelimitcounter`` table created by migrations. Accepts the same
+    URI as ``Settings.SQLALCHEMY_DATABASE_URI``.
+    """
+
+    STORAGE_SCHEME = ["postgresql+psycopg"]
+
+    def _engine_options(self, **options: Any) -> dict[str, Any]:
+        # Small dedicated pool: one short statement per rate-limited request
+        return {"pool_size": 2, "max_overflow": 8, "pool_pre_ping": True, **options}
+
+
+class SQLiteRateLimitStorage(SQLRateLimitStorage):
+    """
+    File-backed rate limit storage shared by all workers on one host.
+
+    SQLite in WAL mode serializes writers, which makes the upsert atomic across
+    processes; the table is created on first use.
+    """
+
+    STORAGE_SCHEME = ["sqlite"]
+
+    def __init__(
+        self,
+        uri: str | None = None,
+        wrap_exceptions: bool = False,
+        **options: Any,
+    ) -> None:
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        sa.event.listen(self.engine, "connect", self._configure_connection)
+        _counter_table.create(self.engine, checkfirst=True)
+
+    def _engine_options(self, **options: Any) -> dict[str, Any]:
+        return {"connect_args": {"timeout": 5, "check_same_thread": False}, **options}
+
+    @staticmethod
+    def _configure_connection(dbapi_connection: Any, _record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
@@ -0,0 +1,265 @@
+"""
+Content type detection of uploads by magic bytes.
+
+Clients send whatever Content-Type their browser guesses, and file names can
+be anything, so uploads are classified by their first SNIFF_BYTES instead.
+The filename and claimed type are only used to tell apart formats that share
+a container (legacy Office files, zip-based documents) and for plain text,
+which has no signature. Zip-based Office types are only a guess from the
+first bytes: check the stored file with ooxml_type() before accepting it.
+"""
+import codecs
+import struct
+import zipfile
+from collections.abc import Collection
+from pathlib import PurePath
+from typing import BinaryIO
+
+# Enough for the first zip entry names of OOXML/ODF files
+SNIFF_BYTES = 8 * 1024
+
+PDF = "application/pdf"
+JPEG = "image/jpeg"
+PNG = "image/png"
+GIF = "image/gif"
+WEBP = "image/webp"
+RTF = "application/rtf"
+TEXT = "text/plain"
+DOC = "application/msword"
+XLS = "application/vnd.ms-excel"
+PPT = "application/vnd.ms-powerpoint"
+DOCX = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+XLSX = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+PPTX = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+ODT = "application/vnd.oasis.opendocument.text"
+ODS = "application/vnd.oasis.opendocument.spreadsheet"
+ODP = "application/vnd.oasis.opendocument.presentation"
+
+# Canonical file extension of each detected type
+EXTENSIONS = {
+    PDF: ".pdf",
+    JPEG: ".jpg",
+    PNG: ".png",
+    GIF: ".gif",
+    WEBP: ".webp",
+    RTF: ".rtf",
+    TEXT: ".txt",
+    DOC: ".doc",
+    XLS: ".xls",
+    PPT: ".ppt",
+    DOCX: ".docx",
+    XLSX: ".xlsx",
+    PPTX: ".pptx",
+    ODT: ".odt",
+    ODS: ".ods",
+    ODP: ".odp",
+}
+_BY_EXTENSION = {extension: mime for mime, extension in EXTENSIONS.items()}
+_BY_EXTENSION[".jpeg"] = JPEG
+
+_OLE2 = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+_OLE2_TYPES = (DOC, XLS, PPT)
+OOXML_TYPES = (DOCX, XLSX, PPTX)
+_OOXML_PARTS = ((b"word/", DOCX), (b"xl/", XLSX), (b"ppt/", PPTX))
+_ODF_TYPES = (ODT, ODS, ODP)
+
+
+class UnsupportedFileTypeError(ValueError):
+    """Upload content is not one of the allowed types."""
+
+    def __init__(self, mime_type: str | None) -> None:
+        super().__init__(f"Unsupported file type: {mime_type or 'unknown'}")
+        self.mime_type = mime_type
+
+
+def _hinted(filename: str | None, claimed: str | None) -> list[str]:
+    """Types suggested by the client: file extension first, then Content-Type."""
+    hints = []
+    if filename:
+        extension_type = _BY_EXTENSION.get(PurePath(filename).suffix.lower())
+        if extension_type:
+            hints.append(extension_type)
+    if claimed:
+        hints.append(claimed.split(";")[0].strip().lower())
+    return hints
+
+
+def _pick(candidates: tuple[str, ...], hints: list[str]) -> str | None:
+    return next((hint for hint in hints if hint in candidates), None)
+
+
+def _is_text(head: bytes, complete: bool) -> bool:
+    if b"\x00" in head:
+        return False
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    try:
+        # A multi-byte character may be cut at the end of the prefix
+        decoder.decode(head, final=complete)
+    except UnicodeDecodeError:
+        # Legacy single-byte encodings (cp1251): accept if mostly printable
+        control = sum(1 for byte in head if byte < 0x20 and byte not in b"\t\n\r\f")
+        return control == 0
+    return True
+
+
+def sniff(
+    head: bytes,
+    *,
+    filename: str | None = None,
+    claimed: str | None = None,
+    complete: bool = False,
+) -> str | None:
+    """
+    Detect the content type of a file from its first bytes.
+
+    Args:
+        head: First bytes of the file (SNIFF_BYTES, or all of a smaller file)
+        filename: Client file name, used as a hint only
+        claimed: Client Content-Type, used as a hint only
+        complete: head is the whole file
+
+    Returns:
+        MIME type, None if the content is not recognized
+    """
+    hints = _hinted(filename, claimed)
+    if head.startswith(b"\xff\xd8\xff"):
+        return JPEG
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return PNG
+    if head.startswith((b"GIF87a", b"GIF89a")):
+        return GIF
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return WEBP
+    # Readers accept the PDF header anywhere in the first 1 KiB
+    if b"%PDF-" in head[:1024]:
+        return PDF
+    if head.startswith(b"{\\rtf"):
+        return RTF
+    if head.startswith(_OLE2):
+        # Word, Excel and PowerPoint share the container; trust the client
+        # only to choose among them
+        return _pick(_OLE2_TYPES, hints) or DOC
+    if head.startswith(b"PK\x03\x04"):
+        # ODF: first entry is an uncompressed "mimetype" file
+        if head[30:38] == b"mimetype":
+            size, name_length, extra_length = struct.unpack_from("<I4xHH", head, 18)
+            start = 30 + name_length + extra_length
+            declared = head[start : start + size].decode("ascii", "replace")
+            return declared if declared in _ODF_TYPES else None
+        # OOXML: part names tell the application. Writers order entries
+        # freely (openpyxl puts [Content_Types].xml last), so any zip may be
+        # one; without a known part in the head, the client's choice stands
+        # until ooxml_type() has read the central directory
+        for part, mime_type in _OOXML_PARTS:
+            if part in head:
+                return mime_type
+        return _pick(OOXML_TYPES, hints)
+    if head and TEXT in hints and _is_text(head, complete):
+        return TEXT
+    return None
+
+
+class SniffingReader:
+    """
+    File-like wrapper that detects the content type before passing data on.
+
+    The first read pulls SNIFF_BYTES from the wrapped stream and checks their
+    type, so a disallowed upload fails before anything past its first few
+    kilobytes is read or written.
+
+    Args:
+        stream: Upload stream
+        allowed: Accepted MIME types
+        filename: Client file name (hint)
+        claimed: Client Content-Type (hint)
+    """
+
+    def __init__(
+        self,
+        stream: BinaryIO,
+        *,
+        allowed: Collection[str],
+        filename: str | None = None,
+        claimed: str | None = None,
+    ) -> None:
+        self._stream = stream
+        self._allowed = allowed
+        self._filename = filename
+        self._claimed = claimed
+        self._pending = b""
+        self._sniffed = False
+        self.mime_type: str | None = None
+
+    def sniff(self) -> str:
+        """
+        Detect the type now, without consuming data.
+
+        Raises:
+            UnsupportedFileTypeError: Content is not an allowed type
+        """
+        if not self._sniffed:
+            head = b""
+            while len(head) < SNIFF_BYTES:
+                chunk = self._stream.read(SNIFF_BYTES - len(head))
+                if not chunk:
+                    break
+                head += chunk
+            self._pending = head
+            self._sniffed = True
+            self.mime_type = sniff(
+                head,
+                filename=self._filename,
+                claimed=self._claimed,
+                complete=len(head) < SNIFF_BYTES,
+            )
+        if self.mime_type is None or self.mime_type not in self._allowed:
+            raise UnsupportedFileTypeError(self.mime_type)
+        return self.mime_type
+
+    def read(self, size: int = -1) -> bytes:
+        self.sniff()
+        if self._pending:
+            if size < 0:
+                data = self._pending + self._stream.read()
+                self._pending = b""
+                return data
+            data, self._pending = self._pending[:size], self._pending[size:]
+            return data
+        return self._stream.read(size)
+
+
+def ooxml_type(path: PurePath | str) -> str | None:
+    """
+    Detect a Word, Excel or PowerPoint file from its zip central directory.
+
+    Returns:
+        MIME type, None unless the archive has [Content_Types].xml and the
+        parts of one of the applications
+    """
+    try:
+        with zipfile.ZipFile(path) as archive:
+            names = archive.namelist()
+    except (zipfile.BadZipFile, OSError):
+        return None
+    if "[Content_Types].xml" not in names:
+        return None
+    for part, mime_type in _OOXML_PARTS:
+        prefix = part.decode()
+        if any(name.startswith(prefix) for name in names):
+            return mime_type
+    return None
+
+
+def sniff_file(path: PurePath | str, *, claimed: str | None = None) -> str | None:
+    """Detect the content type of a local file; its name is used as a hint."""
+    with open(path, "rb") as stream:
+        head = stream.read(SNIFF_BYTES)
+    mime_type = sniff(
+        head,
+        filename=str(path),
+        claimed=claimed,
+        complete=len(head) < SNIFF_BYTES,
+    )
+    if mime_type in OOXML_TYPES and ooxml_type(path) != mime_type:
+        return None
+    return mime_type
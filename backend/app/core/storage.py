@@ -0,0 +1,477 @@
+"""
+Storage backends for uploaded files.
+
+Uploads are addressed by keys such as ``news/<id>/<uuid>.jpg`` - the
+``file_path`` stored on NewsImage, PersonImage and Document rows. The
+backend is chosen with STORAGE_BACKEND: ``local`` keeps files under
+UPLOAD_DIR, ``s3`` puts them in an S3-compatible bucket (AWS S3, MinIO), so
+API instances do not need a shared volume.
+"""
+import os
+import shutil
+import tempfile
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import Any, BinaryIO
+from urllib.parse import quote
+
+from app.core.config import settings
+
+CHUNK_SIZE = 64 * 1024
+
+# Tries of LocalStorage to create a file in a directory that a concurrent
+# delete() may remove as empty
+_CREATE_ATTEMPTS = 3
+
+
+class FileTooLargeError(ValueError):
+    """Stream exceeded the size limit passed to put_stream."""
+
+
+@dataclass
+class StoredFile:
+    """File listed by StorageBackend.iter_files."""
+
+    key: str
+    size: int
+    # Modification time, seconds since the epoch
+    modified: float
+
+
+class _LimitedReader:
+    """File-like wrapper counting bytes read and enforcing a size limit."""
+
+    def __init__(self, stream: BinaryIO, max_size: int | None) -> None:
+        self._stream = stream
+        self._max_size = max_size
+        self.size = 0
+        self.exceeded = False
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._stream.read(size)
+        self.size += len(data)
+        if self._max_size is not None and self.size > self._max_size:
+            self.exceeded = True
+            raise FileTooLargeError(f"File exceeds {self._max_size} bytes")
+        return data
+
+
+class StorageBackend(ABC):
+    """Interface of upload file storage."""
+
+    @abstractmethod
+    def put_stream(
+        self,
+        key: str,
+        stream: BinaryIO,
+        *,
+        content_type: str | None = None,
+        max_size: int | None = None,
+    ) -> int:
+        """
+        Store a file read from a binary stream, replacing any file at key.
+
+        Args:
+            key: File key
+            stream: Readable binary stream, read to the end
+            content_type: MIME type stored with the file where supported
+            max_size: Maximum size in bytes; FileTooLargeError is raised and
+                nothing is stored if the stream is larger
+
+        Returns:
+            Number of bytes stored
+        """
+
+    def put_file(
+        self, key: str, path: Path, *, content_type: str | None = None
+    ) -> int:
+        """Store a local file under key; returns its size."""
+        with open(path, "rb") as stream:
+            return self.put_stream(key, stream, content_type=content_type)
+
+    @abstractmethod
+    def get_range(
+        self, key: str, start: int = 0, end: int | None = None
+    ) -> Iterator[bytes]:
+        """
+        Read bytes ``start`` to ``end`` (inclusive, None for end of file).
+
+        Raises:
+            FileNotFoundError: No file at key
+        """
+
+    def get_stream(self, key: str) -> Iterator[bytes]:
+        """Read a whole file in chunks."""
+        return self.get_range(key)
+
+    @abstractmethod
+    def size(self, key: str) -> int:
+        """
+        Get file size in bytes.
+
+        Raises:
+            FileNotFoundError: No file at key
+        """
+
+    def exists(self, key: str) -> bool:
+        """Check whether a file is stored at key."""
+        try:
+            self.size(key)
+        except FileNotFoundError:
+            return False
+        return True
+
+    @abstractmethod
+    def delete(self, key: str) -> int:
+        """
+        Delete a file.
+
+        Returns:
+            Size of the deleted file, 0 if there was none
+        """
+
+    @abstractmethod
+    def iter_files(self, prefix: str) -> Iterator[StoredFile]:
+        """List files whose key starts with ``prefix/``."""
+
+    def presigned_url(
+        self,
+        key: str,
+        *,
+        filename: str | None = None,
+        content_type: str | None = None,
+        inline: bool = True,
+    ) -> str | None:
+        """
+        Get a temporary URL clients can download the file from directly.
+
+        Returns:
+            URL, or None if the backend cannot serve files itself and the API
+            must stream them
+        """
+        return None
+
+    @abstractmethod
+    def local_path(self, key: str) -> AbstractContextManager[Path]:
+        """
+        Provide the file at a local path, for tools that need one (Pillow, pypdf).
+
+        Raises:
+            FileNotFoundError: No file at key
+        """
+
+
+class LocalStorage(StorageBackend):
+    """Files in a directory on the local filesystem (or a shared volume)."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def path(self, key: str) -> Path:
+        """
+        Get the filesystem path of a key.
+
+        Raises:
+            ValueError: Key points outside the storage root
+        """
+        full_path = (self.root / key).resolve()
+        if not full_path.is_relative_to(self.root.resolve()):
+            raise ValueError(f"Path outside upload directory: {key}")
+        return full_path
+
+    def put_stream(
+        self,
+        key: str,
+        stream: BinaryIO,
+        *,
+        content_type: str | None = None,
+        max_size: int | None = None,
+    ) -> int:
+        full_path = self.path(key)
+        # Write next to the target and rename, so readers never see a partial file
+        fd, temp_name = self._create_temp(full_path.parent)
+        reader = _LimitedReader(stream, max_size)
+        try:
+            with os.fdopen(fd, "wb") as buffer:
+                shutil.copyfileobj(reader, buffer, CHUNK_SIZE)
+            os.replace(temp_name, full_path)
+        except BaseException:
+            os.unlink(temp_name)
+            raise
+        return reader.size
+
+    @staticmethod
+    def _create_temp(directory: Path) -> tuple[int, str]:
+        """Create a temporary file in a directory, creating the directory first."""
+        for _ in range(_CREATE_ATTEMPTS - 1):
+            directory.mkdir(parents=True, exist_ok=True)
+            try:
+                return tempfile.mkstemp(dir=directory, suffix=".part")
+            except FileNotFoundError:
+                # delete() removed the directory as empty after the mkdir
+                continue
+        directory.mkdir(parents=True, exist_ok=True)
+        return tempfile.mkstemp(dir=directory, suffix=".part")
+
+    def get_range(
+        self, key: str, start: int = 0, end: int | None = None
+    ) -> Iterator[bytes]:
+        # Open before the first next() so a missing file raises immediately
+        stream = open(self.path(key), "rb")
+        return self._read_range(stream, start, end)
+
+    @staticmethod
+    def _read_range(
+        stream: BinaryIO, start: int, end: int | None
+    ) -> Iterator[bytes]:
+        with stream:
+            stream.seek(start)
+            remaining = None if end is None else end - start + 1
+            while remaining is None or remaining > 0:
+                chunk = stream.read(
+                    CHUNK_SIZE if remaining is None else min(CHUNK_SIZE, remaining)
+                )
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
+    def size(self, key: str) -> int:
+        full_path = self.path(key)
+        if not full_path.is_file():
+            raise FileNotFoundError(key)
+        return full_path.stat().st_size
+
+    def delete(self, key: str) -> int:
+        full_path = self.path(key)
+        try:
+            size = full_path.stat().st_size
+            full_path.unlink()
+        except FileNotFoundError:
+            return 0
+        # Drop per-item directories (news/<id>, persons/<id>) once empty;
+        # top-level directories stay. put_stream recreates a directory removed
+        # under it
+        parent = full_path.parent
+        if parent.parent != self.root.resolve():
+            try:
+                parent.rmdir()
+            except OSError:
+                pass
+        return size
+
+    def iter_files(self, prefix: str) -> Iterator[StoredFile]:
+        root = str(self.root)
+        stack = [os.path.join(root, prefix)]
+        while stack:
+            try:
+                scanner = os.scandir(stack.pop())
+            except FileNotFoundError:
+                continue
+            with scanner:
+                for entry in scanner:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        stat = entry.stat(follow_symlinks=False)
+                        relative = os.path.relpath(entry.path, root)
+                        yield StoredFile(
+                            key=relative.replace(os.sep, "/"),
+                            size=stat.st_size,
+                            modified=stat.st_mtime,
+                        )
+
+    @contextmanager
+    def local_path(self, key: str) -> Iterator[Path]:
+        full_path = self.path(key)
+        if not full_path.is_file():
+            raise FileNotFoundError(key)
+        yield full_path
+
+
+class S3Storage(StorageBackend):
+    """
+    Files in an S3-compatible bucket.
+
+    Downloads are served by redirecting clients to presigned URLs. Requires
+    the optional ``boto3`` dependency (``pip install 'app[s3]'``).
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        *,
+        endpoint_url: str | None = None,
+        public_endpoint_url: str | None = None,
+        region: str | None = None,
+        access_key_id: str | None = None,
+        secret_access_key: str | None = None,
+        presigned_url_expire_seconds: int = 3600,
+    ) -> None:
+        try:
+            import boto3
+            from botocore.config import Config
+        except ImportError as e:
+            raise RuntimeError(
+                "STORAGE_BACKEND=s3 requires boto3: pip install 'app[s3]'"
+            ) from e
+
+        self.bucket = bucket
+        self.presigned_url_expire_seconds = presigned_url_expire_seconds
+        client_options = {
+            "region_name": region,
+            "aws_access_key_id": access_key_id,
+            "aws_secret_access_key": secret_access_key,
+            # Path-style addressing works with MinIO and other non-AWS endpoints
+            "config": Config(signature_version="s3v4", s3={"addressing_style": "path"}),
+        }
+        self._client: Any = boto3.client(
+            "s3", endpoint_url=endpoint_url, **client_options
+        )
+        # Presigning is offline, the second client only changes the URL host
+        self._presign_client: Any = (
+            boto3.client("s3", endpoint_url=public_endpoint_url, **client_options)
+            if public_endpoint_url
+            else self._client
+        )
+
+    @staticmethod
+    def _is_not_found(error: Exception) -> bool:
+        code = getattr(error, "response", {}).get("Error", {}).get("Code")
+        return code in ("404", "NoSuchKey", "NotFound")
+
+    def put_stream(
+        self,
+        key: str,
+        stream: BinaryIO,
+        *,
+        content_type: str | None = None,
+        max_size: int | None = None,
+    ) -> int:
+        reader = _LimitedReader(stream, max_size)
+        extra_args = {"ContentType": content_type} if content_type else None
+        try:
+            # Multipart for large files; an exception aborts the upload
+            self._client.upload_fileobj(reader, self.bucket, key, ExtraArgs=extra_args)
+        except Exception:
+            if reader.exceeded:
+                raise FileTooLargeError(f"File exceeds {max_size} bytes") from None
+            raise
+        return reader.size
+
+    def get_range(
+        self, key: str, start: int = 0, end: int | None = None
+    ) -> Iterator[bytes]:
+        params = {"Bucket": self.bucket, "Key": key}
+        if start or end is not None:
+            params["Range"] = f"bytes={start}-{'' if end is None else end}"
+        try:
+            body = self._client.get_object(**params)["Body"]
+        except Exception as e:
+            if self._is_not_found(e):
+                raise FileNotFoundError(key) from e
+            raise
+        return self._iter_body(body)
+
+    @staticmethod
+    def _iter_body(body: Any) -> Iterator[bytes]:
+        try:
+            yield from body.iter_chunks(CHUNK_SIZE)
+        finally:
+            body.close()
+
+    def size(self, key: str) -> int:
+        try:
+            head = self._client.head_object(Bucket=self.bucket, Key=key)
+        except Exception as e:
+            if self._is_not_found(e):
+                raise FileNotFoundError(key) from e
+            raise
+        return int(head["ContentLength"])
+
+    def delete(self, key: str) -> int:
+        try:
+            size = self.size(key)
+        except FileNotFoundError:
+            return 0
+        self._client.delete_object(Bucket=self.bucket, Key=key)
+        return size
+
+    def iter_files(self, prefix: str) -> Iterator[StoredFile]:
+        paginator = self._client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=f"{prefix}/"):
+            for obj in page.get("Contents", []):
+                yield StoredFile(
+                    key=obj["Key"],
+                    size=obj["Size"],
+                    modified=obj["LastModified"].timestamp(),
+                )
+
+    def presigned_url(
+        self,
+        key: str,
+        *,
+        filename: str | None = None,
+        content_type: str | None = None,
+        inline: bool = True,
+    ) -> str | None:
+        params = {"Bucket": self.bucket, "Key": key}
+        if content_type:
+            params["ResponseContentType"] = content_type
+        if filename:
+            # Same header Starlette's FileResponse builds for non-ASCII names
+            disposition = "inline" if inline else "attachment"
+            params["ResponseContentDisposition"] = (
+                f"{disposition}; filename*=utf-8''{quote(filename)}"
+            )
+        url: str = self._presign_client.generate_presigned_url(
+            "get_object", Params=params, ExpiresIn=self.presigned_url_expire_seconds
+        )
+        return url
+
+    @contextmanager
+    def local_path(self, key: str) -> Iterator[Path]:
+        suffix = PurePosixPath(key).suffix
+        with tempfile.TemporaryDirectory(prefix="storage-") as temp_dir:
+            path = Path(temp_dir) / f"file{suffix}"
+            with open(path, "wb") as buffer:
+                for chunk in self.get_stream(key):
+                    buffer.write(chunk)
+            yield path
+
+
+def resolve_upload_dir() -> Path:
+    """Get UPLOAD_DIR as an absolute path."""
+    upload_dir = Path(settings.UPLOAD_DIR)
+    if upload_dir.is_absolute():
+        return upload_dir
+    file_path = Path(__file__)
+    if str(file_path).startswith("/app/app/"):
+        # Docker: /app/app/core/storage.py -> base is /app
+        base_dir = Path("/app")
+    else:
+        # Local development: backend/app/core/storage.py -> repository root
+        base_dir = file_path.parent.parent.parent.parent
+    return base_dir / upload_dir
+
+
+def _create_storage() -> StorageBackend:
+    if settings.STORAGE_BACKEND == "s3":
+        return S3Storage(
+            settings.S3_BUCKET,
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            public_endpoint_url=settings.S3_PUBLIC_ENDPOINT_URL,
+            region=settings.S3_REGION,
+            access_key_id=settings.S3_ACCESS_KEY_ID,
+            secret_access_key=settings.S3_SECRET_ACCESS_KEY,
+            presigned_url_expire_seconds=settings.S3_PRESIGNED_URL_EXPIRE_SECONDS,
+        )
+    return LocalStorage(resolve_upload_dir())
+
+
+storage = _create_storage()
@@ -0,0 +1,216 @@
+"""
+ZIP archives written on the fly.
+
+Entries are read chunk by chunk and written straight to the response, so
+memory use does not depend on the number or size of files and nothing is
+written to disk. Every entry is followed by a data descriptor (CRC and sizes
+are only known once it was read), which lets the archive be produced in a
+single pass. ZIP64 is not written: archives must stay below 4 GiB, callers
+enforce a lower limit.
+"""
+import struct
+import zlib
+from collections.abc import Callable, Generator, Iterator
+from dataclasses import dataclass
+from datetime import datetime
+
+ZIP32_LIMIT = 0xFFFFFFFF
+
+_LOCAL_HEADER = struct.Struct("<IHHHHHIIIHH")
+_DATA_DESCRIPTOR = struct.Struct("<IIII")
+_CENTRAL_HEADER = struct.Struct("<IHHHHHHIIIHHHHHII")
+_END_RECORD = struct.Struct("<IHHHHIIH")
+
+_VERSION = 20  # 2.0: deflate, directories
+_FLAG_DATA_DESCRIPTOR = 0x08
+_FLAG_UTF8 = 0x800
+_STORED = 0
+_DEFLATED = 8
+
+
+@dataclass
+class ZipEntry:
+    """File to put into the archive."""
+
+    name: str
+    # Exact size of the data; checked while streaming
+    size: int
+    modified: datetime
+    # Returns the data in chunks; called when the entry is written
+    open: Callable[[], Iterator[bytes]]
+
+
+@dataclass
+class _Written:
+    name: bytes
+    flags: int
+    dos_time: int
+    dos_date: int
+    crc: int
+    compressed_size: int
+    size: int
+    offset: int
+
+
+def _dos_datetime(value: datetime) -> tuple[int, int]:
+    # DOS timestamps start in 1980 and have two-second resolution
+    value = max(value, datetime(1980, 1, 1, tzinfo=value.tzinfo))
+    dos_time = (value.hour << 11) | (value.minute << 5) | (value.second // 2)
+    dos_date = ((value.year - 1980) << 9) | (value.month << 4) | value.day
+    return dos_time, dos_date
+
+
+def _encode_name(name: str) -> tuple[bytes, int]:
+    try:
+        return name.encode("ascii"), 0
+    except UnicodeEncodeError:
+        return name.encode("utf-8"), _FLAG_UTF8
+
+
+class ZipStream:
+    """
+    Iterable producing a ZIP archive of the given entries.
+
+    Args:
+        entries: Files to archive, in order; names must be unique
+        compress: Deflate entries; stored (uncompressed) otherwise, which is
+            cheaper for already compressed formats (PDF, DOCX, images) and
+            makes the archive size known in advance
+    """
+
+    def __init__(self, entries: list[ZipEntry], *, compress: bool = False) -> None:
+        self.entries = entries
+        self.compress = compress
+
+    def content_length(self) -> int | None:
+        """Size of the archive in bytes; None for deflate, where it is unknown."""
+        if self.compress:
+            return None
+        total = _END_RECORD.size
+        for entry in self.entries:
+            name_length = len(_encode_name(entry.name)[0])
+            total += (
+                _LOCAL_HEADER.size
+                + name_length
+                + entry.size
+                + _DATA_DESCRIPTOR.size
+                + _CENTRAL_HEADER.size
+                + name_length
+            )
+        return total
+
+    def __iter__(self) -> Iterator[bytes]:
+        written: list[_Written] = []
+        offset = 0
+        for entry in self.entries:
+            record = yield from self._write_entry(entry, offset)
+            written.append(record)
+            offset += (
+                _LOCAL_HEADER.size
+                + len(record.name)
+                + record.compressed_size
+                + _DATA_DESCRIPTOR.size
+            )
+            if offset > ZIP32_LIMIT:
+                raise ValueError("Archive exceeds 4 GiB")
+
+        directory_offset = offset
+        directory = bytearray()
+        for record in written:
+            directory += _CENTRAL_HEADER.pack(
+                0x02014B50,
+                _VERSION,
+                _VERSION,
+                record.flags,
+                _DEFLATED if self.compress else _STORED,
+                record.dos_time,
+                record.dos_date,
+                record.crc,
+                record.compressed_size,
+                record.size,
+                len(record.name),
+                0,  # extra field length
+                0,  # comment length
+                0,  # disk number
+                0,  # internal attributes
+                0,  # external attributes
+                record.offset,
+            )
+            directory += record.name
+        yield bytes(directory)
+        yield _END_RECORD.pack(
+            0x06054B50,
+            0,
+            0,
+            len(written),
+            len(written),
+            len(directory),
+            directory_offset,
+            0,
+        )
+
+    def _write_entry(
+        self, entry: ZipEntry, offset: int
+    ) -> Generator[bytes, None, _Written]:
+        name, flags = _encode_name(entry.name)
+        flags |= _FLAG_DATA_DESCRIPTOR
+        dos_time, dos_date = _dos_datetime(entry.modified)
+        # CRC and sizes follow the data in the descriptor
+        yield _LOCAL_HEADER.pack(
+            0x04034B50,
+            _VERSION,
+            flags,
+            _DEFLATED if self.compress else _STORED,
+            dos_time,
+            dos_date,
+            0,
+            0,
+            0,
+            len(name),
+            0,
+        ) + name
+
+        compressor = (
+            zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -zlib.MAX_WBITS)
+            if self.compress
+            else None
+        )
+        crc = 0
+        size = 0
+        compressed_size = 0
+        chunks = entry.open()
+        try:
+            for chunk in chunks:
+                crc = zlib.crc32(chunk, crc)
+                size += len(chunk)
+                if compressor is not None:
+                    chunk = compressor.compress(chunk)
+                    if not chunk:
+                        continue
+                compressed_size += len(chunk)
+                yield chunk
+        finally:
+            # An abandoned archive releases the open file right away
+            if isinstance(chunks, Generator):
+                chunks.close()
+        if compressor is not None:
+            tail = compressor.flush()
+            compressed_size += len(tail)
+            yield tail
+        if size != entry.size:
+            # The promised Content-Length would be wrong; abort the response
+            raise ValueError(
+                f"{entry.name}: expected {entry.size} bytes, read {size}"
+            )
+
+        yield _DATA_DESCRIPTOR.pack(0x08074B50, crc, compressed_size, size)
+        return _Written(
+            name=name,
+            flags=flags,
+            dos_time=dos_time,
+            dos_date=dos_date,
+            crc=crc,
+            compressed_size=compressed_size,
+            size=size,
+            offset=offset,
+        )
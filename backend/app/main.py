@@ -1,4 +1,8 @@
 """FastAPI application setup and configuration."""
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, suppress
+
 import sentry_sdk
 from fastapi import FastAPI
 from fastapi.routing import APIRoute
@@ -10,11 +14,19 @@ from starlette.requests import Request
 
 from app.api.main import api_router
 from app.core.config import settings
+from app.core.db_routing import ReadYourWritesMiddleware
+from app.core.metrics import MetricsMiddleware
 from app.core.security import (
     IPBlockingMiddleware,
     _rate_limit_exceeded_handler,
     limiter,
 )
+from app.core.storage import LocalStorage, storage
+from app.services.document_thumbnail_service import run_document_thumbnail_worker
+from app.services.email_outbox_service import run_email_outbox_worker
+from app.services.email_service import email_service
+from app.services.file_cleanup_service import run_file_cleanup_worker
+from app.services.image_job_service import run_image_job_worker
 
 
 def custom_generate_unique_id(route: APIRoute) -> str:
@@ -55,6 +67,24 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
         return response
 
 
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    """Validate email templates and run background workers for the application's lifetime."""
+    email_service.validate_templates()
+    tasks = [
+        asyncio.create_task(run_file_cleanup_worker()),
+        asyncio.create_task(run_image_job_worker()),
+        asyncio.create_task(run_document_thumbnail_worker()),
+        asyncio.create_task(run_email_outbox_worker()),
+    ]
+    yield
+    for task in tasks:
+        task.cancel()
+    for task in tasks:
+        with suppress(asyncio.CancelledError):
+            await task
+
+
 if settings.SENTRY_DSN and settings.ENVIRONMENT != "local":
     sentry_sdk.init(dsn=str(settings.SENTRY_DSN), enable_tracing=True)
 
@@ -62,6 +92,7 @@ app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     generate_unique_id_function=custom_generate_unique_id,
+    lifespan=lifespan,
 )
 
 # Add rate limiting exception handler
@@ -71,6 +102,10 @@ app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)  # ty
 # Add security headers middleware
 app.add_middleware(SecurityHeadersMiddleware)
 
+# Pin a client's reads to the primary right after it writes (replica lag)
+if settings.SQLALCHEMY_REPLICA_DATABASE_URI:
+    app.add_middleware(ReadYourWritesMiddleware)
+
 # Add IP blocking middleware (must be before rate limiting)
 # Blocks IP after 5 failed login attempts for 1 hour
 # In local development: 10 attempts, block for 30 minutes
@@ -101,6 +136,13 @@ if settings.all_cors_origins:
         max_age=3600,
     )
 
+# Outermost: request metrics cover the time spent in every other middleware.
+# Outside production, responses carry the query count and database time in
+# Server-Timing so N+1 regressions show up in the browser dev tools.
+app.add_middleware(
+    MetricsMiddleware, server_timing=settings.ENVIRONMENT != "production"
+)
+
 # Include public news router first (bypasses auth) - must be before api_router
 from app.api.routes.news import public_router  # noqa: E402
 
@@ -108,10 +150,6 @@ app.include_router(public_router, prefix=settings.API_V1_STR)
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
-# Mount static files for uploaded images
-static_dir = settings.UPLOAD_DIR
-if static_dir and not static_dir.startswith("/"):
-    import os
-    static_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), static_dir)
-    if os.path.exists(static_path):
-        app.mount("/static", StaticFiles(directory=static_path), name="static")
+# Mount static files for uploaded images (S3 storage serves them from the bucket)
+if isinstance(storage, LocalStorage):
+    app.mount("/static", StaticFiles(directory=storage.root), name="static")
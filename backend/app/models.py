@@ -50,7 +50,9 @@ class Person(SQLModel, table=True):
     phone: str = Field(max_length=50, unique=True, index=True)
     email: EmailStr = Field(max_length=255, unique=True, index=True)
     description: str = Field(default="", max_length=2000)
-    position_id: uuid.UUID = Field(foreign_key="position.id", nullable=False)
+    position_id: uuid.UUID = Field(
+        foreign_key="position.id", nullable=False, index=True
+    )
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     position: "Position" = Relationship(back_populates="persons")
@@ -70,6 +72,9 @@ class PersonImage(SQLModel, table=True):
     file_path: str = Field(max_length=512)
     file_size: int
     mime_type: str = Field(max_length=100)
+    width: int | None = None
+    height: int | None = None
+    placeholder: str | None = Field(default=None, max_length=1024)
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     person: "Person" = Relationship(back_populates="image")
 
@@ -83,6 +88,16 @@ class NewsBase(SQLModel):
 
 class News(NewsBase, table=True):
     """News model in database."""
+    __table_args__ = (
+        # Public feed: published rows only, in feed order
+        sa.Index(
+            "ix_news_published_feed",
+            sa.text("published_at DESC NULLS LAST"),
+            sa.text("created_at DESC"),
+            postgresql_where=sa.text("is_published IS true"),
+        ),
+        sa.Index("ix_news_created_at", sa.text("created_at DESC")),
+    )
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     owner_id: uuid.UUID = Field(
         foreign_key="user.id", nullable=False, ondelete="CASCADE"
@@ -94,6 +109,12 @@ class News(NewsBase, table=True):
     images: list["NewsImage"] = Relationship(back_populates="news", cascade_delete=True)
 
 
+# NewsImage.status values: only ready images have their file at file_path
+IMAGE_STATUS_READY = "ready"
+IMAGE_STATUS_PROCESSING = "processing"
+IMAGE_STATUS_FAILED = "failed"
+
+
 class NewsImageBase(SQLModel):
     """Base news image properties for database table."""
     file_name: str = Field(max_length=255)
@@ -102,14 +123,22 @@ class NewsImageBase(SQLModel):
     mime_type: str = Field(max_length=100)
     order: int = Field(default=0)
     is_main: bool = Field(default=False)
+    status: str = Field(default=IMAGE_STATUS_READY, max_length=20)
+    # Pixel size of the stored file; None until processed or backfilled
+    width: int | None = None
+    height: int | None = None
+    # Tiny WebP data: URI rendered until the image file has loaded
+    placeholder: str | None = Field(default=None, max_length=1024)
 
 
 class NewsImage(NewsImageBase, table=True):
     """News image model in database."""
+    __table_args__ = (sa.Index("ix_newsimage_news_id_order", "news_id", "order"),)
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     news_id: uuid.UUID = Field(
         foreign_key="news.id", nullable=False, ondelete="CASCADE"
     )
+    processing_error: str | None = Field(default=None, max_length=500)
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     news: "News" = Relationship(back_populates="images")
 
@@ -123,6 +152,12 @@ class DocumentCategory(SQLModel, table=True):
     documents: list["Document"] = Relationship(back_populates="category")
 
 
+# Document.thumbnail_status values: only ready documents have thumbnail_path
+DOCUMENT_THUMBNAIL_PENDING = "pending"
+DOCUMENT_THUMBNAIL_READY = "ready"
+DOCUMENT_THUMBNAIL_UNAVAILABLE = "unavailable"
+
+
 class DocumentBase(SQLModel):
     """Base document properties for database table."""
     name: str = Field(min_length=1, max_length=255)
@@ -134,6 +169,20 @@ class DocumentBase(SQLModel):
 
 class Document(DocumentBase, table=True):
     """Document model in database."""
+    __table_args__ = (
+        sa.Index(
+            "ix_document_category_id_created_at",
+            "category_id",
+            sa.text("created_at DESC"),
+        ),
+        sa.Index("ix_document_created_at", sa.text("created_at DESC")),
+        # Thumbnail worker queue: only the few pending rows are indexed
+        sa.Index(
+            "ix_document_thumbnail_pending",
+            "created_at",
+            postgresql_where=sa.text("thumbnail_status = 'pending'"),
+        ),
+    )
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     category_id: uuid.UUID | None = Field(
         foreign_key="documentcategory.id", nullable=True, default=None, ondelete="SET NULL"
@@ -143,6 +192,11 @@ class Document(DocumentBase, table=True):
     )
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    # First-page preview (PDF), rendered by the thumbnail worker
+    thumbnail_status: str = Field(default=DOCUMENT_THUMBNAIL_UNAVAILABLE, max_length=20)
+    thumbnail_path: str | None = Field(default=None, max_length=512)
+    # Lease: a worker that claims a pending thumbnail pushes this forward
+    thumbnail_locked_until: datetime | None = Field(default=None)
     category: "DocumentCategory" = Relationship(back_populates="documents")
     owner: "User" = Relationship()
 
@@ -185,3 +239,63 @@ class OrganizationCard(SQLModel, table=True):
     bank_bik: str | None = Field(default=None, max_length=9)
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class RateLimitCounter(SQLModel, table=True):
+    """Fixed-window rate limit counter shared between workers."""
+    key: str = Field(primary_key=True, max_length=512)
+    value: int = Field(default=0)
+    expires_at: float = Field(index=True)
+
+
+class FileDeletion(SQLModel, table=True):
+    """Upload file queued for removal from disk after its row was deleted."""
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    file_path: str = Field(max_length=512)
+    attempts: int = Field(default=0)
+    last_error: str | None = Field(default=None, max_length=500)
+    next_attempt_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc), index=True
+    )
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class ImageJob(SQLModel, table=True):
+    """Queued processing of a raw upload into the file of a NewsImage."""
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    image_id: uuid.UUID = Field(
+        foreign_key="newsimage.id", nullable=False, ondelete="CASCADE", index=True
+    )
+    source_path: str = Field(max_length=512)
+    attempts: int = Field(default=0)
+    # Lease: a worker that claims the job pushes this forward while it runs
+    locked_until: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc), index=True
+    )
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class VerificationCode(SQLModel, table=True):
+    """Pending email change code (VERIFICATION_CODE_STORE=database)."""
+    user_id: uuid.UUID = Field(
+        foreign_key="user.id", primary_key=True, ondelete="CASCADE"
+    )
+    email: str = Field(primary_key=True, max_length=255)
+    code: str = Field(max_length=16)
+    attempts: int = Field(default=0)
+    expires_at: datetime = Field(index=True)
+
+
+class EmailOutbox(SQLModel, table=True):
+    """Email queued in the sender's transaction, delivered by the outbox worker."""
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    email_to: str = Field(max_length=255)
+    subject: str = Field(max_length=500)
+    html_content: str
+    attempts: int = Field(default=0)
+    last_error: str | None = Field(default=None, max_length=500)
+    # Also the lease: a worker that claims the email pushes this forward
+    next_attempt_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc), index=True
+    )
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
@@ -30,8 +30,12 @@ from app.schemas.documents import (
 )
 from app.schemas.news import (
     NewsCreate,
+    NewsImageBulkUploadResult,
     NewsImageList,
+    NewsImageOrderUpdate,
     NewsImagePublic,
+    NewsImageStatusPublic,
+    NewsImageUploadResult,
     NewsPublic,
     NewsPublicList,
     NewsUpdate,
@@ -69,7 +73,11 @@ from app.schemas.users import (
 from app.schemas.utils import (
     BlockedIPInfo,
     BlockedIPsList,
+    DatabasePoolStatus,
+    HealthCheck,
     PrivateUserCreate,
+    RateLimitLatencyInfo,
+    RateLimitLatencyList,
 )
 
 __all__ = [
@@ -101,6 +109,10 @@ __all__ = [
     "NewsPublicList",
     "NewsImagePublic",
     "NewsImageList",
+    "NewsImageUploadResult",
+    "NewsImageBulkUploadResult",
+    "NewsImageOrderUpdate",
+    "NewsImageStatusPublic",
     "TagPublic",
     "TagsPublic",
     # Organization Card
@@ -130,5 +142,9 @@ __all__ = [
     # Utils
     "BlockedIPInfo",
     "BlockedIPsList",
+    "DatabasePoolStatus",
+    "HealthCheck",
     "PrivateUserCreate",
+    "RateLimitLatencyInfo",
+    "RateLimitLatencyList",
 ]
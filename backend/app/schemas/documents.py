@@ -51,6 +51,8 @@ class DocumentPublic(SQLModel):
     file_path: str
     file_size: int
     mime_type: str
+    # pending, ready or unavailable (served as a generic icon)
+    thumbnail_status: str
     category_id: uuid.UUID | None = None
     category: DocumentCategoryPublic | None = None
     owner_id: uuid.UUID
@@ -61,3 +61,30 @@ class NewsImageList(SQLModel):
     """News image list with count."""
     data: list[NewsImagePublic]
     count: int
+
+
+class NewsImageUploadResult(SQLModel):
+    """Upload outcome for a single file of a bulk upload."""
+    file_name: str
+    success: bool
+    image: NewsImagePublic | None = None
+    error: str | None = None
+
+
+class NewsImageBulkUploadResult(SQLModel):
+    """Per-file results of a bulk image upload."""
+    data: list[NewsImageUploadResult]
+    uploaded: int
+    failed: int
+
+
+class NewsImageOrderUpdate(SQLModel):
+    """Full image ordering for a news item; the first image becomes main."""
+    image_ids: list[uuid.UUID] = Field(min_length=1)
+
+
+class NewsImageStatusPublic(SQLModel):
+    """Processing state of a news image, polled after an async upload."""
+    id: uuid.UUID
+    status: str
+    error: str | None = None
@@ -63,6 +63,9 @@ class PersonImagePublic(SQLModel):
     file_path: str
     file_size: int
     mime_type: str
+    width: int | None = None
+    height: int | None = None
+    placeholder: str | None = None
     created_at: datetime
 
 
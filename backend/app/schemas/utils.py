@@ -21,6 +21,39 @@ class BlockedIPsList(SQLModel):
     count: int
 
 
+class DatabasePoolStatus(SQLModel):
+    """Connection pool gauges."""
+    size: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    waits: int
+    avg_wait_ms: float
+    max_wait_ms: float
+
+
+class HealthCheck(SQLModel):
+    """Service health with database pool gauges."""
+    status: str = "ok"
+    db_pool: DatabasePoolStatus
+    async_db_pool: DatabasePoolStatus
+    replica_db_pool: DatabasePoolStatus | None = None
+
+
+class RateLimitLatencyInfo(SQLModel):
+    """Rate limit storage latency for one route."""
+    route: str
+    calls: int
+    avg_ms: float
+    max_ms: float
+
+
+class RateLimitLatencyList(SQLModel):
+    """Rate limit storage latency per route."""
+    storage: str
+    routes: list[RateLimitLatencyInfo]
+
+
 class PrivateUserCreate(SQLModel):
     """Model for creating user via private API (only for local development)."""
     email: str
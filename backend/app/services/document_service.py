@@ -1,6 +1,7 @@
 """Document file service for saving and managing document files."""
-import shutil
+import logging
 import uuid
+from collections.abc import Sequence
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -9,6 +10,18 @@ from fastapi import HTTPException, UploadFile
 from pydantic import BaseModel
 
 from app.core.config import settings
+from app.core.sniffing import (
+    EXTENSIONS,
+    OOXML_TYPES,
+    SniffingReader,
+    UnsupportedFileTypeError,
+    ooxml_type,
+)
+from app.core.storage import FileTooLargeError, storage
+from app.core.zipstream import ZipEntry, ZipStream
+from app.models import Document
+
+logger = logging.getLogger(__name__)
 
 
 class SignatureInfo(BaseModel):
@@ -19,126 +32,123 @@ class SignatureInfo(BaseModel):
     signature_hash: str | None = None
     is_signed: bool = False
 
-UPLOAD_DIR = Path(settings.UPLOAD_DIR)
-if not UPLOAD_DIR.is_absolute():
-    # Determine base directory from file location
-    # In Docker: /app/app/services/document_service.py -> base should be /app
-    # Locally: backend/app/services/document_service.py -> base should be backend
-    file_path = Path(__file__)
-    # Check if we're in Docker (path starts with /app/app)
-    if str(file_path).startswith("/app/app/"):
-        # Running in Docker, use /app as base
-        base_dir = Path("/app")
-    else:
-        # Local development: compute from file location
-        base_dir = file_path.parent.parent.parent.parent
-        if base_dir.name == "app" and base_dir.parent.name == "app":
-            base_dir = base_dir.parent
-    UPLOAD_DIR = base_dir / UPLOAD_DIR
-UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
-
 
 class DocumentService:
     """Service for processing and saving document files."""
 
-    UPLOAD_DIR = UPLOAD_DIR
-
     @staticmethod
-    def get_upload_path() -> Path:
-        """Get upload directory for documents."""
-        docs_dir = UPLOAD_DIR / "documents"
-        docs_dir.mkdir(parents=True, exist_ok=True)
-        return docs_dir
+    def _invalid_type() -> HTTPException:
+        return HTTPException(
+            status_code=400,
+            detail=f"Invalid file type. Allowed types: {', '.join(settings.ALLOWED_DOCUMENT_TYPES)}",
+        )
 
-    @staticmethod
-    def validate_document(file: UploadFile) -> None:
-        """Validate uploaded document file."""
-        # Check MIME type
-        if file.content_type not in settings.ALLOWED_DOCUMENT_TYPES:
-            # Fallback: check file extension
-            file_ext = Path(file.filename or "").suffix.lower()
-            allowed_extensions = [
-                ".pdf", ".doc", ".docx", ".xls", ".xlsx", ".ppt", ".pptx",
-                ".txt", ".rtf", ".odt", ".ods", ".odp"
-            ]
-            if file_ext not in allowed_extensions:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Invalid file type. Allowed types: {', '.join(settings.ALLOWED_DOCUMENT_TYPES)}",
-                )
+    @classmethod
+    def validate_document(cls, file: UploadFile) -> SniffingReader:
+        """
+        Detect the type of an uploaded document from its first bytes.
 
-    @staticmethod
-    def get_file_extension(filename: str) -> str:
-        """Get file extension from filename."""
-        return Path(filename).suffix.lower()
+        Returns:
+            Reader to store the upload from; its mime_type is the detected type
+        """
+        reader = SniffingReader(
+            file.file,
+            allowed=settings.ALLOWED_DOCUMENT_TYPES,
+            filename=file.filename,
+            claimed=file.content_type,
+        )
+        try:
+            reader.sniff()
+        except UnsupportedFileTypeError:
+            raise cls._invalid_type() from None
+        return reader
 
     @classmethod
-    def save_document(
-        cls, file: UploadFile
-    ) -> tuple[str, int]:
+    def save_document(cls, file: UploadFile) -> tuple[str, int, str]:
         """
         Save uploaded document file.
-        Returns relative path and file size.
+
+        The type is detected from the content before anything is stored, and
+        the stored file gets its canonical extension. Word, Excel and
+        PowerPoint files are checked again once stored, from the zip central
+        directory at their end; an archive that is not one is deleted.
+
+        Returns:
+            Storage key, file size and detected MIME type
         """
-        cls.validate_document(file)
-
-        # Generate unique filename
-        unique_id = uuid.uuid4()
-        file_ext = cls.get_file_extension(file.filename or "file")
-        if not file_ext:
-            # Try to determine extension from MIME type
-            mime_to_ext = {
-                "application/pdf": ".pdf",
-                "application/msword": ".doc",
-                "application/vnd.openxmlformats-officedocument.wordprocessingml.document": ".docx",
-                "application/vnd.ms-excel": ".xls",
-                "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet": ".xlsx",
-                "application/vnd.ms-powerpoint": ".ppt",
-                "application/vnd.openxmlformats-officedocument.presentationml.presentation": ".pptx",
-                "text/plain": ".txt",
-                "application/rtf": ".rtf",
-                "application/vnd.oasis.opendocument.text": ".odt",
-                "application/vnd.oasis.opendocument.spreadsheet": ".ods",
-                "application/vnd.oasis.opendocument.presentation": ".odp",
-            }
-            file_ext = mime_to_ext.get(file.content_type or "", ".bin")
-
-        file_name = f"{unique_id}{file_ext}"
-        upload_path = cls.get_upload_path()
-        file_path = upload_path / file_name
-
-        # Save file
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-
-        # Check file size
-        file_size = file_path.stat().st_size
-        if file_size > settings.MAX_DOCUMENT_SIZE:
-            file_path.unlink()
+        reader = cls.validate_document(file)
+        mime_type = reader.sniff()
+        key = f"documents/{uuid.uuid4()}{EXTENSIONS[mime_type]}"
+
+        # Size is checked while streaming; nothing is stored if it is exceeded
+        try:
+            file_size = storage.put_stream(
+                key,
+                reader,  # type: ignore[arg-type]
+                content_type=mime_type,
+                max_size=settings.MAX_DOCUMENT_SIZE,
+            )
+        except FileTooLargeError:
             raise HTTPException(
                 status_code=400,
                 detail=f"File too large. Maximum size: {settings.MAX_DOCUMENT_SIZE / 1024 / 1024}MB",
-            )
+            ) from None
 
-        relative_path = f"documents/{file_name}"
-        return relative_path, file_size
+        if mime_type in OOXML_TYPES:
+            with storage.local_path(key) as path:
+                stored_type = ooxml_type(path)
+            if stored_type != mime_type:
+                storage.delete(key)
+                raise cls._invalid_type()
 
-    @classmethod
-    def delete_document(cls, file_path: str) -> None:
+        return key, file_size, mime_type
+
+    @staticmethod
+    def build_archive(
+        documents: Sequence[Document], *, compress: bool = False
+    ) -> ZipStream:
         """
-        Delete document file from disk.
+        Prepare a streamed ZIP archive of document files.
+
+        Sizes are read from storage, so the stored-mode Content-Length is
+        exact; documents whose file is missing are left out. Entries are
+        named after the original file names, made unique with " (2)" etc.
 
         Args:
-            file_path: Relative path to document file
+            documents: Documents to archive, in order
+            compress: Deflate entries instead of storing them
+
+        Returns:
+            Archive to iterate once for the response body
         """
-        full_path = cls.UPLOAD_DIR / file_path
-        if full_path.exists() and full_path.is_file():
+        entries = []
+        used_names: set[str] = set()
+        for document in documents:
             try:
-                full_path.unlink()
-            except Exception:
-                # Log error but don't fail
-                pass
-
+                size = storage.size(document.file_path)
+            except FileNotFoundError:
+                logger.warning(
+                    "Document %s file is missing, left out of export", document.id
+                )
+                continue
+
+            name = document.file_name.replace("/", "_").replace("\\", "_")
+            stem, suffix = Path(name).stem, Path(name).suffix
+            counter = 1
+            while name.lower() in used_names:
+                counter += 1
+                name = f"{stem} ({counter}){suffix}"
+            used_names.add(name.lower())
+
+            entries.append(
+                ZipEntry(
+                    name=name,
+                    size=size,
+                    modified=document.updated_at,
+                    open=lambda key=document.file_path: storage.get_stream(key),
+                )
+            )
+        return ZipStream(entries, compress=compress)
 
     @classmethod
     def get_signature_info(cls, file_path: str) -> SignatureInfo:
@@ -146,19 +156,22 @@ class DocumentService:
         Extract digital signature information from PDF file.
 
         Args:
-            file_path: Relative path to document file
+            file_path: Storage key of the document file
 
         Returns:
             SignatureInfo with signature details or is_signed=False if not signed
         """
-        full_path = cls.UPLOAD_DIR / file_path
-
-        if not full_path.exists() or not full_path.is_file():
+        if not file_path.lower().endswith(".pdf"):
             return SignatureInfo(is_signed=False)
 
-        if not str(full_path).lower().endswith(".pdf"):
+        try:
+            with storage.local_path(file_path) as full_path:
+                return cls._read_signature(full_path)
+        except FileNotFoundError:
             return SignatureInfo(is_signed=False)
 
+    @classmethod
+    def _read_signature(cls, full_path: Path) -> SignatureInfo:
         try:
             from pypdf import PdfReader  # type: ignore[import-not-found]
 
@@ -0,0 +1,303 @@
+"""First-page thumbnails of PDF documents, rendered in the background."""
+import asyncio
+import logging
+import shutil
+import subprocess
+import tempfile
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from time import perf_counter
+
+from PIL import Image
+from sqlmodel import Session, col, or_, select
+
+from app.core.config import settings
+from app.core.db import engine
+from app.core.metrics import IMAGE_PROCESSING_DURATION
+from app.core.storage import storage
+from app.models import (
+    DOCUMENT_THUMBNAIL_PENDING,
+    DOCUMENT_THUMBNAIL_READY,
+    DOCUMENT_THUMBNAIL_UNAVAILABLE,
+    Document,
+)
+from app.services.file_cleanup_service import file_cleanup_service
+from app.services.image_service import image_service
+
+logger = logging.getLogger(__name__)
+
+# Served while a thumbnail is pending or when none can be rendered
+FALLBACK_ICON_SVG = b"""<svg xmlns="http://www.w3.org/2000/svg" width="96" height="128" viewBox="0 0 96 128">
+<path d="M4 0h60l32 32v92a4 4 0 0 1-4 4H4a4 4 0 0 1-4-4V4a4 4 0 0 1 4-4z" fill="#e2e8f0"/>
+<path d="M64 0v28a4 4 0 0 0 4 4h28z" fill="#cbd5e1"/>
+<path d="M16 56h64M16 72h64M16 88h64M16 104h40" stroke="#94a3b8" stroke-width="6" stroke-linecap="round"/>
+</svg>"""
+
+
+@dataclass
+class ClaimedDocument:
+    """Document taken from the thumbnail queue, detached from the session."""
+
+    id: uuid.UUID
+    file_path: str
+
+
+class DocumentThumbnailService:
+    """Service for rendering and storing document preview images."""
+
+    # Longest side of the stored JPEG
+    MAX_SIZE = 480
+    QUALITY = 80
+    # Embedded images smaller than this are logos or stamps, not a page scan
+    MIN_EMBEDDED_SIZE = 300
+
+    def __init__(self) -> None:
+        self._wakeup: asyncio.Event | None = None
+
+    @staticmethod
+    def wants_thumbnail(mime_type: str) -> bool:
+        """Check whether documents of this type get a rendered thumbnail."""
+        return mime_type == "application/pdf"
+
+    def notify(self) -> None:
+        """Wake up the worker of this process after a document was committed."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    @classmethod
+    def _render_with_pdftoppm(
+        cls, pdf_path: Path, output_dir: Path
+    ) -> Image.Image | None:
+        """Rasterize page 1 with poppler's pdftoppm, if it is installed."""
+        pdftoppm = shutil.which("pdftoppm")
+        if pdftoppm is None:
+            return None
+        prefix = output_dir / "page"
+        subprocess.run(
+            [
+                pdftoppm,
+                "-f",
+                "1",
+                "-l",
+                "1",
+                "-singlefile",
+                "-scale-to",
+                str(cls.MAX_SIZE),
+                "-jpeg",
+                str(pdf_path),
+                str(prefix),
+            ],
+            check=True,
+            capture_output=True,
+            timeout=settings.DOCUMENT_THUMBNAIL_RENDER_TIMEOUT_SECONDS,
+        )
+        return Image.open(prefix.with_suffix(".jpg"))
+
+    @classmethod
+    def _largest_embedded_image(cls, pdf_path: Path) -> Image.Image | None:
+        """
+        Pure-Python fallback: the largest image drawn on page 1.
+
+        Scanned documents (orders, signed forms) are one image per page, so
+        this gives a faithful preview without a renderer. Text-only pages
+        have no such image and get the fallback icon.
+
+        Raises:
+            ValueError: An image on the page exceeds MAX_IMAGE_PIXELS
+        """
+        from pypdf import PdfReader  # type: ignore[import-not-found]
+
+        reader = PdfReader(str(pdf_path))
+        if not reader.pages:
+            return None
+        page = reader.pages[0]
+        resources = page.get("/Resources")
+        xobjects = resources.get_object().get("/XObject") if resources else None
+        # Pick by the sizes in the image dictionaries, so only the chosen
+        # image is decoded and a decompression bomb never is
+        largest, largest_pixels = None, 0
+        for name, reference in (xobjects.get_object() if xobjects else {}).items():
+            xobject = reference.get_object()
+            if xobject.get("/Subtype") != "/Image":
+                continue
+            width = int(xobject.get("/Width", 0))
+            height = int(xobject.get("/Height", 0))
+            pixels = width * height
+            if pixels > settings.MAX_IMAGE_PIXELS:
+                raise ValueError(
+                    f"Embedded image too large: {width}x{height}, "
+                    f"maximum {settings.MAX_IMAGE_PIXELS} pixels"
+                )
+            if min(width, height) >= cls.MIN_EMBEDDED_SIZE and pixels > largest_pixels:
+                largest, largest_pixels = name, pixels
+        if largest is None:
+            return None
+        return page.images[largest].image
+
+    @classmethod
+    def render(cls, pdf_path: Path, output_path: Path) -> bool:
+        """
+        Render the first page of a PDF as a JPEG of at most MAX_SIZE pixels.
+
+        Uses pdftoppm when installed, the largest embedded page image
+        otherwise.
+
+        Returns:
+            True if a thumbnail was written
+        """
+        with tempfile.TemporaryDirectory(prefix="thumbnail-") as temp_dir:
+            page = cls._render_with_pdftoppm(pdf_path, Path(temp_dir))
+            if page is None:
+                page = cls._largest_embedded_image(pdf_path)
+            if page is None:
+                return False
+            with page:
+                page.thumbnail((cls.MAX_SIZE, cls.MAX_SIZE), Image.Resampling.LANCZOS)
+                page.convert("RGB").save(
+                    output_path, "JPEG", quality=cls.QUALITY, optimize=True
+                )
+        return True
+
+    @classmethod
+    def create_thumbnail(cls, file_path: str) -> str | None:
+        """
+        Render a stored PDF and store its thumbnail.
+
+        Returns:
+            Storage key of the thumbnail, None if it could not be rendered
+        """
+        with (
+            storage.local_path(file_path) as pdf_path,
+            tempfile.TemporaryDirectory(prefix="thumbnail-") as temp_dir,
+        ):
+            output_path = Path(temp_dir) / "thumbnail.jpg"
+            started = perf_counter()
+            rendered = cls.render(pdf_path, output_path)
+            IMAGE_PROCESSING_DURATION.observe(
+                perf_counter() - started, "document_thumbnail"
+            )
+            if not rendered:
+                return None
+            key = f"documents/thumbnails/{uuid.uuid4()}.jpg"
+            storage.put_file(key, output_path, content_type="image/jpeg")
+        return key
+
+    @staticmethod
+    def claim(*, session: Session) -> ClaimedDocument | None:
+        """
+        Take the oldest pending document whose thumbnail nobody is rendering.
+
+        The row is locked with ``FOR UPDATE SKIP LOCKED`` only while the lease
+        (DOCUMENT_THUMBNAIL_LEASE_SECONDS) is written, so rendering runs
+        without an open transaction. If a worker dies, the document becomes
+        available again once its lease expires.
+        """
+        now = datetime.now(timezone.utc)
+        document = session.exec(
+            select(Document)
+            .where(
+                Document.thumbnail_status == DOCUMENT_THUMBNAIL_PENDING,
+                or_(
+                    col(Document.thumbnail_locked_until).is_(None),
+                    col(Document.thumbnail_locked_until) <= now,
+                ),
+            )
+            .order_by(col(Document.created_at))
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        ).first()
+        if document is None:
+            session.rollback()
+            return None
+        document.thumbnail_locked_until = now + timedelta(
+            seconds=settings.DOCUMENT_THUMBNAIL_LEASE_SECONDS
+        )
+        claimed = ClaimedDocument(id=document.id, file_path=document.file_path)
+        session.add(document)
+        session.commit()
+        return claimed
+
+    def process_next(self) -> bool:
+        """
+        Render the thumbnail of one pending document.
+
+        Rendering is bounded by DOCUMENT_THUMBNAIL_RENDER_TIMEOUT_SECONDS. Any
+        error makes the thumbnail unavailable rather than retrying a broken
+        PDF forever. A thumbnail of a document deleted meanwhile is queued
+        for deletion.
+
+        Returns:
+            True if a document was taken from the queue
+        """
+        with Session(engine) as session:
+            claimed = self.claim(session=session)
+            if claimed is None:
+                return False
+
+            key = None
+            try:
+                key = self.create_thumbnail(claimed.file_path)
+            except Exception:
+                logger.exception("Cannot render thumbnail of document %s", claimed.id)
+
+            document = session.get(
+                Document, claimed.id, with_for_update=True, populate_existing=True
+            )
+            if (
+                document is None
+                or document.thumbnail_status != DOCUMENT_THUMBNAIL_PENDING
+            ):
+                if key:
+                    file_cleanup_service.enqueue(session, key)
+                session.commit()
+                return True
+            document.thumbnail_path = key
+            document.thumbnail_status = (
+                DOCUMENT_THUMBNAIL_READY if key else DOCUMENT_THUMBNAIL_UNAVAILABLE
+            )
+            document.thumbnail_locked_until = None
+            session.add(document)
+            session.commit()
+            return True
+
+    async def run_worker(self) -> None:
+        """Render pending thumbnails until cancelled."""
+        # Created here so the event belongs to the running loop
+        self._wakeup = asyncio.Event()
+        try:
+            while True:
+                try:
+                    processed = await image_service.run_in_pool(self.process_next)
+                except Exception:
+                    logger.exception("Document thumbnail worker iteration failed")
+                    processed = False
+                if processed:
+                    continue
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(
+                        self._wakeup.wait(),
+                        timeout=settings.DOCUMENT_THUMBNAIL_POLL_INTERVAL_SECONDS,
+                    )
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._wakeup = None
+
+
+# Global instance
+document_thumbnail_service = DocumentThumbnailService()
+
+
+async def run_document_thumbnail_worker() -> None:
+    """
+    Background loop: render first-page thumbnails of uploaded PDFs.
+
+    Runs for the lifetime of the application on the image pool. Uploads from
+    this process wake the worker up immediately; documents uploaded through
+    other processes, and PDFs from before thumbnails existed, are picked up on
+    the next poll (DOCUMENT_THUMBNAIL_POLL_INTERVAL_SECONDS).
+    """
+    await document_thumbnail_service.run_worker()
@@ -0,0 +1,357 @@
+"""Email outbox: delivery of queued emails over one reused SMTP connection."""
+import asyncio
+import logging
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from email.message import EmailMessage
+from email.utils import formataddr, formatdate
+from time import monotonic
+
+import aiosmtplib
+from sqlalchemy import delete
+from sqlmodel import Session, col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.db import async_engine
+from app.core.metrics import EMAIL_DELIVERIES
+from app.models import EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+_MAX_RETRY_DELAY_SECONDS = 60 * 60
+
+# Errors about one message; anything else is the connection's (or the
+# server's) and postpones the rest of the batch
+_MESSAGE_ERRORS = (
+    aiosmtplib.SMTPSenderRefused,
+    aiosmtplib.SMTPRecipientsRefused,
+    aiosmtplib.SMTPRecipientRefused,
+    aiosmtplib.SMTPDataError,
+)
+# The server is unreachable or dropped the session
+_CONNECTION_ERRORS = (
+    OSError,
+    aiosmtplib.SMTPServerDisconnected,
+    aiosmtplib.SMTPConnectError,
+    aiosmtplib.SMTPTimeoutError,
+)
+
+
+@dataclass
+class ClaimedEmail:
+    """Email taken from the outbox by the worker, detached from the session."""
+
+    id: uuid.UUID
+    email_to: str
+    subject: str
+    html_content: str
+    # Sends that failed before this claim
+    attempts: int
+
+
+@dataclass
+class DeliveryResult:
+    """Outcome of sending one claimed batch."""
+
+    sent: int = 0
+    retried: int = 0
+    failed: int = 0
+
+
+def _is_permanent(error: Exception) -> bool:
+    """A 5xx reply about the message itself: retrying will not help."""
+    if isinstance(error, aiosmtplib.SMTPRecipientsRefused):
+        return all(refused.code >= 500 for refused in error.recipients)
+    return isinstance(error, _MESSAGE_ERRORS) and error.code >= 500
+
+
+class SMTPConnection:
+    """
+    One SMTP session reused for consecutive messages.
+
+    Opened (with STARTTLS or implicit TLS and login, as configured) on the
+    first send, reopened once when the server dropped it, and closed by the
+    worker after SMTP_KEEPALIVE_SECONDS without a send.
+    """
+
+    def __init__(self) -> None:
+        self._client: aiosmtplib.SMTP | None = None
+        self._last_used = 0.0
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        # Without credentials (mailcatcher) no AUTH is attempted
+        has_credentials = bool(settings.SMTP_USER and settings.SMTP_PASSWORD)
+        client = aiosmtplib.SMTP(
+            hostname=settings.SMTP_HOST,
+            port=settings.SMTP_PORT,
+            username=settings.SMTP_USER if has_credentials else None,
+            password=settings.SMTP_PASSWORD if has_credentials else None,
+            use_tls=settings.SMTP_SSL,
+            start_tls=settings.SMTP_TLS and not settings.SMTP_SSL,
+            timeout=settings.SMTP_TIMEOUT_SECONDS,
+        )
+        await client.connect()
+        logger.debug("SMTP connection to %s opened", settings.SMTP_HOST)
+        return client
+
+    async def send(self, message: EmailMessage) -> None:
+        """Send a message, connecting or reconnecting as needed."""
+        if self._client is None or not self._client.is_connected:
+            self._client = await self._connect()
+        try:
+            await self._client.send_message(message)
+        except aiosmtplib.SMTPServerDisconnected:
+            # Closed by the server since the last send
+            await self.close()
+            self._client = await self._connect()
+            await self._client.send_message(message)
+        self._last_used = monotonic()
+
+    def idle_for(self) -> float:
+        """Seconds since the last send; 0 when not connected."""
+        return monotonic() - self._last_used if self._client is not None else 0.0
+
+    async def close(self) -> None:
+        """QUIT and drop the connection; errors are ignored."""
+        client, self._client = self._client, None
+        if client is None:
+            return
+        try:
+            if client.is_connected:
+                await client.quit()
+        except (aiosmtplib.SMTPException, OSError):
+            client.close()
+
+
+class EmailOutboxService:
+    """Service for the database-backed email outbox."""
+
+    def __init__(self) -> None:
+        self._wakeup: asyncio.Event | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self.connection = SMTPConnection()
+
+    @staticmethod
+    def enqueue(
+        session: Session, *, email_to: str, subject: str, html_content: str
+    ) -> None:
+        """
+        Queue an email in the caller's transaction.
+
+        Nothing is sent if the transaction rolls back; call notify() after
+        the commit to have the worker of this process send it right away.
+        """
+        session.add(
+            EmailOutbox(email_to=email_to, subject=subject, html_content=html_content)
+        )
+
+    def notify(self) -> None:
+        """Wake up the worker of this process; safe to call from any thread."""
+        if self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    @staticmethod
+    async def claim(*, session: AsyncSession) -> list[ClaimedEmail]:
+        """
+        Take up to EMAIL_OUTBOX_BATCH_SIZE due emails from the outbox.
+
+        Rows are locked with ``FOR UPDATE SKIP LOCKED`` only while the lease
+        (EMAIL_OUTBOX_LEASE_SECONDS) is written, so several processes can share
+        the outbox and no transaction stays open while SMTP is slow. Emails
+        of a worker that dies are sent again once their lease expires.
+        Attempts are counted by deliver(), for emails actually sent.
+        """
+        now = datetime.now(timezone.utc)
+        entries = (
+            await session.exec(
+                select(EmailOutbox)
+                .where(EmailOutbox.next_attempt_at <= now)
+                .order_by(col(EmailOutbox.next_attempt_at))
+                .limit(settings.EMAIL_OUTBOX_BATCH_SIZE)
+                .with_for_update(skip_locked=True)
+            )
+        ).all()
+        claimed = []
+        for entry in entries:
+            entry.next_attempt_at = now + timedelta(
+                seconds=settings.EMAIL_OUTBOX_LEASE_SECONDS
+            )
+            session.add(entry)
+            claimed.append(
+                ClaimedEmail(
+                    id=entry.id,
+                    email_to=entry.email_to,
+                    subject=entry.subject,
+                    html_content=entry.html_content,
+                    attempts=entry.attempts,
+                )
+            )
+        await session.commit()
+        return claimed
+
+    @staticmethod
+    def build_message(email: ClaimedEmail) -> EmailMessage:
+        """MIME message of a queued email, with a Message-ID stable across retries."""
+        sender = settings.EMAILS_FROM_EMAIL or ""
+        message = EmailMessage()
+        message["From"] = formataddr((settings.EMAILS_FROM_NAME or "", sender))
+        message["To"] = email.email_to
+        message["Subject"] = email.subject
+        message["Date"] = formatdate(localtime=True)
+        message["Message-ID"] = f"<{email.id}@{sender.rpartition('@')[2] or 'localhost'}>"
+        message.set_content(email.html_content, subtype="html")
+        return message
+
+    async def deliver(
+        self, emails: list[ClaimedEmail], *, session: AsyncSession
+    ) -> DeliveryResult:
+        """
+        Send a claimed batch over the shared connection and record the outcome.
+
+        Sent emails are removed from the outbox. A 5xx reply about a message,
+        or a message that cannot be built, drops it at once; other failures
+        are retried with exponential backoff up to EMAIL_OUTBOX_MAX_ATTEMPTS.
+        When the connection or the session fails, the email being sent counts
+        an attempt and the rest of the batch is rescheduled without one. An
+        email is not charged when the server cannot be reached at all, so an
+        SMTP outage does not use up the attempts of queued emails.
+        """
+        result = DeliveryResult()
+        done: list[uuid.UUID] = []
+        # (email, error, whether the failure counts as an attempt)
+        retries: list[tuple[ClaimedEmail, str, bool]] = []
+        for index, email in enumerate(emails):
+            try:
+                message = self.build_message(email)
+            except Exception as e:
+                # Invalid address or header: the same on every retry
+                logger.error("Cannot build email %s to %s: %s", email.id, email.email_to, e)
+                result.failed += 1
+                done.append(email.id)
+                continue
+            try:
+                await self.connection.send(message)
+            except _MESSAGE_ERRORS as e:
+                if _is_permanent(e):
+                    logger.error("Rejected email %s to %s: %s", email.id, email.email_to, e)
+                    result.failed += 1
+                    done.append(email.id)
+                else:
+                    retries.append((email, str(e), True))
+                continue
+            except Exception as e:
+                await self.connection.close()
+                if isinstance(e, _CONNECTION_ERRORS):
+                    logger.warning("SMTP connection failed: %s", e)
+                else:
+                    logger.error("SMTP session failed: %s", e)
+                connected = not isinstance(e, aiosmtplib.SMTPConnectError)
+                retries.append((email, str(e), connected))
+                retries += [(pending, str(e), False) for pending in emails[index + 1 :]]
+                break
+            result.sent += 1
+            done.append(email.id)
+
+        now = datetime.now(timezone.utc)
+        for email, error, attempted in retries:
+            entry = await session.get(EmailOutbox, email.id)
+            if entry is None:
+                continue
+            attempts = email.attempts + 1 if attempted else email.attempts
+            if attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+                logger.error(
+                    "Giving up sending %s to %s after %d attempts: %s",
+                    email.id,
+                    email.email_to,
+                    attempts,
+                    error,
+                )
+                result.failed += 1
+                await session.delete(entry)
+                continue
+            delay = min(
+                settings.EMAIL_OUTBOX_POLL_INTERVAL_SECONDS * 2**attempts,
+                _MAX_RETRY_DELAY_SECONDS,
+            )
+            entry.attempts = attempts
+            entry.last_error = error[:500]
+            entry.next_attempt_at = now + timedelta(seconds=delay)
+            session.add(entry)
+            result.retried += 1
+        if done:
+            await session.execute(delete(EmailOutbox).where(col(EmailOutbox.id).in_(done)))
+        await session.commit()
+
+        EMAIL_DELIVERIES.inc("sent", amount=result.sent)
+        EMAIL_DELIVERIES.inc("retry", amount=result.retried)
+        EMAIL_DELIVERIES.inc("failed", amount=result.failed)
+        return result
+
+    async def process_batch(self) -> int:
+        """
+        Claim and deliver one batch.
+
+        Returns:
+            Number of emails taken from the outbox
+        """
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            emails = await self.claim(session=session)
+            if emails:
+                result = await self.deliver(emails, session=session)
+                logger.info(
+                    "Email outbox: %d sent, %d to retry, %d failed",
+                    result.sent,
+                    result.retried,
+                    result.failed,
+                )
+            return len(emails)
+
+    async def run_worker(self) -> None:
+        """Drain the outbox until cancelled, waiting for notify() in between."""
+        # Created here so the event belongs to the running loop
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = wakeup = asyncio.Event()
+        try:
+            while True:
+                try:
+                    if await self.process_batch():
+                        continue
+                except Exception:
+                    logger.exception("Email outbox worker iteration failed")
+                if self.connection.idle_for() > settings.SMTP_KEEPALIVE_SECONDS:
+                    await self.connection.close()
+                wakeup.clear()
+                try:
+                    await asyncio.wait_for(
+                        wakeup.wait(),
+                        timeout=settings.EMAIL_OUTBOX_POLL_INTERVAL_SECONDS,
+                    )
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._wakeup = None
+            self._loop = None
+            await self.connection.close()
+
+
+# Global instance
+email_outbox_service = EmailOutboxService()
+
+
+async def run_email_outbox_worker() -> None:
+    """
+    Background loop: send queued emails.
+
+    Runs for the lifetime of the application when emails are enabled. All
+    work is async (database through the async engine, SMTP through
+    aiosmtplib), so a large outbox does not occupy threadpool threads; one
+    SMTP connection is reused for consecutive batches. Emails queued by this
+    process are sent right away, those of other processes on the next poll
+    (EMAIL_OUTBOX_POLL_INTERVAL_SECONDS).
+    """
+    if not settings.emails_enabled:
+        logger.info("Email outbox worker disabled (emails_enabled=False)")
+        return
+    await email_outbox_service.run_worker()
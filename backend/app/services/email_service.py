@@ -1,87 +1,106 @@
-"""Email service for sending emails."""
+"""Email service for composing emails and queueing them in the outbox."""
 
+import logging
 from pathlib import Path
 from typing import Any
 
-from fastapi_mail import ConnectionConfig, FastMail, MessageSchema, MessageType
-from pydantic import SecretStr
-from jinja2 import Template
+from jinja2 import (
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    StrictUndefined,
+    TemplateError,
+    select_autoescape,
+)
+from sqlmodel import Session
 
 from app.core.config import settings
+from app.services.email_outbox_service import email_outbox_service
+from app.services.verification_service import verification_service
+
+logger = logging.getLogger(__name__)
+
+# HTML compiled from email-templates/src (MJML)
+TEMPLATES_DIR = Path(__file__).parent.parent / "email-templates" / "build"
+
+EMAIL_TEMPLATES = (
+    "new_account.html",
+    "reset_password.html",
+    "email_verification_code.html",
+)
 
 
 class EmailService:
-    """Service for sending emails using fastapi-mail."""
+    """
+    Service for composing emails.
+
+    Emails are queued in the caller's transaction and delivered by the
+    outbox worker (email_outbox_service); the caller commits and then calls
+    ``email_outbox_service.notify()``.
+    """
 
     def __init__(self) -> None:
-        """Initialize email service."""
-        if not settings.emails_enabled:
-            self.fastmail = None
-            return
-
-        # Build connection config
-        # For mailcatcher (no AUTH), we need to disable USE_CREDENTIALS
-        # Otherwise fastapi-mail will try to authenticate even with empty strings
-        has_credentials = bool(settings.SMTP_USER and settings.SMTP_PASSWORD)
-        conf = ConnectionConfig(
-            MAIL_USERNAME=settings.SMTP_USER or "",
-            MAIL_PASSWORD=SecretStr(settings.SMTP_PASSWORD or ""),
-            MAIL_FROM=settings.EMAILS_FROM_EMAIL or "",  # type: ignore[arg-type]
-            MAIL_PORT=settings.SMTP_PORT,
-            MAIL_SERVER=settings.SMTP_HOST or "",
-            MAIL_STARTTLS=settings.SMTP_TLS,
-            MAIL_SSL_TLS=settings.SMTP_SSL,
-            MAIL_FROM_NAME=settings.EMAILS_FROM_NAME or settings.PROJECT_NAME,
-            USE_CREDENTIALS=has_credentials,  # Disable auth for mailcatcher
+        """Initialize the template environment shared by all emails."""
+        # Compiled templates are kept in memory; the bytecode cache saves
+        # compiling them again in other workers and after restarts. Files
+        # are only checked for changes during local development.
+        self.templates = Environment(
+            loader=FileSystemLoader(TEMPLATES_DIR),
+            bytecode_cache=FileSystemBytecodeCache(),
+            autoescape=select_autoescape(["html"]),
+            undefined=StrictUndefined,
+            auto_reload=settings.ENVIRONMENT == "local",
         )
-        self.fastmail = FastMail(conf)
+
+    def validate_templates(self) -> None:
+        """
+        Load every email template, so a missing or broken one fails startup.
+
+        Raises:
+            RuntimeError: If a template is missing or has a syntax error
+        """
+        errors = []
+        for template_name in EMAIL_TEMPLATES:
+            try:
+                self.templates.get_template(template_name)
+            except TemplateError as e:
+                errors.append(f"{template_name}: {e.message or type(e).__name__}")
+        if errors:
+            raise RuntimeError(
+                f"Invalid email templates in {TEMPLATES_DIR}: " + "; ".join(errors)
+            )
 
     def _render_template(self, template_name: str, context: dict[str, Any]) -> str:
         """Render email template."""
-        template_path = (
-            Path(__file__).parent.parent / "email-templates" / "build" / template_name
-        )
-        template_str = template_path.read_text()
-        return Template(template_str).render(context)
+        return self.templates.get_template(template_name).render(context)
 
-    async def send_email(
+    def queue_email(
         self,
+        session: Session,
         *,
         email_to: str,
         subject: str,
         html_content: str,
-    ) -> None:
-        """Send email."""
-        import logging
-
-        logger = logging.getLogger(__name__)
+    ) -> bool:
+        """
+        Queue an email in the session's transaction.
 
+        Returns:
+            False if email sending is disabled and nothing was queued
+        """
         if not settings.emails_enabled:
             logger.warning("Email sending is disabled (emails_enabled=False)")
-            return
-
-        if not self.fastmail:
-            logger.warning("FastMail is not initialized")
-            return
-
-        try:
-            message = MessageSchema(
-                subject=subject,
-                recipients=[email_to],  # type: ignore[arg-type]
-                body=html_content,
-                subtype=MessageType.html,
-            )
-            logger.info(f"Sending email to {email_to} with subject: {subject}")
-            await self.fastmail.send_message(message)
-            logger.info(f"Email sent successfully to {email_to}")
-        except Exception as e:
-            logger.error(f"Error sending email to {email_to}: {e}", exc_info=True)
-            raise
-
-    async def send_password_reset_email(
-        self, *, email_to: str, email: str, token: str
-    ) -> None:
-        """Send password reset email."""
+            return False
+        email_outbox_service.enqueue(
+            session, email_to=email_to, subject=subject, html_content=html_content
+        )
+        logger.info(f"Queued email to {email_to} with subject: {subject}")
+        return True
+
+    def queue_password_reset_email(
+        self, session: Session, *, email_to: str, email: str, token: str
+    ) -> bool:
+        """Queue password reset email."""
         project_name = settings.PROJECT_NAME
         subject = f"{project_name} - Password recovery for user {email}"
         link = f"{settings.FRONTEND_HOST}/reset-password?token={token}"
@@ -95,12 +114,14 @@ class EmailService:
                 "link": link,
             },
         )
-        await self.send_email(
-            email_to=email_to, subject=subject, html_content=html_content
+        return self.queue_email(
+            session, email_to=email_to, subject=subject, html_content=html_content
         )
 
-    async def send_new_account_email(self, *, email_to: str, username: str) -> None:
-        """Send new account email."""
+    def queue_new_account_email(
+        self, session: Session, *, email_to: str, username: str
+    ) -> bool:
+        """Queue new account email."""
         project_name = settings.PROJECT_NAME
         subject = f"{project_name} - New account for user {username}"
         html_content = self._render_template(
@@ -112,66 +133,27 @@ class EmailService:
                 "link": f"{settings.FRONTEND_HOST}/auth/login",
             },
         )
-        await self.send_email(
-            email_to=email_to, subject=subject, html_content=html_content
+        return self.queue_email(
+            session, email_to=email_to, subject=subject, html_content=html_content
         )
 
-    def send_new_account_email_sync(self, *, email_to: str, username: str) -> None:
-        """Send new account email (synchronous wrapper for BackgroundTasks)."""
-        import asyncio
-
-        # Create new event loop for background task
-        try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(
-                self.send_new_account_email(email_to=email_to, username=username)
-            )
-        finally:
-            loop.close()
-
-    async def send_email_verification_code(self, *, email_to: str, code: str) -> None:
-        """Send email verification code."""
+    def queue_email_verification_code(
+        self, session: Session, *, email_to: str, code: str
+    ) -> bool:
+        """Queue email verification code."""
         project_name = settings.PROJECT_NAME
         subject = f"{project_name} - Email Verification Code"
-        html_content = f"""
-        <html>
-        <body>
-            <h2>Email Verification Code</h2>
-            <p>Your verification code is: <strong style="font-size: 24px; letter-spacing: 4px;">{code}</strong></p>
-            <p>This code will expire in 5 minutes.</p>
-            <p>If you didn't request this code, please ignore this email.</p>
-        </body>
-        </html>
-        """
-        await self.send_email(
-            email_to=email_to, subject=subject, html_content=html_content
+        html_content = self._render_template(
+            template_name="email_verification_code.html",
+            context={
+                "project_name": settings.PROJECT_NAME,
+                "code": code,
+                "valid_minutes": verification_service.CODE_EXPIRY_MINUTES,
+            },
+        )
+        return self.queue_email(
+            session, email_to=email_to, subject=subject, html_content=html_content
         )
-
-    def send_email_verification_code_sync(self, *, email_to: str, code: str) -> None:
-        """Send email verification code (synchronous wrapper for BackgroundTasks)."""
-        import asyncio
-        import logging
-
-        logger = logging.getLogger(__name__)
-        logger.info(f"Attempting to send verification code email to {email_to}")
-
-        # Create new event loop for background task
-        try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(
-                self.send_email_verification_code(email_to=email_to, code=code)
-            )
-            logger.info(f"Verification code email sent successfully to {email_to}")
-        except Exception as e:
-            logger.error(
-                f"Failed to send verification code email to {email_to}: {e}",
-                exc_info=True,
-            )
-            raise
-        finally:
-            loop.close()
 
 
 # Global instance
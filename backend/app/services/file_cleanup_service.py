@@ -0,0 +1,261 @@
+"""Deferred removal of upload files and orphan file reconciliation."""
+import asyncio
+import logging
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from time import monotonic, time
+
+from sqlalchemy import text
+from sqlmodel import Session, col, select
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.db import engine
+from app.core.storage import storage
+from app.models import Document, FileDeletion, ImageJob, NewsImage, PersonImage
+
+logger = logging.getLogger(__name__)
+
+# Storage key prefixes whose files are owned by database rows
+MANAGED_DIRS = ("news", "persons", "documents")
+
+# Key for pg_try_advisory_xact_lock: only one process reconciles at a time
+_RECONCILE_LOCK_KEY = 0x66696C65  # "file"
+
+_MAX_RETRY_DELAY_SECONDS = 60 * 60
+
+
+@dataclass
+class CleanupResult:
+    """Outcome of a deletion queue run or an orphan reconciliation."""
+
+    files_scanned: int = 0
+    files_deleted: int = 0
+    bytes_reclaimed: int = 0
+    failed: int = 0
+
+
+class FileCleanupService:
+    """Service for removing upload files that no database row references."""
+
+    @staticmethod
+    def enqueue(session: Session, *file_paths: str) -> None:
+        """
+        Queue upload files for deletion in the caller's transaction.
+
+        The files are removed by the background worker only after the
+        transaction deleting their rows commits; on rollback the queue entries
+        disappear together with the rest of the changes.
+
+        Args:
+            session: Session with pending row deletions
+            file_paths: Storage keys
+        """
+        for file_path in file_paths:
+            session.add(FileDeletion(file_path=file_path))
+
+    def process_queue(self, *, session: Session) -> CleanupResult:
+        """
+        Delete one batch of queued files.
+
+        Rows are claimed with ``FOR UPDATE SKIP LOCKED`` so several workers can
+        share the queue. Failed deletions are retried with exponential backoff
+        up to FILE_CLEANUP_MAX_ATTEMPTS; after that the entry is dropped and the
+        file is left to the orphan reconciler.
+        """
+        now = datetime.now(timezone.utc)
+        entries = session.exec(
+            select(FileDeletion)
+            .where(FileDeletion.next_attempt_at <= now)
+            .order_by(col(FileDeletion.next_attempt_at))
+            .limit(settings.FILE_CLEANUP_BATCH_SIZE)
+            .with_for_update(skip_locked=True)
+        ).all()
+
+        result = CleanupResult(files_scanned=len(entries))
+        for entry in entries:
+            try:
+                size = storage.delete(entry.file_path)
+            except Exception as e:
+                result.failed += 1
+                entry.attempts += 1
+                if (
+                    isinstance(e, ValueError)
+                    or entry.attempts >= settings.FILE_CLEANUP_MAX_ATTEMPTS
+                ):
+                    logger.error(
+                        "Giving up deleting %s after %d attempts: %s",
+                        entry.file_path,
+                        entry.attempts,
+                        e,
+                    )
+                    session.delete(entry)
+                    continue
+                delay = min(
+                    settings.FILE_CLEANUP_INTERVAL_SECONDS * 2**entry.attempts,
+                    _MAX_RETRY_DELAY_SECONDS,
+                )
+                entry.last_error = str(e)[:500]
+                entry.next_attempt_at = now + timedelta(seconds=delay)
+                session.add(entry)
+                continue
+            session.delete(entry)
+            if size:
+                result.files_deleted += 1
+                result.bytes_reclaimed += size
+        session.commit()
+        return result
+
+    @staticmethod
+    def _iter_old_files(min_age_seconds: float) -> Iterator[tuple[str, int]]:
+        """Yield (key, size) of managed files older than min_age_seconds."""
+        cutoff = time() - min_age_seconds
+        for prefix in MANAGED_DIRS:
+            for stored in storage.iter_files(prefix):
+                if stored.modified < cutoff:
+                    yield stored.key, stored.size
+
+    @staticmethod
+    def _referenced(session: Session, paths: list[str]) -> set[str]:
+        """Get which of the given paths are referenced by a database row."""
+        referenced: set[str] = set()
+        for model in (NewsImage, PersonImage, Document):
+            referenced.update(
+                session.exec(
+                    select(model.file_path).where(col(model.file_path).in_(paths))
+                ).all()
+            )
+        referenced.update(
+            path
+            for path in session.exec(
+                select(Document.thumbnail_path).where(
+                    col(Document.thumbnail_path).in_(paths)
+                )
+            ).all()
+            if path
+        )
+        # Raw uploads of image jobs that are queued or waiting for a retry
+        referenced.update(
+            session.exec(
+                select(ImageJob.source_path).where(col(ImageJob.source_path).in_(paths))
+            ).all()
+        )
+        return referenced
+
+    def reconcile_orphans(
+        self,
+        *,
+        session: Session,
+        min_age_seconds: float | None = None,
+        dry_run: bool = False,
+    ) -> CleanupResult:
+        """
+        Remove upload files that no NewsImage, PersonImage, Document or ImageJob references.
+
+        Lists the managed prefixes of the storage and checks keys against the
+        database in batches of FILE_CLEANUP_BATCH_SIZE. Files younger than
+        ``min_age_seconds`` are skipped: an upload writes its file before the
+        row is committed. On PostgreSQL only one process reconciles at a time.
+
+        Args:
+            session: Database session
+            min_age_seconds: Minimum file age, defaults to UPLOAD_ORPHAN_MIN_AGE_SECONDS
+            dry_run: Only count orphans, do not delete them
+
+        Returns:
+            CleanupResult with scanned and deleted files and bytes reclaimed
+        """
+        result = CleanupResult()
+        if session.get_bind().dialect.name == "postgresql":
+            locked = session.execute(
+                text("SELECT pg_try_advisory_xact_lock(:key)"),
+                {"key": _RECONCILE_LOCK_KEY},
+            ).scalar_one()
+            if not locked:
+                logger.info("Upload reconciliation is already running elsewhere")
+                return result
+
+        if min_age_seconds is None:
+            min_age_seconds = settings.UPLOAD_ORPHAN_MIN_AGE_SECONDS
+        batch: dict[str, int] = {}
+
+        def flush() -> None:
+            referenced = self._referenced(session, list(batch))
+            for path, size in batch.items():
+                if path in referenced:
+                    continue
+                if dry_run:
+                    result.files_deleted += 1
+                    result.bytes_reclaimed += size
+                    continue
+                try:
+                    removed = storage.delete(path)
+                except Exception as e:
+                    result.failed += 1
+                    logger.warning("Failed to delete orphan file %s: %s", path, e)
+                    continue
+                if removed:
+                    result.files_deleted += 1
+                    result.bytes_reclaimed += removed
+            batch.clear()
+
+        for path, size in self._iter_old_files(min_age_seconds):
+            result.files_scanned += 1
+            batch[path] = size
+            if len(batch) >= settings.FILE_CLEANUP_BATCH_SIZE:
+                flush()
+        if batch:
+            flush()
+        # Releases the advisory lock
+        session.rollback()
+        return result
+
+
+# Global instance
+file_cleanup_service = FileCleanupService()
+
+
+def _process_queue() -> CleanupResult:
+    with Session(engine) as session:
+        return file_cleanup_service.process_queue(session=session)
+
+
+def _reconcile_orphans() -> CleanupResult:
+    with Session(engine) as session:
+        return file_cleanup_service.reconcile_orphans(session=session)
+
+
+async def run_file_cleanup_worker() -> None:
+    """
+    Background loop: drain the deletion queue, reconcile orphans periodically.
+
+    Runs for the lifetime of the application; database and filesystem work is
+    done in the threadpool.
+    """
+    reconcile_interval = settings.UPLOAD_RECONCILE_INTERVAL_SECONDS
+    next_reconcile = monotonic() + reconcile_interval
+    while True:
+        try:
+            result = await run_in_threadpool(_process_queue)
+            if result.files_deleted or result.failed:
+                logger.info(
+                    "Deletion queue: %d files deleted, %d bytes reclaimed, %d failed",
+                    result.files_deleted,
+                    result.bytes_reclaimed,
+                    result.failed,
+                )
+            if reconcile_interval and monotonic() >= next_reconcile:
+                next_reconcile = monotonic() + reconcile_interval
+                result = await run_in_threadpool(_reconcile_orphans)
+                logger.info(
+                    "Upload reconciliation: %d files scanned, %d orphans deleted, "
+                    "%d bytes reclaimed, %d failed",
+                    result.files_scanned,
+                    result.files_deleted,
+                    result.bytes_reclaimed,
+                    result.failed,
+                )
+        except Exception:
+            logger.exception("File cleanup worker iteration failed")
+        await asyncio.sleep(settings.FILE_CLEANUP_INTERVAL_SECONDS)
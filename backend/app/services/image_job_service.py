@@ -0,0 +1,226 @@
+"""Background processing of uploaded news images."""
+import asyncio
+import logging
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from fastapi import HTTPException
+from sqlmodel import Session, col, select
+
+from app.core.config import settings
+from app.core.db import engine
+from app.core.storage import storage
+from app.models import (
+    IMAGE_STATUS_FAILED,
+    IMAGE_STATUS_READY,
+    ImageJob,
+    NewsImage,
+)
+from app.services.file_cleanup_service import file_cleanup_service
+from app.services.image_service import image_service
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ClaimedJob:
+    """Job taken from the queue by a worker, detached from the session."""
+
+    id: uuid.UUID
+    image_id: uuid.UUID
+    source_path: str
+    attempts: int
+
+
+class ImageJobService:
+    """Service for the database-backed news image processing queue."""
+
+    def __init__(self) -> None:
+        self._wakeup: asyncio.Event | None = None
+
+    @staticmethod
+    def enqueue(session: Session, image: NewsImage, source_path: str) -> None:
+        """
+        Queue processing of a raw upload in the caller's transaction.
+
+        Args:
+            session: Session with the pending NewsImage in processing state
+            image: Image whose file_path receives the processed JPEG
+            source_path: Storage key of the raw upload
+        """
+        session.add(ImageJob(image_id=image.id, source_path=source_path))
+
+    def notify(self) -> None:
+        """Wake up the workers of this process after a job was committed."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    @staticmethod
+    def claim(*, session: Session) -> ClaimedJob | None:
+        """
+        Take the oldest available job from the queue.
+
+        The row is locked with ``FOR UPDATE SKIP LOCKED`` only while the lease
+        (IMAGE_JOB_LEASE_SECONDS) is written, so processing runs without an
+        open transaction. If a worker dies, the job becomes available again
+        once its lease expires.
+        """
+        now = datetime.now(timezone.utc)
+        job = session.exec(
+            select(ImageJob)
+            .where(ImageJob.locked_until <= now)
+            .order_by(col(ImageJob.created_at))
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        ).first()
+        if job is None:
+            session.rollback()
+            return None
+        job.attempts += 1
+        job.locked_until = now + timedelta(seconds=settings.IMAGE_JOB_LEASE_SECONDS)
+        claimed = ClaimedJob(
+            id=job.id,
+            image_id=job.image_id,
+            source_path=job.source_path,
+            attempts=job.attempts,
+        )
+        session.add(job)
+        session.commit()
+        return claimed
+
+    def run(self, claimed: ClaimedJob, *, session: Session) -> None:
+        """
+        Normalize the raw upload of a claimed job and update its image.
+
+        On success the image becomes ready; an image Pillow cannot process
+        becomes failed with the error stored. Unexpected errors are retried
+        with backoff up to IMAGE_JOB_MAX_ATTEMPTS. The raw upload is queued for
+        deletion once the job is finished either way.
+        """
+        image = session.get(NewsImage, claimed.image_id)
+        if image is None:
+            # Image deleted meanwhile; its job row went with it (CASCADE)
+            file_cleanup_service.enqueue(session, claimed.source_path)
+            session.commit()
+            return
+        file_path = image.file_path
+        session.rollback()
+
+        error = ""
+        processed = None
+        try:
+            with storage.local_path(claimed.source_path) as source_path:
+                processed = image_service.process_file(source_path, file_path)
+        except FileNotFoundError:
+            error = "Uploaded file is missing"
+        except HTTPException as e:
+            error = str(e.detail)
+        except Exception as e:
+            if claimed.attempts < settings.IMAGE_JOB_MAX_ATTEMPTS:
+                logger.warning(
+                    "Image job %s failed (attempt %d), will retry: %s",
+                    claimed.id,
+                    claimed.attempts,
+                    e,
+                )
+                delay = settings.IMAGE_JOB_POLL_INTERVAL_SECONDS * 2**claimed.attempts
+                job = session.get(ImageJob, claimed.id)
+                if job is not None:
+                    job.locked_until = datetime.now(timezone.utc) + timedelta(
+                        seconds=delay
+                    )
+                    session.add(job)
+                    session.commit()
+                return
+            logger.exception("Image job %s failed, giving up", claimed.id)
+            error = "Failed to process image"
+
+        # The image or the job may have been deleted while we were working
+        image = session.get(
+            NewsImage, claimed.image_id, with_for_update=True, populate_existing=True
+        )
+        job = session.get(
+            ImageJob, claimed.id, with_for_update=True, populate_existing=True
+        )
+        if image is None or job is None:
+            session.rollback()
+            if image is None:
+                file_cleanup_service.enqueue(session, claimed.source_path, file_path)
+                session.commit()
+            return
+
+        if processed is not None:
+            image.status = IMAGE_STATUS_READY
+            image.file_size = processed.file_size
+            image.width = processed.width
+            image.height = processed.height
+            image.placeholder = processed.placeholder
+        else:
+            image.status = IMAGE_STATUS_FAILED
+            image.processing_error = error[:500]
+        session.add(image)
+        session.delete(job)
+        file_cleanup_service.enqueue(session, claimed.source_path)
+        session.commit()
+
+    def process_next(self) -> bool:
+        """
+        Claim and run one job.
+
+        Returns:
+            True if a job was taken from the queue
+        """
+        with Session(engine) as session:
+            claimed = self.claim(session=session)
+            if claimed is None:
+                return False
+            self.run(claimed, session=session)
+            return True
+
+    async def _work(self, wakeup: asyncio.Event) -> None:
+        while True:
+            try:
+                processed = await image_service.run_in_pool(self.process_next)
+            except Exception:
+                logger.exception("Image job worker iteration failed")
+                processed = False
+            if processed:
+                continue
+            wakeup.clear()
+            try:
+                await asyncio.wait_for(
+                    wakeup.wait(), timeout=settings.IMAGE_JOB_POLL_INTERVAL_SECONDS
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    async def run_workers(self) -> None:
+        """Run IMAGE_PROCESSING_WORKERS concurrent workers until cancelled."""
+        # Created here so the event belongs to the running loop
+        self._wakeup = asyncio.Event()
+        try:
+            await asyncio.gather(
+                *(
+                    self._work(self._wakeup)
+                    for _ in range(settings.IMAGE_PROCESSING_WORKERS)
+                )
+            )
+        finally:
+            self._wakeup = None
+
+
+# Global instance
+image_job_service = ImageJobService()
+
+
+async def run_image_job_worker() -> None:
+    """
+    Background loop: process queued news image jobs.
+
+    Runs for the lifetime of the application; Pillow and database work is
+    done on the image pool. Uploads from this process wake the workers up
+    immediately, jobs queued by other processes are picked up on the next
+    poll (IMAGE_JOB_POLL_INTERVAL_SECONDS).
+    """
+    await image_job_service.run_workers()
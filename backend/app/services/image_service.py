@@ -1,93 +1,218 @@
 """Image processing service."""
+import asyncio
+import base64
+import io
 import shutil
+import tempfile
 import uuid
-from pathlib import Path
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from time import perf_counter
+from typing import TypeVar
 
 from fastapi import HTTPException, UploadFile
-from PIL import Image
+from PIL import ExifTags, Image, ImageCms, ImageOps
 
 from app.core.config import settings
+from app.core.metrics import (
+    IMAGE_PROCESSING_DURATION,
+    THREADPOOL_BUSY,
+    THREADPOOL_LIMIT,
+)
+from app.core.sniffing import EXTENSIONS, SniffingReader, UnsupportedFileTypeError
+from app.core.storage import FileTooLargeError, storage
 
-UPLOAD_DIR = Path(settings.UPLOAD_DIR)
-if not UPLOAD_DIR.is_absolute():
-    # Determine base directory from file location
-    # In Docker: /app/app/services/image_service.py -> base should be /app
-    # Locally: backend/app/services/image_service.py -> base should be backend
-    file_path = Path(__file__)
-    # Check if we're in Docker (path starts with /app/app)
-    if str(file_path).startswith("/app/app/"):
-        # Running in Docker, use /app as base
-        base_dir = Path("/app")
-    else:
-        # Local development: compute from file location
-        base_dir = file_path.parent.parent.parent.parent
-        if base_dir.name == "app" and base_dir.parent.name == "app":
-            base_dir = base_dir.parent
-    UPLOAD_DIR = base_dir / UPLOAD_DIR
-UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+# Pillow's own bomb guard (error at twice the limit) for any other decoding
+Image.MAX_IMAGE_PIXELS = settings.MAX_IMAGE_PIXELS
+
+T = TypeVar("T")
+
+# EXIF orientations whose transpose swaps width and height
+_ROTATED_ORIENTATIONS = {5, 6, 7, 8}
+
+_SRGB_PROFILE = ImageCms.ImageCmsProfile(ImageCms.createProfile("sRGB"))
+
+# Pillow releases the GIL while decoding, resizing and encoding
+_executor = ThreadPoolExecutor(
+    max_workers=settings.IMAGE_PROCESSING_WORKERS, thread_name_prefix="image"
+)
+THREADPOOL_LIMIT.set(settings.IMAGE_PROCESSING_WORKERS, "image")
+THREADPOOL_BUSY.set(0, "image")
+
+
+@dataclass
+class ProcessedImage:
+    """Result of normalizing an image file."""
+
+    file_size: int
+    width: int | None = None
+    height: int | None = None
+    # data: URI of a tiny WebP preview, None if it could not be made
+    placeholder: str | None = None
 
 
 class ImageService:
     """Service for processing and saving images."""
 
+    # Every stored image is normalized to JPEG
+    OUTPUT_MIME_TYPE = "image/jpeg"
     MAX_WIDTH = 1920
     MAX_HEIGHT = 1080
     DEFAULT_QUALITY = 85
     RESIZED_QUALITY = 80
-    UPLOAD_DIR = UPLOAD_DIR
+    # resize() first shrinks by an integer factor with reduce() while the
+    # image stays at least REDUCING_GAP times the target size
+    REDUCING_GAP = 2.0
+    # Inline preview shown (blurred) while the full image loads; ~150 bytes
+    PLACEHOLDER_SIZE = 16
+    PLACEHOLDER_QUALITY = 30
+    PLACEHOLDER_MAX_LENGTH = 1024
 
     @staticmethod
-    def get_upload_path(news_id: uuid.UUID) -> Path:
-        """Get upload directory for specific news item."""
-        news_dir = UPLOAD_DIR / "news" / str(news_id)
-        news_dir.mkdir(parents=True, exist_ok=True)
-        return news_dir
+    async def run_in_pool(func: Callable[..., T], *args: object) -> T:
+        """Run blocking image processing on the dedicated worker pool."""
+        # Counts queued calls too: above the pool size, work is waiting
+        THREADPOOL_BUSY.inc("image")
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                _executor, func, *args
+            )
+        finally:
+            THREADPOOL_BUSY.dec("image")
 
     @staticmethod
-    def get_person_upload_path(person_id: uuid.UUID) -> Path:
-        """Get upload directory for specific person."""
-        person_dir = UPLOAD_DIR / "persons" / str(person_id)
-        person_dir.mkdir(parents=True, exist_ok=True)
-        return person_dir
+    def validate_image(file: UploadFile) -> SniffingReader:
+        """
+        Detect the type of an uploaded image from its first bytes.
 
-    @staticmethod
-    def validate_image(file: UploadFile) -> None:
-        """Validate uploaded image file."""
-        if file.content_type not in settings.ALLOWED_IMAGE_TYPES:
+        Returns:
+            Reader to store the upload from; its mime_type is the detected type
+        """
+        reader = SniffingReader(
+            file.file,
+            allowed=settings.ALLOWED_IMAGE_TYPES,
+            filename=file.filename,
+            claimed=file.content_type,
+        )
+        try:
+            reader.sniff()
+        except UnsupportedFileTypeError:
             raise HTTPException(
                 status_code=400,
                 detail=f"Invalid file type. Allowed types: {', '.join(settings.ALLOWED_IMAGE_TYPES)}",
-            )
+            ) from None
+        return reader
 
-    @classmethod
-    def save_image(
-        cls, file: UploadFile, news_id: uuid.UUID
-    ) -> tuple[str, int]:
-        """
-        Save uploaded image, normalize to JPEG format and standard size.
-        Returns relative path and file size.
-        """
-        cls.validate_image(file)
-
-        unique_id = uuid.uuid4()
-        file_name = f"{unique_id}.jpg"
-        upload_path = cls.get_upload_path(news_id)
-        file_path = upload_path / file_name
+    @staticmethod
+    def _too_large() -> HTTPException:
+        return HTTPException(
+            status_code=400,
+            detail=f"File too large. Maximum size: {settings.MAX_UPLOAD_SIZE / 1024 / 1024}MB",
+        )
 
-        temp_path = upload_path / f"{unique_id}_temp{Path(file.filename or '').suffix}"
+    @classmethod
+    def _store_upload(cls, reader: SniffingReader, temp_path: Path) -> None:
+        """Write an upload to a local temporary file, enforcing MAX_UPLOAD_SIZE."""
         with open(temp_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+            shutil.copyfileobj(reader, buffer)
 
         temp_size = temp_path.stat().st_size
         if temp_size > settings.MAX_UPLOAD_SIZE:
             temp_path.unlink()
+            raise cls._too_large()
+
+    @classmethod
+    def _fit_size(cls, width: int, height: int) -> tuple[int, int] | None:
+        """Get size within MAX_WIDTH x MAX_HEIGHT, None if the image already fits."""
+        if width <= cls.MAX_WIDTH and height <= cls.MAX_HEIGHT:
+            return None
+        ratio = min(cls.MAX_WIDTH / width, cls.MAX_HEIGHT / height)
+        return int(width * ratio), int(height * ratio)
+
+    @staticmethod
+    def _check_pixels(img: Image.Image) -> None:
+        """Reject decompression bombs; only the header has been read so far."""
+        if img.width * img.height > settings.MAX_IMAGE_PIXELS:
             raise HTTPException(
                 status_code=400,
-                detail=f"File too large. Maximum size: {settings.MAX_UPLOAD_SIZE / 1024 / 1024}MB",
+                detail=f"Image too large. Maximum: {settings.MAX_IMAGE_PIXELS} pixels",
             )
 
+    @staticmethod
+    def _to_srgb(img: Image.Image, icc_profile: bytes) -> Image.Image:
+        """Convert pixels from their embedded ICC profile to sRGB."""
+        try:
+            converted = ImageCms.profileToProfile(
+                img,
+                ImageCms.ImageCmsProfile(io.BytesIO(icc_profile)),
+                _SRGB_PROFILE,
+                outputMode="RGB",
+            )
+        except ImageCms.PyCMSError:
+            return img
+        return converted or img
+
+    @classmethod
+    def _placeholder(cls, img: Image.Image) -> str | None:
+        """Encode a PLACEHOLDER_SIZE preview of an RGB image as a WebP data URI."""
+        ratio = cls.PLACEHOLDER_SIZE / max(img.width, img.height)
+        size = (max(1, round(img.width * ratio)), max(1, round(img.height * ratio)))
+        preview = img.resize(
+            size, Image.Resampling.BILINEAR, reducing_gap=cls.REDUCING_GAP
+        )
+        buffer = io.BytesIO()
+        preview.save(buffer, "WEBP", quality=cls.PLACEHOLDER_QUALITY)
+        placeholder = "data:image/webp;base64," + base64.b64encode(
+            buffer.getvalue()
+        ).decode("ascii")
+        if len(placeholder) > cls.PLACEHOLDER_MAX_LENGTH:
+            return None
+        return placeholder
+
+    @classmethod
+    def normalize_image(
+        cls, source_path: Path, file_path: Path, *, portrait_only: bool = False
+    ) -> ProcessedImage:
+        """
+        Convert an image file to RGB JPEG within MAX_WIDTH x MAX_HEIGHT.
+
+        Oversized JPEGs are decoded with ``draft()`` at the smallest power-of-two
+        scale still above the target size, and the remaining downscale first
+        uses ``reduce()`` by an integer factor, so full-resolution pixels are
+        never decoded or resampled with LANCZOS. Images over MAX_IMAGE_PIXELS
+        are rejected before decoding.
+
+        The EXIF orientation is applied once, right after the draft decode;
+        size limits and ``portrait_only`` apply to the upright image. Pixels
+        with an embedded ICC profile are converted to sRGB, and the output is
+        written without EXIF or ICC data. The source file is left in place.
+        Returns size and dimensions of the written file and its placeholder.
+        """
+        placeholder = None
         try:
-            with Image.open(temp_path) as img:
+            with Image.open(source_path) as img:
+                cls._check_pixels(img)
+                orientation = img.getexif().get(ExifTags.Base.Orientation, 1)
+                rotated = orientation in _ROTATED_ORIENTATIONS
+                width, height = (img.height, img.width) if rotated else img.size
+                if portrait_only and width >= height:
+                    raise HTTPException(
+                        status_code=400, detail="Фото должно быть вертикальным"
+                    )
+
+                target_size = cls._fit_size(width, height)
+                if target_size:
+                    # No-op for formats other than JPEG; works on stored pixels
+                    img.draft("RGB", target_size[::-1] if rotated else target_size)
+
+                icc_profile = img.info.get("icc_profile")
+                if orientation != 1:
+                    img = ImageOps.exif_transpose(img)
+                if icc_profile and img.mode in ("RGB", "CMYK"):
+                    img = cls._to_srgb(img, icc_profile)
+
                 if img.mode != "RGB":
                     rgb_img = Image.new("RGB", img.size, (255, 255, 255))
                     if img.mode == "P":
@@ -98,111 +223,130 @@ class ImageService:
                         rgb_img = img.convert("RGB")
                     img = rgb_img
 
-                if img.width > cls.MAX_WIDTH or img.height > cls.MAX_HEIGHT:
-                    ratio = min(cls.MAX_WIDTH / img.width, cls.MAX_HEIGHT / img.height)
-                    new_size = (int(img.width * ratio), int(img.height * ratio))
-                    img = img.resize(new_size, Image.Resampling.LANCZOS)
+                if target_size:
+                    if img.size != target_size:
+                        img = img.resize(
+                            target_size,
+                            Image.Resampling.LANCZOS,
+                            reducing_gap=cls.REDUCING_GAP,
+                        )
                     quality = cls.RESIZED_QUALITY
                 else:
                     quality = cls.DEFAULT_QUALITY
 
+                # No exif/icc_profile arguments: metadata is not carried over
                 img.save(file_path, "JPEG", quality=quality, optimize=True)
+                width, height = img.size
+                placeholder = cls._placeholder(img)
 
+        except HTTPException:
+            raise
         except Exception as e:
             try:
-                with Image.open(temp_path) as img:
-                    img.convert("RGB").save(file_path, "JPEG", quality=cls.DEFAULT_QUALITY)
+                with Image.open(source_path) as img:
+                    img = ImageOps.exif_transpose(img).convert("RGB")
+                    img.save(file_path, "JPEG", quality=cls.DEFAULT_QUALITY)
+                    width, height = img.size
             except Exception:
-                if temp_path.exists():
-                    temp_path.unlink()
                 raise HTTPException(
                     status_code=400,
                     detail=f"Failed to process image: {str(e)}",
                 )
-        finally:
-            if temp_path.exists() and temp_path != file_path:
-                temp_path.unlink()
 
-        file_size = file_path.stat().st_size
-        relative_path = f"news/{news_id}/{file_name}"
-        return relative_path, file_size
+        return ProcessedImage(
+            file_size=file_path.stat().st_size,
+            width=width,
+            height=height,
+            placeholder=placeholder,
+        )
 
     @classmethod
-    def save_person_image(
-        cls, file: UploadFile, person_id: uuid.UUID
-    ) -> tuple[str, int]:
+    def process_file(
+        cls, source_path: Path, key: str, *, portrait_only: bool = False
+    ) -> ProcessedImage:
         """
-        Save uploaded person image, enforce portrait orientation.
-        Returns relative path and file size.
+        Normalize a local image file and put the JPEG into storage under key.
+        See normalize_image for the processing and raised errors.
         """
-        cls.validate_image(file)
+        with tempfile.TemporaryDirectory(prefix="image-") as temp_dir:
+            output_path = Path(temp_dir) / "image.jpg"
+            started = perf_counter()
+            processed = cls.normalize_image(
+                source_path, output_path, portrait_only=portrait_only
+            )
+            IMAGE_PROCESSING_DURATION.observe(perf_counter() - started, "normalize")
+            storage.put_file(key, output_path, content_type=cls.OUTPUT_MIME_TYPE)
+        return processed
 
-        unique_id = uuid.uuid4()
-        file_name = f"{unique_id}.jpg"
-        upload_path = cls.get_person_upload_path(person_id)
-        file_path = upload_path / file_name
+    @classmethod
+    def _save_upload(
+        cls, file: UploadFile, key: str, *, portrait_only: bool = False
+    ) -> ProcessedImage:
+        reader = cls.validate_image(file)
+        with tempfile.TemporaryDirectory(prefix="upload-") as temp_dir:
+            temp_path = Path(temp_dir) / f"upload{EXTENSIONS[reader.sniff()]}"
+            cls._store_upload(reader, temp_path)
+            return cls.process_file(temp_path, key, portrait_only=portrait_only)
 
-        temp_path = upload_path / f"{unique_id}_temp{Path(file.filename or '').suffix}"
-        with open(temp_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+    @classmethod
+    def save_image(
+        cls, file: UploadFile, news_id: uuid.UUID
+    ) -> tuple[str, ProcessedImage]:
+        """
+        Save uploaded image, normalize to JPEG format and standard size.
+        Returns storage key and processing result (file size, placeholder).
+        """
+        key = f"news/{news_id}/{uuid.uuid4()}.jpg"
+        return key, cls._save_upload(file, key)
 
-        temp_size = temp_path.stat().st_size
-        if temp_size > settings.MAX_UPLOAD_SIZE:
-            temp_path.unlink()
-            raise HTTPException(
-                status_code=400,
-                detail=f"File too large. Maximum size: {settings.MAX_UPLOAD_SIZE / 1024 / 1024}MB",
-            )
+    @classmethod
+    def save_raw_image(cls, file: UploadFile, news_id: uuid.UUID) -> tuple[str, str]:
+        """
+        Save uploaded image unprocessed, for normalization by a background job.
+        Returns storage keys of the raw upload and of the JPEG to produce.
+        """
+        reader = cls.validate_image(file)
+        mime_type = reader.sniff()
 
+        unique_id = uuid.uuid4()
+        raw_key = f"news/{news_id}/{unique_id}_raw{EXTENSIONS[mime_type]}"
         try:
-            with Image.open(temp_path) as img:
-                if img.width >= img.height:
-                    raise HTTPException(
-                        status_code=400, detail="Фото должно быть вертикальным"
-                    )
+            storage.put_stream(
+                raw_key,
+                reader,  # type: ignore[arg-type]
+                content_type=mime_type,
+                max_size=settings.MAX_UPLOAD_SIZE,
+            )
+        except FileTooLargeError:
+            raise cls._too_large() from None
 
-                if img.mode != "RGB":
-                    rgb_img = Image.new("RGB", img.size, (255, 255, 255))
-                    if img.mode == "P":
-                        img = img.convert("RGBA")
-                    if img.mode in ("RGBA", "LA"):
-                        rgb_img.paste(img, mask=img.split()[-1])
-                    else:
-                        rgb_img = img.convert("RGB")
-                    img = rgb_img
+        return raw_key, f"news/{news_id}/{unique_id}.jpg"
 
-                if img.width > cls.MAX_WIDTH or img.height > cls.MAX_HEIGHT:
-                    ratio = min(cls.MAX_WIDTH / img.width, cls.MAX_HEIGHT / img.height)
-                    new_size = (int(img.width * ratio), int(img.height * ratio))
-                    img = img.resize(new_size, Image.Resampling.LANCZOS)
-                    quality = cls.RESIZED_QUALITY
-                else:
-                    quality = cls.DEFAULT_QUALITY
+    @classmethod
+    def save_person_image(
+        cls, file: UploadFile, person_id: uuid.UUID
+    ) -> tuple[str, ProcessedImage]:
+        """
+        Save uploaded person image, enforce portrait orientation.
+        Returns storage key and processing result (file size, placeholder).
+        """
+        key = f"persons/{person_id}/{uuid.uuid4()}.jpg"
+        return key, cls._save_upload(file, key, portrait_only=True)
 
-                img.save(file_path, "JPEG", quality=quality, optimize=True)
+    @staticmethod
+    def find_file(file_path: str) -> str | None:
+        """
+        Find the stored file of an image row.
 
-        except HTTPException:
-            if temp_path.exists():
-                temp_path.unlink()
-            raise
-        except Exception as e:
-            try:
-                with Image.open(temp_path) as img:
-                    img.convert("RGB").save(file_path, "JPEG", quality=cls.DEFAULT_QUALITY)
-            except Exception:
-                if temp_path.exists():
-                    temp_path.unlink()
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Failed to process image: {str(e)}",
-                )
-        finally:
-            if temp_path.exists() and temp_path != file_path:
-                temp_path.unlink()
+        Rows from before normalization may point at the original file name
+        while the file on storage is the converted .jpg (or a .png).
 
-        file_size = file_path.stat().st_size
-        relative_path = f"persons/{person_id}/{file_name}"
-        return relative_path, file_size
+        Returns:
+            Storage key of the file, None if none of the candidates exists
+        """
+        stored = PurePosixPath(file_path)
+        candidates = [file_path, str(stored.with_suffix(".jpg")), str(stored.with_suffix(".png"))]
+        return next((key for key in candidates if storage.exists(key)), None)
 
 
 # Global instance
@@ -1,8 +1,189 @@
 """Verification code service for email verification."""
 
+import heapq
 import secrets
 import string
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+from time import monotonic
+from typing import Any
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.core.db import engine
+from app.models import VerificationCode
+
+_code_table: sa.Table = VerificationCode.__table__  # type: ignore[attr-defined]
+
+# Expired rows of the database store are deleted at most this often
+_SWEEP_INTERVAL_SECONDS = 60
+
+
+class VerificationCodeStore(ABC):
+    """
+    Interface of pending verification codes.
+
+    A code is kept per (user, email) until it is verified, expires, or was
+    guessed wrong ``max_attempts`` times; storing a new code for the same
+    pair replaces the old one and its attempts.
+    """
+
+    def __init__(self, *, max_attempts: int) -> None:
+        self.max_attempts = max_attempts
+
+    @abstractmethod
+    def put(self, user_id: str, email: str, code: str, ttl_seconds: int) -> None:
+        """Store a code for a user and email, replacing any previous one."""
+
+    @abstractmethod
+    def verify(self, user_id: str, email: str, code: str) -> bool:
+        """
+        Check a code; a correct one is consumed.
+
+        Returns:
+            True if the code was stored for the pair and has not expired
+        """
+
+
+@dataclass(slots=True)
+class _PendingCode:
+    code: str
+    expires_at: float
+    attempts: int = 0
+
+
+class MemoryVerificationCodeStore(VerificationCodeStore):
+    """
+    Codes in a dict of this process, with expiry times in a min-heap.
+
+    Expired codes are popped off the heap on every call, so memory does not
+    grow with abandoned codes; at ``max_entries`` the code closest to
+    expiry is evicted. Lookups are O(1), expiry and eviction O(log n).
+    Codes are lost on restart and not shared between workers.
+    """
+
+    def __init__(self, *, max_attempts: int, max_entries: int) -> None:
+        super().__init__(max_attempts=max_attempts)
+        self.max_entries = max_entries
+        self._codes: dict[tuple[str, str], _PendingCode] = {}
+        # (expires_at, key); entries of replaced or consumed codes stay until
+        # they are popped and are then ignored
+        self._expiry: list[tuple[float, tuple[str, str]]] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def _pop_expiry(self) -> None:
+        """Pop the earliest heap entry, dropping its code if still current."""
+        expires_at, key = heapq.heappop(self._expiry)
+        pending = self._codes.get(key)
+        if pending is not None and pending.expires_at == expires_at:
+            del self._codes[key]
+
+    def _sweep(self, now: float) -> None:
+        while self._expiry and self._expiry[0][0] <= now:
+            self._pop_expiry()
+
+    def put(self, user_id: str, email: str, code: str, ttl_seconds: int) -> None:
+        now = monotonic()
+        key = (user_id, email)
+        with self._lock:
+            self._sweep(now)
+            if key not in self._codes:
+                while len(self._codes) >= self.max_entries:
+                    self._pop_expiry()
+            pending = _PendingCode(code=code, expires_at=now + ttl_seconds)
+            self._codes[key] = pending
+            heapq.heappush(self._expiry, (pending.expires_at, key))
+
+    def verify(self, user_id: str, email: str, code: str) -> bool:
+        key = (user_id, email)
+        with self._lock:
+            self._sweep(monotonic())
+            pending = self._codes.get(key)
+            if pending is None:
+                return False
+            if secrets.compare_digest(pending.code.encode(), code.encode()):
+                del self._codes[key]
+                return True
+            pending.attempts += 1
+            if pending.attempts >= self.max_attempts:
+                del self._codes[key]
+            return False
+
+
+class DatabaseVerificationCodeStore(VerificationCodeStore):
+    """
+    Codes in the ``verificationcode`` table, shared by all workers.
+
+    Storing is one upsert, checking one primary key lookup locked with
+    ``FOR UPDATE`` so concurrent guesses are counted. Expired rows are
+    deleted in one statement at most once per minute.
+    """
+
+    def __init__(self, *, max_attempts: int, engine: sa.Engine) -> None:
+        super().__init__(max_attempts=max_attempts)
+        self.engine = engine
+        self._next_sweep = 0.0
+        self._insert: Any = (
+            postgresql.insert if engine.dialect.name == "postgresql" else sqlite.insert
+        )
+
+    def _maybe_sweep(self, session: Session, now: datetime) -> None:
+        if monotonic() < self._next_sweep:
+            return
+        self._next_sweep = monotonic() + _SWEEP_INTERVAL_SECONDS
+        session.execute(sa.delete(_code_table).where(_code_table.c.expires_at <= now))
+
+    def put(self, user_id: str, email: str, code: str, ttl_seconds: int) -> None:
+        now = datetime.now(timezone.utc)
+        values = {
+            "code": code,
+            "attempts": 0,
+            "expires_at": now + timedelta(seconds=ttl_seconds),
+        }
+        statement = self._insert(_code_table).values(
+            user_id=uuid.UUID(user_id), email=email, **values
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[_code_table.c.user_id, _code_table.c.email], set_=values
+        )
+        with Session(self.engine) as session:
+            session.execute(statement)
+            self._maybe_sweep(session, now)
+            session.commit()
+
+    def verify(self, user_id: str, email: str, code: str) -> bool:
+        with Session(self.engine) as session:
+            pending = session.exec(
+                select(VerificationCode)
+                .where(
+                    VerificationCode.user_id == uuid.UUID(user_id),
+                    VerificationCode.email == email,
+                    VerificationCode.expires_at > datetime.now(timezone.utc),
+                )
+                .with_for_update()
+            ).first()
+            if pending is None:
+                return False
+            if secrets.compare_digest(pending.code.encode(), code.encode()):
+                session.delete(pending)
+                session.commit()
+                return True
+            pending.attempts += 1
+            if pending.attempts >= self.max_attempts:
+                session.delete(pending)
+            else:
+                session.add(pending)
+            session.commit()
+            return False
 
 
 class VerificationService:
@@ -10,9 +191,9 @@ class VerificationService:
 
     CODE_EXPIRY_MINUTES = 5
 
-    def __init__(self) -> None:
+    def __init__(self, store: VerificationCodeStore) -> None:
         """Initialize verification service."""
-        self._codes: dict[str, dict[str, tuple[str, datetime]]] = {}
+        self.store = store
 
     def generate_code(self) -> str:
         """Generate cryptographically secure 4-character code from letters and digits."""
@@ -21,40 +202,25 @@ class VerificationService:
 
     def store_code(self, user_id: str, new_email: str, code: str) -> None:
         """Store email verification code with expiration."""
-        expires_at = datetime.now(timezone.utc) + timedelta(
-            minutes=self.CODE_EXPIRY_MINUTES
+        self.store.put(
+            user_id, new_email.lower(), code.upper(), self.CODE_EXPIRY_MINUTES * 60
         )
 
-        if user_id not in self._codes:
-            self._codes[user_id] = {}
-        self._codes[user_id][new_email.lower()] = (code.upper(), expires_at)
-
     def verify_code(self, user_id: str, new_email: str, code: str) -> bool:
-        """Verify email confirmation code."""
-        if user_id not in self._codes:
-            return False
-        if new_email.lower() not in self._codes[user_id]:
-            return False
+        """Verify email confirmation code (case-insensitive); a valid code is consumed."""
+        return self.store.verify(user_id, new_email.lower(), code.upper())
 
-        stored_code, expires_at = self._codes[user_id][new_email.lower()]
 
-        # Check expiration
-        if datetime.now(timezone.utc) > expires_at:
-            del self._codes[user_id][new_email.lower()]
-            if not self._codes[user_id]:
-                del self._codes[user_id]
-            return False
-
-        # Verify code (case-insensitive)
-        if stored_code.upper() != code.upper():
-            return False
-
-        # Code valid, remove it
-        del self._codes[user_id][new_email.lower()]
-        if not self._codes[user_id]:
-            del self._codes[user_id]
-        return True
+def _create_store() -> VerificationCodeStore:
+    if settings.VERIFICATION_CODE_STORE == "memory":
+        return MemoryVerificationCodeStore(
+            max_attempts=settings.VERIFICATION_CODE_MAX_ATTEMPTS,
+            max_entries=settings.VERIFICATION_CODE_MAX_ENTRIES,
+        )
+    return DatabaseVerificationCodeStore(
+        max_attempts=settings.VERIFICATION_CODE_MAX_ATTEMPTS, engine=engine
+    )
 
 
 # Global instance
-verification_service = VerificationService()
+verification_service = VerificationService(_create_store())
@@ -0,0 +1,100 @@
+"""
+Fill width and height of news and person images stored before they were tracked.
+
+Only the first HEADER_BYTES of each file are fetched from storage and only
+the image header is parsed (``Image.open`` without ``load()``), so this is
+fast even for large files and remote (S3) storage. Rows are walked in primary key order in batches
+and updated with one executemany UPDATE per batch. Rows whose file is missing
+or unreadable are left NULL and reported.
+
+Usage (from backend/):
+    python scripts/backfill_image_dimensions.py --batch-size 500
+"""
+
+import argparse
+import io
+import json
+import logging
+import uuid
+from typing import Any
+
+from PIL import Image
+from sqlalchemy import update
+from sqlmodel import Session, col, select
+
+from app.core.db import engine
+from app.core.storage import storage
+from app.models import NewsImage, PersonImage
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+# Enough for the JPEG/PNG/WebP headers Pillow needs to report the size
+HEADER_BYTES = 64 * 1024
+
+
+def _read_size(file_path: str) -> tuple[int, int] | None:
+    try:
+        header = b"".join(storage.get_range(file_path, 0, HEADER_BYTES - 1))
+        with Image.open(io.BytesIO(header)) as img:
+            return img.size
+    except (OSError, ValueError) as e:
+        logger.warning("Cannot read %s: %s", file_path, e)
+        return None
+
+
+def _backfill(
+    session: Session,
+    model: type[NewsImage] | type[PersonImage],
+    batch_size: int,
+    dry_run: bool,
+) -> dict[str, Any]:
+    stats = {"table": model.__tablename__, "scanned": 0, "updated": 0, "failed": 0}
+    last_id: uuid.UUID | None = None
+    while True:
+        statement = (
+            select(model.id, model.file_path)
+            .where(col(model.width).is_(None))
+            .order_by(col(model.id))
+            .limit(batch_size)
+        )
+        if last_id is not None:
+            statement = statement.where(col(model.id) > last_id)
+        rows = session.exec(statement).all()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+
+        values = []
+        for image_id, file_path in rows:
+            size = _read_size(file_path)
+            if size is None:
+                stats["failed"] += 1
+                continue
+            values.append({"id": image_id, "width": size[0], "height": size[1]})
+        stats["scanned"] += len(rows)
+        stats["updated"] += len(values)
+        if values and not dry_run:
+            # ORM bulk UPDATE by primary key: one executemany per batch
+            session.execute(update(model), values)
+            session.commit()
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Read headers without updating rows"
+    )
+    args = parser.parse_args()
+
+    with Session(engine) as session:
+        for model in (NewsImage, PersonImage):
+            stats = _backfill(session, model, args.batch_size, args.dry_run)
+            logger.info(json.dumps({"dry_run": args.dry_run, **stats}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+"""
+Benchmarks of the API and its hot code paths.
+
+Standalone comparisons (run as files):
+
+* ``db_sessions.py``: sync vs async sessions under concurrency
+* ``image_decode.py``: full vs draft JPEG decoding
+* ``serialization.py``: pydantic vs orjson list responses
+
+Suite with JSON results to compare across commits (run as modules from
+backend/, see each module for options):
+
+* ``python -m scripts.benchmarks.dataset``: seed a large synthetic dataset
+* ``python -m scripts.benchmarks.load``: HTTP load against a running API
+* ``python -m scripts.benchmarks.micro``: image, signature and serialization
+  micro-benchmarks
+* ``python -m scripts.benchmarks.compare old.json new.json``: differences
+  between two result files
+"""
@@ -0,0 +1,96 @@
+"""
+Compare two benchmark result files.
+
+Results are matched by name; for each latency percentile, throughput and
+query count the change from the baseline is logged, with the relative
+change in percent. Exits with code 1 when a p95 grew by more than
+``--threshold`` percent or queries per request went up, so it can gate CI.
+
+Usage (from backend/):
+    python -m scripts.benchmarks.compare results/main.json results/branch.json
+"""
+
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import Any
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger(__name__)
+
+METRICS = ("p50_ms", "p95_ms", "p99_ms", "ops_per_second", "queries_per_request")
+
+
+def _load(path: Path) -> dict[str, Any]:
+    document: dict[str, Any] = json.loads(path.read_text())
+    return document
+
+
+def _change(old: float | None, new: float | None) -> str:
+    if old is None or new is None:
+        return f"{old} -> {new}"
+    percent = f" ({(new - old) / old * 100:+.1f}%)" if old else ""
+    return f"{old} -> {new}{percent}"
+
+
+def compare(
+    baseline: dict[str, Any], candidate: dict[str, Any], threshold: float
+) -> list[str]:
+    """
+    Log the differences between two result documents.
+
+    Returns:
+        Descriptions of regressions (p95 over threshold, more queries)
+    """
+    old_results = {result["name"]: result for result in baseline["results"]}
+    regressions = []
+    for result in candidate["results"]:
+        name = result["name"]
+        old = old_results.get(name)
+        if old is None:
+            logger.info("%s: new", name)
+            continue
+        changes = [
+            f"{metric} {_change(old.get(metric), result.get(metric))}"
+            for metric in METRICS
+            if metric in result or metric in old
+        ]
+        logger.info("%s: %s", name, ", ".join(changes))
+
+        old_p95, new_p95 = old.get("p95_ms"), result.get("p95_ms")
+        if old_p95 and new_p95 and (new_p95 - old_p95) / old_p95 * 100 > threshold:
+            regressions.append(f"{name}: p95 {_change(old_p95, new_p95)}")
+        old_queries = old.get("queries_per_request")
+        new_queries = result.get("queries_per_request")
+        if old_queries is not None and new_queries is not None and new_queries > old_queries:
+            regressions.append(f"{name}: queries {_change(old_queries, new_queries)}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("candidate", type=Path)
+    parser.add_argument(
+        "--threshold", type=float, default=10.0, help="Allowed p95 growth, percent"
+    )
+    args = parser.parse_args()
+
+    baseline, candidate = _load(args.baseline), _load(args.candidate)
+    logger.info(
+        "%s %s -> %s",
+        candidate["benchmark"],
+        baseline["revision"]["commit"],
+        candidate["revision"]["commit"],
+    )
+    regressions = compare(baseline, candidate, args.threshold)
+    for regression in regressions:
+        logger.warning("Regression: %s", regression)
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
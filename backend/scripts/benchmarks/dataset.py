@@ -0,0 +1,230 @@
+"""
+Seed a large synthetic dataset for load tests.
+
+Builds on the development seeders (scripts/seed_data): their positions,
+categories, news texts, persons and fixture files, repeated with a running
+number until the requested counts are reached. Every fixture image is
+normalized once (on a process pool) and its JPEG stored again for each image
+row, so image-heavy datasets do not spend their time in Pillow; rows are
+inserted in bulk with the seeders' helpers.
+
+Rows are added to whatever is in the database; use a throwaway database.
+
+Usage (from backend/, migrated database with the first superuser):
+    python -m scripts.benchmarks.dataset --news 5000 --persons 1000 --documents 2000
+"""
+
+import argparse
+import logging
+import random
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from sqlmodel import Session
+
+from app.core.db import engine
+from app.models import News, NewsImage, Person, PersonImage
+from app.services.image_service import image_service
+from scripts.seed_data.constants import TEST_IMAGE_FILES
+from scripts.seed_data.seeders.documents import (
+    create_test_categories,
+    document_fixtures,
+    document_row,
+    get_superuser,
+)
+from scripts.seed_data.seeders.news import NEWS_DATA
+from scripts.seed_data.seeders.persons import TEST_PERSONS
+from scripts.seed_data.seeders.positions import create_test_positions
+from scripts.seed_data.utils.bulk import bulk_insert, put_files
+from scripts.seed_data.utils.image_handler import PreparedImage, prepare_images
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 5000
+
+# Pending uploads: (local file, storage key, content type)
+Uploads = list[tuple[Path, str, str]]
+
+
+def _image_fields(image: PreparedImage, key: str, uploads: Uploads) -> dict[str, object]:
+    uploads.append((image.path, key, image_service.OUTPUT_MIME_TYPE))
+    return {
+        "file_name": image.file_name,
+        "file_path": key,
+        "file_size": image.processed.file_size,
+        "mime_type": image_service.OUTPUT_MIME_TYPE,
+        "width": image.processed.width,
+        "height": image.processed.height,
+        "placeholder": image.processed.placeholder,
+    }
+
+
+def _flush(session: Session, uploads: Uploads, *batches: list) -> None:
+    """Upload files, insert the batches in order and commit."""
+    put_files(uploads)
+    for batch in batches:
+        bulk_insert(session, batch)
+    session.commit()
+    uploads.clear()
+    for batch in batches:
+        batch.clear()
+
+
+def seed_news(
+    session: Session,
+    owner_id: uuid.UUID,
+    count: int,
+    images_per_news: int,
+    fixtures: list[PreparedImage],
+) -> int:
+    """Add news spread over the last two years; every 5th is unpublished."""
+    now = datetime.now(timezone.utc)
+    news: list[News] = []
+    images: list[NewsImage] = []
+    uploads: Uploads = []
+    image_count = 0
+    for i in range(count):
+        data = NEWS_DATA[i % len(NEWS_DATA)]
+        created = now - timedelta(minutes=i * 97)
+        published = i % 5 != 0
+        item = News(
+            title=f"{data['title']} #{i + 1}"[:255],
+            content=data["content"],
+            is_published=published,
+            owner_id=owner_id,
+            published_at=created if published else None,
+            created_at=created,
+            updated_at=created,
+        )
+        news.append(item)
+        for order in range(random.randint(0, images_per_news) if fixtures else 0):
+            key = f"news/{item.id}/{uuid.uuid4()}.jpg"
+            images.append(
+                NewsImage(
+                    news_id=item.id,
+                    order=order,
+                    is_main=order == 0,
+                    created_at=created,
+                    **_image_fields(random.choice(fixtures), key, uploads),
+                )
+            )
+            image_count += 1
+        if (i + 1) % BATCH_SIZE == 0:
+            _flush(session, uploads, news, images)
+            logger.info("News: %d/%d", i + 1, count)
+    _flush(session, uploads, news, images)
+    return image_count
+
+
+def seed_persons(
+    session: Session,
+    count: int,
+    image_probability: float,
+    fixtures: list[PreparedImage],
+) -> int:
+    """Add persons with unique names, phones and emails, some with a photo."""
+    positions = create_test_positions(session)
+    run = uuid.uuid4().hex[:8]
+    persons: list[Person] = []
+    images: list[PersonImage] = []
+    uploads: Uploads = []
+    image_count = 0
+    for i in range(count):
+        data = TEST_PERSONS[i % len(TEST_PERSONS)]
+        local_part, domain = data["email"].split("@")
+        person = Person(
+            # Full names are unique
+            last_name=f"{data['last_name']} {run}-{i + 1}",
+            first_name=data["first_name"],
+            middle_name=data["middle_name"],
+            phone=f"+7 ({run[:3]}) {run[3:]}-{i:07d}",
+            email=f"{local_part}.{run}.{i}@{domain}",
+            description=data["description"],
+            position_id=positions[data["position"]].id,
+        )
+        persons.append(person)
+        if fixtures and random.random() < image_probability:
+            key = f"persons/{person.id}/{uuid.uuid4()}.jpg"
+            images.append(
+                PersonImage(
+                    person_id=person.id,
+                    **_image_fields(random.choice(fixtures), key, uploads),
+                )
+            )
+            image_count += 1
+        if (i + 1) % BATCH_SIZE == 0:
+            _flush(session, uploads, persons, images)
+            logger.info("Persons: %d/%d", i + 1, count)
+    _flush(session, uploads, persons, images)
+    return image_count
+
+
+def seed_documents(session: Session, owner_id: uuid.UUID, count: int) -> None:
+    """Add documents cycling through the fixture files, mostly categorized."""
+    categories = create_test_categories(session)
+    fixtures = document_fixtures()
+    if not fixtures:
+        logger.warning("No document fixtures found")
+        return
+    documents = []
+    uploads: Uploads = []
+    for i in range(count):
+        fixture = fixtures[i % len(fixtures)]
+        row = document_row(
+            fixture,
+            owner_id,
+            name=f"Benchmark document {i + 1} ({fixture.path.suffix[1:]})",
+            category_id=random.choice(categories).id
+            if categories and random.random() < 0.7
+            else None,
+        )
+        documents.append(row)
+        uploads.append((fixture.path, row.file_path, row.mime_type))
+        if (i + 1) % BATCH_SIZE == 0:
+            _flush(session, uploads, documents)
+            logger.info("Documents: %d/%d", i + 1, count)
+    _flush(session, uploads, documents)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--news", type=int, default=5000)
+    parser.add_argument("--images-per-news", type=int, default=3)
+    parser.add_argument("--persons", type=int, default=1000)
+    parser.add_argument("--person-image-probability", type=float, default=0.5)
+    parser.add_argument("--documents", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    started = time.perf_counter()
+    with Session(engine) as session, tempfile.TemporaryDirectory() as temp_dir:
+        superuser = get_superuser(session)
+        if superuser is None:
+            raise SystemExit("First superuser not found; run scripts/prestart.sh")
+        fixtures = prepare_images(TEST_IMAGE_FILES, Path(temp_dir))
+        news_images = seed_news(
+            session, superuser.id, args.news, args.images_per_news, fixtures
+        )
+        person_images = seed_persons(
+            session, args.persons, args.person_image_probability, fixtures
+        )
+        seed_documents(session, superuser.id, args.documents)
+
+    logger.info(
+        "Seeded %d news (%d images), %d persons (%d images), %d documents in %.1fs",
+        args.news,
+        news_images,
+        args.persons,
+        person_images,
+        args.documents,
+        time.perf_counter() - started,
+    )
+
+
+if __name__ == "__main__":
+    main()
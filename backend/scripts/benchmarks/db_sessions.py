@@ -0,0 +1,112 @@
+"""
+Benchmark: sync SessionDep vs async AsyncSessionDep under concurrent load.
+
+Simulates N concurrent requests whose handler runs one query that waits on
+PostgreSQL (``pg_sleep``). The sync path goes through the threadpool exactly
+like a plain ``def`` route in FastAPI; the async path awaits on the event loop.
+Both paths get pools of the same size, so the difference comes only from
+threadpool slots (40 by default in AnyIO) versus coroutines.
+
+Usage (from backend/, database must be reachable):
+    python scripts/benchmarks/db_sessions.py --requests 400 --concurrency 200
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import time
+
+from sqlalchemy import Engine, text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlmodel import Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+QUERY = text("SELECT pg_sleep(:s)")
+
+
+def _sync_handler(engine: Engine, query_seconds: float) -> None:
+    with Session(engine) as session:
+        session.execute(QUERY, {"s": query_seconds})
+
+
+async def _async_handler(engine: AsyncEngine, query_seconds: float) -> None:
+    async with AsyncSession(engine) as session:
+        await session.execute(QUERY, {"s": query_seconds})
+
+
+async def _run(
+    name: str,
+    engines: tuple[Engine, AsyncEngine],
+    total: int,
+    concurrency: int,
+    query_seconds: float,
+) -> dict[str, float | int | str]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def one() -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            if name == "sync":
+                await run_in_threadpool(_sync_handler, engines[0], query_seconds)
+            else:
+                await _async_handler(engines[1], query_seconds)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "path": name,
+        "requests": total,
+        "concurrency": concurrency,
+        "rps": round(total / elapsed, 1),
+        "p50_ms": round(quantiles[49] * 1000, 2),
+        "p95_ms": round(quantiles[94] * 1000, 2),
+        "p99_ms": round(quantiles[98] * 1000, 2),
+    }
+
+
+async def _main(args: argparse.Namespace) -> None:
+    url = str(settings.SQLALCHEMY_DATABASE_URI)
+    engines = (
+        create_engine(url, pool_size=args.pool_size, max_overflow=0),
+        create_async_engine(url, pool_size=args.pool_size, max_overflow=0),
+    )
+    # Warm up both pools
+    await _run("sync", engines, args.pool_size, args.pool_size, 0)
+    await _run("async", engines, args.pool_size, args.pool_size, 0)
+
+    results = [
+        await _run(path, engines, args.requests, args.concurrency, args.query_ms / 1000)
+        for path in ("sync", "async")
+    ]
+    for result in results:
+        logger.info(json.dumps(result))
+    engines[0].dispose()
+    await engines[1].dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--query-ms", type=float, default=20)
+    parser.add_argument("--pool-size", type=int, default=100)
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
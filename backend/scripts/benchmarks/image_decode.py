@@ -0,0 +1,131 @@
+"""
+Benchmark: news image normalization, full decode vs draft/reduce decoding.
+
+Both paths turn one large source photo into the stored 1920x1080 JPEG:
+
+* ``full``: what ImageService did before - decode every source pixel, then
+  LANCZOS-resample the full-resolution image down to the target size.
+* ``draft``: ``ImageService.normalize_image`` - JPEG ``draft()`` decodes at a
+  power-of-two scale above the target, ``reduce()`` handles the rest of the
+  integer factor, LANCZOS only does the final step.
+
+Each path runs in a fresh process. Memory is the peak resident set size
+growth over the RSS right before the runs; the kernel's peak counter is reset
+first through ``/proc/self/clear_refs``, so this needs Linux.
+
+Usage (from backend/):
+    python scripts/benchmarks/image_decode.py --width 6000 --height 4000
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from PIL import Image
+
+from app.services.image_service import ImageService
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _make_source(path: Path, width: int, height: int) -> None:
+    """Write a photo-like JPEG: smooth gradients plus noise, like a camera shot."""
+    gradient = Image.linear_gradient("L").resize((width, height))
+    noise = Image.effect_noise((width, height), 40)
+    Image.merge("RGB", (gradient, noise, gradient.transpose(Image.Transpose.ROTATE_180))).save(
+        path, "JPEG", quality=92
+    )
+
+
+def _full_decode(source: Path, target: Path) -> None:
+    with Image.open(source) as img:
+        img = img.convert("RGB")
+        ratio = min(
+            ImageService.MAX_WIDTH / img.width, ImageService.MAX_HEIGHT / img.height
+        )
+        new_size = (int(img.width * ratio), int(img.height * ratio))
+        img = img.resize(new_size, Image.Resampling.LANCZOS)
+        img.save(target, "JPEG", quality=ImageService.RESIZED_QUALITY, optimize=True)
+
+
+def _draft_decode(source: Path, target: Path) -> None:
+    ImageService.normalize_image(source, target)
+
+
+_PATHS = {"full": _full_decode, "draft": _draft_decode}
+
+
+def _status_kb(field: str) -> int:
+    """Read a memory field (VmRSS, VmHWM) of /proc/self/status in kB."""
+    for line in Path("/proc/self/status").read_text().splitlines():
+        if line.startswith(f"{field}:"):
+            return int(line.split()[1])
+    raise KeyError(field)
+
+
+def _run(name: str, source: str, repeat: int, queue: Any) -> None:
+    func = _PATHS[name]
+    target = Path(source).with_name(f"{name}.jpg")
+    # Reset VmHWM (peak RSS) to the current RSS
+    Path("/proc/self/clear_refs").write_text("5")
+    baseline_kb = _status_kb("VmRSS")
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(Path(source), target)
+        timings.append(time.perf_counter() - started)
+    peak_kb = _status_kb("VmHWM")
+    with Image.open(target) as img:
+        size = img.size
+    queue.put(
+        {
+            "path": name,
+            "runs": repeat,
+            "output_size": list(size),
+            "median_ms": round(statistics.median(timings) * 1000, 1),
+            "min_ms": round(min(timings) * 1000, 1),
+            "peak_rss_growth_mb": round((peak_kb - baseline_kb) / 1024, 1),
+        }
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--width", type=int, default=6000)
+    parser.add_argument("--height", type=int, default=4000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    ctx = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / "source.jpg"
+        _make_source(source, args.width, args.height)
+        results = []
+        for name in _PATHS:
+            queue = ctx.Queue()
+            process = ctx.Process(
+                target=_run, args=(name, str(source), args.repeat, queue)
+            )
+            process.start()
+            results.append(queue.get())
+            process.join()
+
+    full, draft = results
+    draft["speedup"] = round(full["median_ms"] / draft["median_ms"], 2)
+    if draft["peak_rss_growth_mb"]:
+        draft["memory_reduction"] = round(
+            full["peak_rss_growth_mb"] / draft["peak_rss_growth_mb"], 2
+        )
+    for result in results:
+        logger.info(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+HTTP load test of the public and admin API endpoints.
+
+Each scenario sends ``--requests`` GET requests to a running API from
+``--concurrency`` concurrent clients (closed loop: a client sends its next
+request when the previous one completes), after a short warm-up. Queries
+per request and database time come from the Server-Timing header the API
+adds outside production; they are null against a production build.
+
+Admin scenarios log in as the first superuser (one login, within the login
+rate limit). Detail scenarios spread their requests over ids taken from the
+public lists, so seed a dataset first (scripts.benchmarks.dataset).
+
+Usage (from backend/, API running):
+    python -m scripts.benchmarks.load --base-url http://localhost:8000 \\
+        --concurrency 32 --requests 2000 --output results/load.json
+"""
+
+import argparse
+import asyncio
+import itertools
+import logging
+import re
+import statistics
+import time
+from collections import Counter
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from app.core.config import settings
+from scripts.benchmarks.results import summarize, write_results
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+# One INFO line per request otherwise
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+API = settings.API_V1_STR
+_DB_TIMING = re.compile(r'db;dur=([\d.]+);desc="(\d+) queries"')
+
+
+@dataclass
+class Scenario:
+    """Endpoint to load; ``{news_id}``/``{document_id}`` take sample ids."""
+
+    name: str
+    path: str
+    admin: bool = False
+
+
+SCENARIOS = [
+    Scenario("public_news_list", f"{API}/news/public?limit=10"),
+    Scenario("public_news_page_50", f"{API}/news/public?skip=50&limit=10"),
+    Scenario("public_news_detail", f"{API}/news/public/{{news_id}}"),
+    Scenario("public_persons", f"{API}/persons/public"),
+    Scenario("public_documents", f"{API}/documents/public"),
+    Scenario("public_document_categories", f"{API}/documents/public/categories"),
+    Scenario("public_document_signature", f"{API}/documents/{{document_id}}/signature"),
+    Scenario("public_organization_card", f"{API}/organization-card/public"),
+    Scenario("admin_news_list", f"{API}/news/?limit=100", admin=True),
+    Scenario("admin_news_detail", f"{API}/news/{{news_id}}", admin=True),
+    Scenario("admin_persons", f"{API}/persons/", admin=True),
+    Scenario("admin_documents", f"{API}/documents/", admin=True),
+    Scenario("admin_users", f"{API}/users/", admin=True),
+]
+
+
+@dataclass
+class _Run:
+    latencies: list[float] = field(default_factory=list)
+    statuses: Counter[int] = field(default_factory=Counter)
+    queries: list[int] = field(default_factory=list)
+    db_ms: list[float] = field(default_factory=list)
+
+
+async def _login(client: httpx.AsyncClient, username: str, password: str) -> str:
+    response = await client.post(
+        f"{API}/auth/access-token",
+        data={"username": username, "password": password},
+    )
+    response.raise_for_status()
+    return str(response.json()["access_token"])
+
+
+async def _sample_ids(client: httpx.AsyncClient, path: str) -> list[str]:
+    response = await client.get(path)
+    response.raise_for_status()
+    return [item["id"] for item in response.json()["data"]]
+
+
+async def _run_scenario(
+    client: httpx.AsyncClient,
+    urls: Iterator[str],
+    headers: dict[str, str],
+    total: int,
+    concurrency: int,
+) -> tuple[_Run, float]:
+    run = _Run()
+    remaining = total
+
+    async def worker() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            url = next(urls)
+            started = time.perf_counter()
+            response = await client.get(url, headers=headers)
+            await response.aread()
+            run.latencies.append(time.perf_counter() - started)
+            run.statuses[response.status_code] += 1
+            timing = _DB_TIMING.search(response.headers.get("server-timing", ""))
+            if timing:
+                run.db_ms.append(float(timing.group(1)))
+                run.queries.append(int(timing.group(2)))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return run, time.perf_counter() - started
+
+
+def _urls(scenario: Scenario, ids: dict[str, list[str]]) -> list[str] | None:
+    for placeholder, values in ids.items():
+        if f"{{{placeholder}}}" in scenario.path:
+            if not values:
+                return None
+            return [scenario.path.replace(f"{{{placeholder}}}", value) for value in values]
+    return [scenario.path]
+
+
+async def run(args: argparse.Namespace) -> list[dict[str, Any]]:
+    limits = httpx.Limits(
+        max_connections=args.concurrency, max_keepalive_connections=args.concurrency
+    )
+    selected = [
+        scenario
+        for scenario in SCENARIOS
+        if not args.scenarios or scenario.name in args.scenarios
+    ]
+    async with httpx.AsyncClient(
+        base_url=args.base_url, limits=limits, timeout=args.timeout
+    ) as client:
+        ids = {
+            "news_id": await _sample_ids(client, f"{API}/news/public?limit=100"),
+            "document_id": await _sample_ids(client, f"{API}/documents/public?limit=100"),
+        }
+        admin_headers = {}
+        if any(scenario.admin for scenario in selected):
+            token = await _login(client, args.username, args.password)
+            admin_headers = {"Authorization": f"Bearer {token}"}
+
+        results = []
+        for scenario in selected:
+            urls = _urls(scenario, ids)
+            if urls is None:
+                logger.warning("Skipping %s: no sample ids", scenario.name)
+                continue
+            headers = admin_headers if scenario.admin else {}
+            await _run_scenario(
+                client,
+                itertools.cycle(urls),
+                headers,
+                args.warmup,
+                args.concurrency,
+            )
+            measured, elapsed = await _run_scenario(
+                client,
+                itertools.cycle(urls),
+                headers,
+                args.requests,
+                args.concurrency,
+            )
+            errors = sum(
+                count for status, count in measured.statuses.items() if status >= 400
+            )
+            results.append(
+                {
+                    "name": scenario.name,
+                    "path": scenario.path,
+                    "concurrency": args.concurrency,
+                    **summarize(measured.latencies, elapsed),
+                    "errors": errors,
+                    "statuses": {
+                        str(status): count
+                        for status, count in sorted(measured.statuses.items())
+                    },
+                    "queries_per_request": round(statistics.fmean(measured.queries), 2)
+                    if measured.queries
+                    else None,
+                    "db_ms_per_request": round(statistics.fmean(measured.db_ms), 3)
+                    if measured.db_ms
+                    else None,
+                }
+            )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument(
+        "--scenarios",
+        nargs="*",
+        choices=[scenario.name for scenario in SCENARIOS],
+        help="Scenarios to run (default: all)",
+    )
+    parser.add_argument("--username", default=settings.FIRST_SUPERUSER)
+    parser.add_argument("--password", default=settings.FIRST_SUPERUSER_PASSWORD)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    params = {
+        key: value
+        for key, value in vars(args).items()
+        if key not in {"password", "output"}
+    }
+    write_results("load", params, results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Micro-benchmarks of CPU-heavy code paths behind the API.
+
+* ``save_image``: ``ImageService.save_image`` on a photo-like JPEG upload of
+  ``--width`` x ``--height``: type sniffing, normalization and storing the
+  JPEG in the configured upload storage (deleted after each run)
+* ``signature_info``: ``DocumentService.get_signature_info`` on the fixture
+  PDF, put into upload storage for the run
+* ``serialize_news_pydantic`` / ``serialize_news_fast``: one news list page
+  turned into response bytes, see serialization.py
+
+No database is needed.
+
+Usage (from backend/):
+    python -m scripts.benchmarks.micro --repeat 50 --output results/micro.json
+"""
+
+import argparse
+import io
+import logging
+import tempfile
+import time
+import uuid
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from starlette.datastructures import Headers, UploadFile
+
+from app.core.storage import storage
+from app.services.document_service import DocumentService
+from app.services.image_service import ImageService
+from scripts.benchmarks.image_decode import _make_source
+from scripts.benchmarks.results import summarize, write_results
+from scripts.benchmarks.serialization import (
+    _fast_path,
+    _make_data,
+    _pydantic_path,
+    _rows,
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+FIXTURE_PDF = Path(__file__).parent.parent / "seed_data" / "fixtures" / "documents" / "test1.pdf"
+
+
+def _measure(
+    name: str, func: Callable[[], object], repeat: int, warmup: int = 1
+) -> dict[str, Any]:
+    for _ in range(warmup):
+        func()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return {"name": name, **summarize(timings)}
+
+
+def bench_save_image(width: int, height: int, repeat: int) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        source = Path(temp_dir) / "photo.jpg"
+        _make_source(source, width, height)
+        data = source.read_bytes()
+
+    def save() -> None:
+        upload = UploadFile(
+            io.BytesIO(data),
+            filename="photo.jpg",
+            headers=Headers({"content-type": "image/jpeg"}),
+        )
+        key, _ = ImageService.save_image(upload, uuid.uuid4())
+        storage.delete(key)
+
+    result = _measure("save_image", save, repeat)
+    result["source"] = {"width": width, "height": height, "bytes": len(data)}
+    return result
+
+
+def bench_signature_info(repeat: int) -> dict[str, Any]:
+    key = f"benchmarks/{uuid.uuid4()}.pdf"
+    storage.put_file(key, FIXTURE_PDF, content_type="application/pdf")
+    try:
+        return _measure(
+            "signature_info", lambda: DocumentService.get_signature_info(key), repeat
+        )
+    finally:
+        storage.delete(key)
+
+
+def bench_serialization(
+    page_size: int, images: int, repeat: int
+) -> list[dict[str, Any]]:
+    data = _make_data(page_size, images)
+    rows = _rows(*data)
+    results = [
+        _measure("serialize_news_pydantic", lambda: _pydantic_path(*data), repeat),
+        _measure("serialize_news_fast", lambda: _fast_path(*rows), repeat),
+    ]
+    for result in results:
+        result["page_size"] = page_size
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--width", type=int, default=4000)
+    parser.add_argument("--height", type=int, default=3000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--images", type=int, default=3)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    results = [
+        bench_save_image(args.width, args.height, args.repeat),
+        bench_signature_info(args.repeat),
+        *bench_serialization(args.page_size, args.images, args.repeat),
+    ]
+    params = {key: value for key, value in vars(args).items() if key != "output"}
+    write_results("micro", params, results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Latency summaries and JSON result files shared by the benchmark suite."""
+
+import json
+import logging
+import platform
+import statistics
+import subprocess
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+def summarize(timings: list[float], elapsed: float | None = None) -> dict[str, Any]:
+    """
+    Latency percentiles of a run, in milliseconds.
+
+    Args:
+        timings: Duration of every operation, in seconds
+        elapsed: Wall time of the whole run, for throughput; defaults to the
+            sum of timings (sequential runs)
+
+    Returns:
+        Dict with runs, p50/p95/p99/max/mean in ms and operations per second
+    """
+    if not timings:
+        return {"runs": 0}
+    ordered = sorted(timings)
+    # quantiles() needs two points; a single run is every percentile
+    cuts = (
+        statistics.quantiles(ordered, n=100, method="inclusive")
+        if len(ordered) > 1
+        else ordered * 99
+    )
+    total = elapsed if elapsed is not None else sum(ordered)
+    return {
+        "runs": len(ordered),
+        "p50_ms": round(cuts[49] * 1000, 3),
+        "p95_ms": round(cuts[94] * 1000, 3),
+        "p99_ms": round(cuts[98] * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "ops_per_second": round(len(ordered) / total, 1) if total else None,
+    }
+
+
+def git_revision() -> dict[str, Any]:
+    """Commit of the working tree, and whether it has uncommitted changes."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+    return {"commit": commit, "dirty": bool(status.strip())}
+
+
+def write_results(
+    benchmark: str,
+    params: dict[str, Any],
+    results: list[dict[str, Any]],
+    output: Path | None,
+) -> dict[str, Any]:
+    """
+    Log results and write them, with the commit and environment, as JSON.
+
+    Every result needs a unique ``name``; compare.py matches results of two
+    files by it.
+
+    Args:
+        benchmark: Suite module that produced the results
+        params: Command line options of the run
+        results: One dict per measured scenario
+        output: JSON file to write; only logged when None
+
+    Returns:
+        The document written
+    """
+    document = {
+        "benchmark": benchmark,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "params": params,
+        "results": results,
+    }
+    for result in results:
+        logger.info(json.dumps(result, ensure_ascii=False))
+    if output is not None:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(document, indent=2, ensure_ascii=False) + "\n")
+        logger.info("Results written to %s", output)
+    return document
@@ -0,0 +1,194 @@
+"""
+Benchmark: news list page serialization, pydantic path vs FastJSONResponse.
+
+Both paths start from data as it comes out of the database for one page
+(``--page-size`` news, ``--images`` images each) and end with response bytes:
+
+* ``pydantic``: what the news list routes did before - ORM objects converted via
+  ``model_dump()``/``model_validate()`` into NewsPublic, then FastAPI validates
+  and serializes the result against ``response_model`` and renders JSONResponse.
+* ``fast``: column rows assembled into dicts and encoded with orjson.
+
+No database is needed; only CPU time spent after the queries is measured.
+
+Usage (from backend/):
+    python scripts/benchmarks/serialization.py --page-size 100 --images 3
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import time
+import uuid
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.api.responses import FastJSONResponse
+from app.api.routes.news import _news_list_payload
+from app.models import News, NewsImage, User
+from app.schemas import NewsImagePublic, NewsPublic, NewsPublicList, UserPublic
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+_RESPONSE_FIELD = create_model_field(
+    name="Response_read_news", type_=NewsPublicList, mode="serialization"
+)
+_LOOP = asyncio.new_event_loop()
+
+
+def _make_data(
+    page_size: int, images_per_news: int
+) -> tuple[list[News], dict[uuid.UUID, User], dict[uuid.UUID, list[NewsImage]]]:
+    now = datetime(2026, 1, 1, 12, 0, 0, 123456)
+    owner = User(
+        id=uuid.uuid4(),
+        email="editor@example.com",
+        nickname="editor",
+        hashed_password="x",
+    )
+    news_list = []
+    images: dict[uuid.UUID, list[NewsImage]] = {}
+    for i in range(page_size):
+        created = now - timedelta(hours=i)
+        news = News(
+            id=uuid.uuid4(),
+            title=f"News title {i}",
+            content="Lorem ipsum dolor sit amet. " * 40,
+            is_published=True,
+            owner_id=owner.id,
+            published_at=created,
+            created_at=created,
+            updated_at=created,
+        )
+        news_list.append(news)
+        images[news.id] = [
+            NewsImage(
+                id=uuid.uuid4(),
+                news_id=news.id,
+                file_name=f"image_{j}.jpg",
+                file_path=f"news/{news.id}/image_{j}.jpg",
+                file_size=123_456,
+                mime_type="image/jpeg",
+                order=j,
+                is_main=j == 0,
+                created_at=created,
+            )
+            for j in range(images_per_news)
+        ]
+    return news_list, {owner.id: owner}, images
+
+
+def _pydantic_path(
+    news_list: list[News],
+    owners: dict[uuid.UUID, User],
+    images: dict[uuid.UUID, list[NewsImage]],
+) -> bytes:
+    data = []
+    for news_item in news_list:
+        owner_dict = owners[news_item.owner_id].model_dump()
+        owner_dict["is_first_superuser"] = False
+        item_images = images[news_item.id]
+        data.append(
+            NewsPublic(
+                id=news_item.id,
+                title=news_item.title,
+                content=news_item.content,
+                is_published=news_item.is_published,
+                owner_id=news_item.owner_id,
+                owner=UserPublic.model_validate(owner_dict),
+                published_at=news_item.published_at,
+                created_at=news_item.created_at,
+                updated_at=news_item.updated_at,
+                images=[
+                    NewsImagePublic.model_validate(img.model_dump())
+                    for img in item_images
+                ]
+                or None,
+            )
+        )
+    content = _LOOP.run_until_complete(
+        serialize_response(
+            field=_RESPONSE_FIELD,
+            response_content=NewsPublicList(data=data, count=len(data)),
+        )
+    )
+    return JSONResponse(content).body
+
+
+def _fast_path(
+    news_rows: list[dict[str, Any]],
+    owner_rows: list[dict[str, Any]],
+    image_rows: list[dict[str, Any]],
+) -> bytes:
+    # Routes get fresh dicts from every query; copy to keep runs independent
+    payload = _news_list_payload(
+        [dict(row) for row in news_rows],
+        [dict(row) for row in owner_rows],
+        [dict(row) for row in image_rows],
+        len(news_rows),
+    )
+    return FastJSONResponse(payload).body
+
+
+def _rows(
+    news_list: list[News],
+    owners: dict[uuid.UUID, User],
+    images: dict[uuid.UUID, list[NewsImage]],
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]], list[dict[str, Any]]]:
+    news_rows = [news.model_dump(exclude={"owner", "images"}) for news in news_list]
+    owner_rows = [
+        owner.model_dump(exclude={"hashed_password", "news"})
+        for owner in owners.values()
+    ]
+    image_rows = [
+        image.model_dump(exclude={"news"})
+        for item_images in images.values()
+        for image in item_images
+    ]
+    return news_rows, owner_rows, image_rows
+
+
+def _measure(name: str, func: Callable[[], bytes], repeat: int) -> dict[str, Any]:
+    body = func()  # warm up
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return {
+        "path": name,
+        "runs": repeat,
+        "bytes": len(body),
+        "median_ms": round(statistics.median(timings) * 1000, 3),
+        "min_ms": round(min(timings) * 1000, 3),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--images", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    data = _make_data(args.page_size, args.images)
+    rows = _rows(*data)
+    results = [
+        _measure("pydantic", lambda: _pydantic_path(*data), args.repeat),
+        _measure("fast", lambda: _fast_path(*rows), args.repeat),
+    ]
+    results[1]["speedup"] = round(results[0]["median_ms"] / results[1]["median_ms"], 2)
+    for result in results:
+        logger.info(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
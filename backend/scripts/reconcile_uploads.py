@@ -0,0 +1,51 @@
+"""
+Remove upload files that no database row references.
+
+Walks upload storage (news/, persons/, documents/), checks every file older than
+--min-age-seconds against NewsImage, PersonImage and Document paths and
+deletes the orphans. The API runs the same reconciliation every
+UPLOAD_RECONCILE_INTERVAL_SECONDS; this script is for one-off runs.
+
+Usage (from backend/):
+    python scripts/reconcile_uploads.py --dry-run
+"""
+
+import argparse
+import dataclasses
+import json
+import logging
+
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.db import engine
+from app.services.file_cleanup_service import file_cleanup_service
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--min-age-seconds",
+        type=float,
+        default=settings.UPLOAD_ORPHAN_MIN_AGE_SECONDS,
+        help="Skip files modified more recently (uploads in progress)",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Report orphans without deleting"
+    )
+    args = parser.parse_args()
+
+    with Session(engine) as session:
+        result = file_cleanup_service.reconcile_orphans(
+            session=session,
+            min_age_seconds=args.min_age_seconds,
+            dry_run=args.dry_run,
+        )
+    logger.info(json.dumps({"dry_run": args.dry_run, **dataclasses.asdict(result)}))
+
+
+if __name__ == "__main__":
+    main()
@@ -8,7 +8,9 @@ This module orchestrates the creation of all test data:
 - Test news with images
 - Test documents with categories
 
-Only called in development mode (ENVIRONMENT=local).
+Called by init_db in development mode (ENVIRONMENT=local). Staging databases
+can be filled with a multiple of the test data:
+    python -m scripts.seed_data --scale 6667  # ~100k news
 """
 
 import logging
@@ -26,7 +28,7 @@ from .seeders.users import create_test_users
 logger = logging.getLogger(__name__)
 
 
-def create_test_users_and_news(session: Session) -> None:
+def create_test_users_and_news(session: Session, scale: int = 1) -> None:
     """
     Creates all test data for development mode.
 
@@ -37,13 +39,15 @@ def create_test_users_and_news(session: Session) -> None:
     - Test news with images
     - Test documents with categories
 
-    Only called in development mode (ENVIRONMENT=local).
+    Args:
+        session: Database session
+        scale: Copies of the test persons, news and documents to create
     """
-    if settings.ENVIRONMENT != "local":
-        logger.info("Seed data is disabled outside local environment")
+    if settings.ENVIRONMENT == "production":
+        logger.info("Seed data is disabled in production")
         return
 
-    logger.info("Starting seed data creation...")
+    logger.info(f"Starting seed data creation (scale {scale})...")
 
     # Create test users
     logger.info("Creating test users...")
@@ -55,14 +59,14 @@ def create_test_users_and_news(session: Session) -> None:
 
     # Create test persons
     logger.info("Creating test persons...")
-    create_test_persons(session)
+    create_test_persons(session, scale=scale)
 
     # Create test news
     logger.info("Creating test news...")
-    create_test_news(session)
+    create_test_news(session, scale=scale)
 
     # Create test documents
     logger.info("Creating test documents...")
-    create_test_documents(session)
+    create_test_documents(session, scale=scale)
 
     logger.info("Seed data creation completed successfully")
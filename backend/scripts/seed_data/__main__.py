@@ -0,0 +1,41 @@
+"""
+Seed test data from the command line.
+
+Usage (from backend/, migrated database with the first superuser):
+    python -m scripts.seed_data --scale 100
+"""
+
+import argparse
+import logging
+import time
+
+from sqlmodel import Session
+
+from app.core.db import engine
+
+from . import create_test_users_and_news
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--scale",
+        type=int,
+        default=1,
+        help="Copies of the test persons, news and documents",
+    )
+    args = parser.parse_args()
+    if args.scale < 1:
+        parser.error("--scale must be at least 1")
+
+    started = time.perf_counter()
+    with Session(engine) as session:
+        create_test_users_and_news(session, scale=args.scale)
+    logger.info(f"Seeded scale {args.scale} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,25 +4,39 @@ Test documents and categories creation.
 
 import logging
 import random
-import shutil
 import uuid
+from collections import defaultdict
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 
-from sqlmodel import Session, select
+from sqlalchemy import update
+from sqlmodel import Session, col, select
 
 from app.core.config import settings
-from app.models import Document, DocumentCategory, User
-from app.services.document_service import document_service
+from app.core.sniffing import EXTENSIONS, sniff_file
+from app.models import DOCUMENT_THUMBNAIL_PENDING, Document, DocumentCategory, User
+from app.services.document_thumbnail_service import document_thumbnail_service
 
-from ..constants import MIME_TYPE_MAP, TEST_DOCUMENT_CATEGORIES
+from ..constants import TEST_DOCUMENT_CATEGORIES
+from ..utils.bulk import bulk_insert, put_files
 
 logger = logging.getLogger(__name__)
 
+DOCUMENTS_DIR = Path(__file__).parent.parent / "fixtures" / "documents"
+
 # Constants for document creation
 CATEGORY_ASSIGNMENT_PROBABILITY = 0.7  # Probability of assigning a category to a document
 
 
+@dataclass
+class DocumentFixture:
+    """Fixture document file accepted by the upload checks."""
+
+    path: Path
+    mime_type: str
+
+
 def get_superuser(session: Session) -> User | None:
     """Gets the superuser."""
     return session.exec(
@@ -31,98 +45,93 @@ def get_superuser(session: Session) -> User | None:
 
 
 def create_test_categories(session: Session) -> list[DocumentCategory]:
-    """Creates test document categories."""
-    created_categories = []
-    for category_name in TEST_DOCUMENT_CATEGORIES:
-        existing_category = session.exec(
-            select(DocumentCategory).where(DocumentCategory.name == category_name)
-        ).first()
-
-        if existing_category:
-            created_categories.append(existing_category)
-            logger.info(f"Category '{category_name}' already exists, skipping")
-        else:
-            category = DocumentCategory(name=category_name)
-            session.add(category)
-            session.commit()
-            session.refresh(category)
-            created_categories.append(category)
-            logger.info(f"Created category: {category_name}")
-
-    return created_categories
-
-
-def get_mime_type(file_ext: str) -> str:
-    """Determines MIME type by file extension."""
-    return MIME_TYPE_MAP.get(file_ext.lower(), "application/octet-stream")
-
-
-def save_document_from_file(
-    session: Session,
-    document_file_name: str,
+    """Creates test document categories and returns all of them."""
+    names = list(TEST_DOCUMENT_CATEGORIES)
+    existing = set(
+        session.exec(
+            select(DocumentCategory.name).where(col(DocumentCategory.name).in_(names))
+        ).all()
+    )
+    created = bulk_insert(
+        session,
+        [DocumentCategory(name=name) for name in names if name not in existing],
+    )
+    session.commit()
+    logger.info(f"Created {created} categories, {len(existing)} already existed")
+
+    return list(
+        session.exec(
+            select(DocumentCategory).where(col(DocumentCategory.name).in_(names))
+        ).all()
+    )
+
+
+def document_fixtures() -> list[DocumentFixture]:
+    """Fixture documents that pass the upload checks, with their sniffed type."""
+    if not DOCUMENTS_DIR.exists():
+        logger.warning(f"Documents directory not found: {DOCUMENTS_DIR}")
+        return []
+
+    fixtures = []
+    for path in sorted(DOCUMENTS_DIR.glob("test*.*")):
+        if path.stat().st_size > settings.MAX_DOCUMENT_SIZE:
+            logger.warning(f"Document {path.name} is too large, skipping")
+            continue
+        mime_type = sniff_file(path)
+        if mime_type is None or mime_type not in settings.ALLOWED_DOCUMENT_TYPES:
+            logger.warning(f"Document {path.name} has unsupported type {mime_type}, skipping")
+            continue
+        fixtures.append(DocumentFixture(path, mime_type))
+    return fixtures
+
+
+def document_row(
+    fixture: DocumentFixture,
     owner_id: uuid.UUID,
-    name: str | None = None,
+    name: str,
     category_id: uuid.UUID | None = None,
-) -> None:
-    """Saves a document from a local file."""
-    try:
-        # Get fixtures directory (two levels up from seeders/)
-        fixtures_dir = Path(__file__).parent.parent / "fixtures"
-        documents_dir = fixtures_dir / "documents"
-        document_path = documents_dir / document_file_name
-
-        if not document_path.exists():
-            logger.warning(f"Document file not found: {document_path}")
-            return
-
-        file_size_check = document_path.stat().st_size
-        if file_size_check > settings.MAX_DOCUMENT_SIZE:
-            logger.warning(f"Document {document_file_name} is too large, skipping")
-            return
-
-        # Copy file to upload directory
-        upload_path = document_service.get_upload_path()
-        unique_id = uuid.uuid4()
-        file_ext = Path(document_file_name).suffix.lower()
-        file_name = f"{unique_id}{file_ext}"
-        file_path = upload_path / file_name
-
-        shutil.copy2(document_path, file_path)
-
-        if not file_path.exists():
-            logger.error(f"Document file was not created: {file_path}")
-            return
-
-        file_size = file_path.stat().st_size
-        relative_path = f"documents/{file_name}"
-        mime_type = get_mime_type(file_ext)
-
-        # Determine document name
-        if not name:
-            name = Path(document_file_name).stem
-
-        document = Document(
-            name=name,
-            file_name=document_file_name,
-            file_path=relative_path,
-            file_size=file_size,
-            mime_type=mime_type,
-            category_id=category_id,
-            owner_id=owner_id,
-            created_at=datetime.now(timezone.utc),
-            updated_at=datetime.now(timezone.utc),
-        )
-        session.add(document)
-        session.flush()
-        logger.info(f"Saved document {document_file_name} for user {owner_id}")
-    except Exception as e:
-        logger.error(f"Failed to save document {document_file_name}: {e}", exc_info=True)
+) -> Document:
+    """
+    Document row for a fixture, with a storage key of its own.
+
+    The file is not copied; put ``(fixture.path, row.file_path,
+    row.mime_type)`` with put_files before committing the row.
+    """
+    now = datetime.now(timezone.utc)
+    document = Document(
+        name=name,
+        file_name=fixture.path.name,
+        file_path=f"documents/{uuid.uuid4()}{EXTENSIONS[fixture.mime_type]}",
+        file_size=fixture.path.stat().st_size,
+        mime_type=fixture.mime_type,
+        category_id=category_id,
+        owner_id=owner_id,
+        created_at=now,
+        updated_at=now,
+    )
+    # Rendered by the API's thumbnail worker
+    if document_thumbnail_service.wants_thumbnail(fixture.mime_type):
+        document.thumbnail_status = DOCUMENT_THUMBNAIL_PENDING
+    return document
+
+
+def _name(path: Path, copy: int) -> str:
+    """Document name for copy number ``copy``; copy 0 is the original."""
+    name = path.stem.replace("test", "Test Document").replace("_", " ")
+    return name if copy == 0 else f"{name} ({copy + 1})"
 
 
-def create_test_documents(session: Session) -> None:
-    """Creates test documents for the superuser."""
-    if settings.ENVIRONMENT != "local":
-        logger.info("Seed documents are disabled outside local environment")
+def create_test_documents(session: Session, scale: int = 1) -> None:
+    """
+    Creates test documents for the superuser: ``scale`` copies of every
+    fixture document.
+
+    Documents get a random category with CATEGORY_ASSIGNMENT_PROBABILITY.
+    Existing documents (same name) are kept, and get a category when they
+    have none. Files are copied concurrently, rows are inserted in bulk.
+    """
+    if settings.ENVIRONMENT == "production":
+        logger.info("Seed documents are disabled in production")
         return
 
     superuser = get_superuser(session)
@@ -132,69 +141,53 @@ def create_test_documents(session: Session) -> None:
 
     # Create categories first
     categories = create_test_categories(session)
-    session.commit()
-
-    # Get all document files
-    fixtures_dir = Path(__file__).parent.parent / "fixtures"
-    documents_dir = fixtures_dir / "documents"
-    if not documents_dir.exists():
-        logger.warning(f"Documents directory not found: {documents_dir}")
-        return
 
-    document_files = list(documents_dir.glob("test*.*"))
-    if not document_files:
+    fixtures = document_fixtures()
+    if not fixtures:
         logger.warning("No test document files found")
         return
 
-    # Create documents from files
-    created_count = 0
-    updated_count = 0
-    skipped_count = 0
-
-    for doc_file in document_files:
-        file_name = doc_file.name
-        document_name = doc_file.stem.replace("test", "Test Document").replace("_", " ")
+    def random_category() -> uuid.UUID | None:
+        if categories and random.random() < CATEGORY_ASSIGNMENT_PROBABILITY:
+            return random.choice(categories).id
+        return None
 
-        # Check if document already exists
-        existing_doc = session.exec(
-            select(Document).where(
-                Document.file_name == file_name,
+    existing: dict[str, uuid.UUID | None] = dict(
+        session.exec(
+            select(Document.name, Document.category_id).where(
                 Document.owner_id == superuser.id
             )
-        ).first()
-
-        # Randomly assign category (70% probability) or leave None (30% probability)
-        category_id = None
-        if categories and random.random() < CATEGORY_ASSIGNMENT_PROBABILITY:
-            category = random.choice(categories)
-            category_id = category.id
-
-        if existing_doc:
-            # Update existing document with category if it doesn't have one
-            if not existing_doc.category_id:
-                if category_id:
-                    existing_doc.category_id = category_id
-                    existing_doc.updated_at = datetime.now(timezone.utc)
-                    session.add(existing_doc)
-                    updated_count += 1
-                else:
-                    skipped_count += 1
-            else:
-                skipped_count += 1
-            continue
+        ).all()
+    )
 
-        save_document_from_file(
-            session=session,
-            document_file_name=file_name,
-            owner_id=superuser.id,
-            name=document_name,
-            category_id=category_id,
+    documents: list[tuple[DocumentFixture, Document]] = []
+    uncategorized: dict[uuid.UUID, list[str]] = defaultdict(list)
+    for copy in range(scale):
+        for fixture in fixtures:
+            name = _name(fixture.path, copy)
+            if name not in existing:
+                row = document_row(fixture, superuser.id, name, random_category())
+                documents.append((fixture, row))
+            elif existing[name] is None and (category_id := random_category()):
+                uncategorized[category_id].append(name)
+
+    # Give existing documents without a category one
+    for category_id, names in uncategorized.items():
+        session.execute(
+            update(Document)
+            .where(
+                col(Document.owner_id) == superuser.id,
+                col(Document.name).in_(names),
+                col(Document.category_id).is_(None),
+            )
+            .values(category_id=category_id, updated_at=datetime.now(timezone.utc))
         )
-        created_count += 1
 
+    put_files([(fixture.path, row.file_path, row.mime_type) for fixture, row in documents])
+    bulk_insert(session, [row for _, row in documents])
     session.commit()
     logger.info(
-        f"Created {created_count} test documents, "
-        f"updated {updated_count} existing, "
-        f"skipped {skipped_count} existing"
+        f"Created {len(documents)} test documents, "
+        f"updated {sum(map(len, uncategorized.values()))} existing, "
+        f"{len(existing)} already existed"
     )
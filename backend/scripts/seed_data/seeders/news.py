@@ -4,23 +4,32 @@ Test news and images creation.
 
 import logging
 import random
-from typing import Any
+import tempfile
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
 
-from sqlmodel import Session, select
+from sqlalchemy import delete
+from sqlmodel import Session, col, select
 
 from app.core.config import settings
 from app.models import News, NewsImage, User
-from app.repositories.news_repository import create_news
-from app.schemas import NewsCreate
 
 from ..constants import TEST_IMAGE_FILES
-from ..utils.image_handler import has_missing_image_files, save_image_from_file
+from ..utils.bulk import INSERT_CHUNK_SIZE, bulk_insert, put_files
+from ..utils.image_handler import (
+    PreparedImage,
+    has_missing_image_files,
+    prepare_images,
+)
 
 logger = logging.getLogger(__name__)
 
 # Constants for news creation
 MIN_NEWS_WITHOUT_IMAGES = 3
 IMAGE_PROBABILITY = 0.6  # Probability of adding images to news
+MAX_IMAGES_PER_NEWS = 3
 
 NEWS_DATA = [
     {
@@ -93,85 +102,69 @@ def get_superuser(session: Session) -> User | None:
     ).first()
 
 
-def add_images_to_news(
-    session: Session, news_id: Any, news_title: str
-) -> None:
-    """Adds random images to news."""
-    num_images = random.randint(1, 3)
-    selected_images = random.sample(
-        TEST_IMAGE_FILES, min(num_images, len(TEST_IMAGE_FILES))
-    )
-
-    for order, image_file in enumerate(selected_images, start=1):
-        save_image_from_file(session, news_id, image_file, order)
-
-    session.commit()
-    logger.info(f"Added {len(selected_images)} image(s) to news '{news_title}'")
-
-
-def create_news_item(
-    session: Session,
-    superuser: User,
-    news_data: dict[str, str],
-    index: int,
-    news_without_images_count: int,
-    min_news_without_images: int,
-) -> None:
-    """Creates a single news item with optional images."""
-    news_title = news_data["title"]
-
-    existing_news = session.exec(
-        select(News).where(
-            News.title == news_title, News.owner_id == superuser.id
+def _title(news_data: dict[str, str], copy: int) -> str:
+    """Title of copy number ``copy``; copy 0 is the original."""
+    return news_data["title"] if copy == 0 else f"{news_data['title']} #{copy + 1}"
+
+
+def _image_rows(
+    news_id: uuid.UUID, prepared: list[PreparedImage]
+) -> list[tuple[NewsImage, PreparedImage]]:
+    """Random images (1 to MAX_IMAGES_PER_NEWS) for a news item."""
+    count = random.randint(1, MAX_IMAGES_PER_NEWS)
+    return [
+        (
+            NewsImage(
+                news_id=news_id,
+                file_name=image.file_name,
+                file_path=f"news/{news_id}/{uuid.uuid4()}.jpg",
+                file_size=image.processed.file_size,
+                mime_type="image/jpeg",
+                width=image.processed.width,
+                height=image.processed.height,
+                placeholder=image.processed.placeholder,
+                order=order,
+                created_at=datetime.now(timezone.utc),
+            ),
+            image,
         )
-    ).first()
-
-    if existing_news:
-        existing_images = session.exec(
-            select(NewsImage).where(NewsImage.news_id == existing_news.id)
-        ).all()
-
-        if not existing_images or has_missing_image_files(list(existing_images)):
-            for image in existing_images:
-                session.delete(image)
-            session.commit()
-
-            if news_without_images_count >= min_news_without_images:
-                add_images_to_news(session, existing_news.id, existing_news.title)
-
-        logger.info(f"News '{news_title}' already exists, skipping")
-        return
-
-    is_published = index % 5 != 0  # Every 5th news is unpublished
-
-    news_in = NewsCreate(
-        title=news_title,
-        content=news_data["content"],
-        is_published=is_published,
-    )
-
-    news = create_news(
-        session=session, news_in=news_in, owner_id=superuser.id
-    )
-    session.commit()
-    session.refresh(news)
-
-    should_add_images = False
-    if news_without_images_count < min_news_without_images:
-        should_add_images = False
-    else:
-        should_add_images = random.random() < IMAGE_PROBABILITY
-
-    if should_add_images:
-        add_images_to_news(session, news.id, news_in.title)
-
-    logger.info(f"Created news '{news_in.title}' for user {superuser.email}")
-
-
-def create_test_news(session: Session) -> None:
-    """Creates test news for the superuser."""
-    if settings.ENVIRONMENT != "local":
-        logger.info("Seed news is disabled outside local environment")
+        for order, image in enumerate(
+            random.sample(prepared, min(count, len(prepared))), start=1
+        )
+    ]
+
+
+def _news_to_repair(session: Session, news_ids: list[uuid.UUID]) -> list[uuid.UUID]:
+    """Existing news without images or with image files gone; their rows are deleted."""
+    wanted = set(news_ids)
+    images: dict[uuid.UUID, list[NewsImage]] = defaultdict(list)
+    # All rows rather than an IN list: there may be more ids than bind parameters
+    for image in session.exec(select(NewsImage)).all():
+        if image.news_id in wanted:
+            images[image.news_id].append(image)
+    repair = [
+        news_id
+        for news_id in news_ids
+        if not images[news_id] or has_missing_image_files(images[news_id])
+    ]
+    for start in range(0, len(repair), INSERT_CHUNK_SIZE):
+        chunk = repair[start : start + INSERT_CHUNK_SIZE]
+        session.execute(delete(NewsImage).where(col(NewsImage.news_id).in_(chunk)))
+    return repair
+
+
+def create_test_news(session: Session, scale: int = 1) -> None:
+    """
+    Creates test news for the superuser: ``scale`` copies of NEWS_DATA.
+
+    News are spread back in time one minute apart; every 5th is unpublished
+    and, after the first MIN_NEWS_WITHOUT_IMAGES, news get images with
+    IMAGE_PROBABILITY. Existing news (same title) are kept, but get new
+    images when theirs are missing. Fixture images are normalized once on a
+    process pool and copied for every image row; rows are inserted in bulk.
+    """
+    if settings.ENVIRONMENT == "production":
+        logger.info("Seed news is disabled in production")
         return
 
     superuser = get_superuser(session)
@@ -179,17 +172,59 @@ def create_test_news(session: Session) -> None:
         logger.warning("Superuser not found, cannot create test news")
         return
 
-    news_without_images_count = 0
-
-    for i, news_data in enumerate(NEWS_DATA, start=1):
-        if news_without_images_count < MIN_NEWS_WITHOUT_IMAGES:
-            news_without_images_count += 1
+    existing: dict[str, uuid.UUID] = dict(
+        session.exec(
+            select(News.title, News.id).where(News.owner_id == superuser.id)
+        ).all()
+    )
 
-        create_news_item(
-            session=session,
-            superuser=superuser,
-            news_data=news_data,
-            index=i,
-            news_without_images_count=news_without_images_count,
-            min_news_without_images=MIN_NEWS_WITHOUT_IMAGES,
-        )
+    now = datetime.now(timezone.utc)
+    news: list[News] = []
+    with_images: list[uuid.UUID] = []
+    existing_with_images: list[uuid.UUID] = []
+    index = 0
+    for copy in range(scale):
+        for news_data in NEWS_DATA:
+            index += 1
+            wants_images = index > MIN_NEWS_WITHOUT_IMAGES
+            title = _title(news_data, copy)
+            if title in existing:
+                if wants_images:
+                    existing_with_images.append(existing[title])
+                continue
+
+            created_at = now - timedelta(minutes=index - 1)
+            is_published = index % 5 != 0  # Every 5th news is unpublished
+            item = News(
+                title=title,
+                content=news_data["content"],
+                is_published=is_published,
+                owner_id=superuser.id,
+                published_at=created_at if is_published else None,
+                created_at=created_at,
+                updated_at=created_at,
+            )
+            news.append(item)
+            if wants_images and random.random() < IMAGE_PROBABILITY:
+                with_images.append(item.id)
+
+    with_images += _news_to_repair(session, existing_with_images)
+
+    images: list[tuple[NewsImage, PreparedImage]] = []
+    with tempfile.TemporaryDirectory(prefix="seed-images-") as temp_dir:
+        if with_images:
+            prepared = prepare_images(TEST_IMAGE_FILES, Path(temp_dir))
+            if prepared:
+                for news_id in with_images:
+                    images += _image_rows(news_id, prepared)
+                put_files(
+                    [(image.path, row.file_path, row.mime_type) for row, image in images]
+                )
+
+    bulk_insert(session, news)
+    bulk_insert(session, [row for row, _ in images])
+    session.commit()
+    logger.info(
+        f"Created {len(news)} news ({len(existing)} already existed) "
+        f"and {len(images)} images for user {superuser.email}"
+    )
@@ -8,6 +8,8 @@ from sqlmodel import Session, select
 
 from app.models import Person, Position
 
+from ..utils.bulk import bulk_insert
+
 logger = logging.getLogger(__name__)
 
 TEST_PERSONS = [
@@ -104,46 +106,62 @@ TEST_PERSONS = [
 ]
 
 
-def create_test_persons(session: Session) -> None:
-    """Creates test persons."""
-    for person_data in TEST_PERSONS:
-        existing = session.exec(
-            select(Person).where(
-                Person.last_name == person_data["last_name"],
-                Person.first_name == person_data["first_name"],
-                Person.middle_name == person_data["middle_name"],
-            )
-        ).first()
+def _copy_of(person_data: dict[str, str], copy: int) -> dict[str, str]:
+    """Person data for copy number ``copy``; copy 0 is the original."""
+    if copy == 0:
+        return person_data
+    local_part, domain = person_data["email"].split("@")
+    return {
+        **person_data,
+        # Full names, phones and emails are unique
+        "last_name": f"{person_data['last_name']} {copy + 1}",
+        "phone": f"{person_data['phone']} доб. {copy + 1}",
+        "email": f"{local_part}+{copy + 1}@{domain}",
+    }
 
-        if existing:
-            logger.info(
-                f"Person '{person_data['last_name']} {person_data['first_name']}' "
-                "already exists, skipping"
-            )
-            continue
 
-        position = session.exec(
-            select(Position).where(Position.name == person_data["position"])
-        ).first()
+def create_test_persons(session: Session, scale: int = 1) -> None:
+    """
+    Creates test persons: ``scale`` copies of TEST_PERSONS.
+
+    Existing persons (same full name) are kept, the others are inserted in
+    bulk.
+    """
+    positions = {
+        position.name: position for position in session.exec(select(Position)).all()
+    }
+    existing = {
+        tuple(row)
+        for row in session.exec(
+            select(Person.last_name, Person.first_name, Person.middle_name)
+        ).all()
+    }
 
-        if not position:
-            logger.warning(
-                f"Position '{person_data['position']}' not found, skipping person"
+    persons = []
+    for copy in range(scale):
+        for person_data in TEST_PERSONS:
+            data = _copy_of(person_data, copy)
+            full_name = (data["last_name"], data["first_name"], data["middle_name"])
+            if full_name in existing:
+                continue
+            position = positions.get(data["position"])
+            if not position:
+                logger.warning(
+                    f"Position '{data['position']}' not found, skipping person"
+                )
+                continue
+            persons.append(
+                Person(
+                    last_name=data["last_name"],
+                    first_name=data["first_name"],
+                    middle_name=data["middle_name"],
+                    phone=data["phone"],
+                    email=data["email"],
+                    description=data["description"],
+                    position_id=position.id,
+                )
             )
-            continue
 
-        person = Person(
-            last_name=person_data["last_name"],
-            first_name=person_data["first_name"],
-            middle_name=person_data["middle_name"],
-            phone=person_data["phone"],
-            email=person_data["email"],
-            description=person_data["description"],
-            position_id=position.id,
-        )
-        session.add(person)
-        session.commit()
-        session.refresh(person)
-        logger.info(
-            f"Created person: {person.last_name} {person.first_name} ({position.name})"
-        )
+    bulk_insert(session, persons)
+    session.commit()
+    logger.info(f"Created {len(persons)} persons, {len(existing)} already existed")
@@ -5,10 +5,12 @@ Test positions creation.
 import logging
 from dataclasses import dataclass
 
-from sqlmodel import Session, select
+from sqlmodel import Session, col, select
 
 from app.models import Position
 
+from ..utils.bulk import bulk_insert
+
 logger = logging.getLogger(__name__)
 
 
@@ -35,27 +37,24 @@ TEST_POSITIONS = [
 
 def create_test_positions(session: Session) -> dict[str, Position]:
     """Creates test positions and returns a mapping of name to Position."""
-    positions_map: dict[str, Position] = {}
-
-    for config in TEST_POSITIONS:
-        existing = session.exec(
-            select(Position).where(Position.name == config.name)
-        ).first()
-
-        if existing:
-            logger.info(f"Position '{config.name}' already exists, skipping")
-            positions_map[config.name] = existing
-            continue
-
-        position = Position(
-            name=config.name,
-            is_management=config.is_management,
-            is_director=config.is_director,
-        )
-        session.add(position)
-        session.commit()
-        session.refresh(position)
-        positions_map[config.name] = position
-        logger.info(f"Created position: {config.name}")
-
-    return positions_map
+    names = [config.name for config in TEST_POSITIONS]
+    existing = set(
+        session.exec(select(Position.name).where(col(Position.name).in_(names))).all()
+    )
+    created = bulk_insert(
+        session,
+        [
+            Position(
+                name=config.name,
+                is_management=config.is_management,
+                is_director=config.is_director,
+            )
+            for config in TEST_POSITIONS
+            if config.name not in existing
+        ],
+    )
+    session.commit()
+    logger.info(f"Created {created} positions, {len(existing)} already existed")
+
+    positions = session.exec(select(Position).where(col(Position.name).in_(names))).all()
+    return {position.name: position for position in positions}
@@ -4,11 +4,12 @@ Test user creation.
 
 import logging
 
-from sqlmodel import Session, select
+from sqlmodel import Session, col, select
 
+from app.core.security import get_password_hash
 from app.models import User
-from app.repositories.user_repository import create_user
-from app.schemas import UserCreate
+
+from ..utils.bulk import bulk_insert
 
 logger = logging.getLogger(__name__)
 
@@ -20,23 +21,30 @@ TEST_USERS = [
 
 
 def create_test_users(session: Session) -> None:
-    """Creates test users."""
-    for user_data in TEST_USERS:
-        existing_user = session.exec(
-            select(User).where(User.email == user_data["email"])
-        ).first()
-
-        if existing_user:
-            logger.info(f"User '{user_data['email']}' already exists, skipping")
-            continue
-
-        user_in = UserCreate(
-            email=user_data["email"],
-            password="changethis",
-            nickname=user_data["nickname"],
-            is_active=True,
-        )
-        test_user = create_user(session=session, user_create=user_in)
-        session.commit()
-        session.refresh(test_user)
-        logger.info(f"Created test user: {test_user.email}")
+    """Creates test users in one statement; existing ones are kept."""
+    emails = [user_data["email"] for user_data in TEST_USERS]
+    existing = set(
+        session.exec(select(User.email).where(col(User.email).in_(emails))).all()
+    )
+    missing = [user_data for user_data in TEST_USERS if user_data["email"] not in existing]
+    if not missing:
+        logger.info("Test users already exist, skipping")
+        return
+
+    # bcrypt is slow by design: every test user gets the same hash
+    hashed_password = get_password_hash("changethis")
+    bulk_insert(
+        session,
+        [
+            User(
+                email=user_data["email"],
+                nickname=user_data["nickname"],
+                hashed_password=hashed_password,
+                is_active=True,
+                is_superuser=False,
+            )
+            for user_data in missing
+        ],
+    )
+    session.commit()
+    logger.info(f"Created {len(missing)} test users")
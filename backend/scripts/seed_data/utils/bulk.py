@@ -0,0 +1,89 @@
+"""
+Bulk row insertion and file uploads for seed data.
+
+Rows are built as model instances (so column defaults such as ids and
+timestamps come from the models) and written without the ORM unit of work:
+COPY on PostgreSQL with psycopg, multi-row INSERT statements elsewhere.
+"""
+
+import logging
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import Table, insert
+from sqlmodel import Session, SQLModel
+
+from app.core.storage import storage
+
+logger = logging.getLogger(__name__)
+
+# Rows per INSERT statement when COPY is not available
+INSERT_CHUNK_SIZE = 1000
+# Uploads are I/O bound (local disk or S3)
+PUT_WORKERS = 16
+
+
+def _row(obj: SQLModel, table: Table) -> dict[str, Any]:
+    return {column.name: getattr(obj, column.key) for column in table.columns}
+
+
+def _copy(session: Session, table: Table, rows: list[dict[str, Any]]) -> None:
+    from psycopg import sql
+
+    columns = list(rows[0])
+    statement = sql.SQL("COPY {} ({}) FROM STDIN").format(
+        sql.Identifier(table.name),
+        sql.SQL(", ").join(sql.Identifier(column) for column in columns),
+    )
+    # Same connection and transaction as the session
+    connection = session.connection().connection.driver_connection
+    with connection.cursor() as cursor, cursor.copy(statement) as copy:
+        for row in rows:
+            copy.write_row([row[column] for column in columns])
+
+
+def bulk_insert(session: Session, objects: Sequence[SQLModel]) -> int:
+    """
+    Insert new model instances of one table in the session's transaction.
+
+    The instances are not added to the session; it does not know about the
+    rows afterwards. Nothing is committed.
+
+    Args:
+        session: Session whose transaction receives the rows
+        objects: Instances of one table model, with all values set
+
+    Returns:
+        Number of rows inserted
+    """
+    if not objects:
+        return 0
+    table: Table = type(objects[0]).__table__  # type: ignore[attr-defined]
+    rows = [_row(obj, table) for obj in objects]
+    dialect = session.get_bind().dialect
+    if dialect.name == "postgresql" and dialect.driver == "psycopg":
+        _copy(session, table, rows)
+    else:
+        for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+            session.execute(insert(table).values(rows[start : start + INSERT_CHUNK_SIZE]))
+    logger.debug("Inserted %d %s rows", len(rows), table.name)
+    return len(rows)
+
+
+def put_files(files: Sequence[tuple[Path, str, str]]) -> None:
+    """
+    Put local files into upload storage concurrently.
+
+    Args:
+        files: (local path, storage key, content type) of every upload
+    """
+
+    def put(file: tuple[Path, str, str]) -> int:
+        path, key, content_type = file
+        return storage.put_file(key, path, content_type=content_type)
+
+    with ThreadPoolExecutor(max_workers=PUT_WORKERS) as pool:
+        # list() re-raises the first failure
+        list(pool.map(put, files))
@@ -0,0 +1,118 @@
+"""
+Listing queries must be able to use their indexes.
+
+Each hot listing query is explained with sequential scans disabled, so the
+planner picks an index whenever one matches the WHERE/ORDER BY shape
+regardless of table size. A failure means a query or a migration changed and
+the two no longer match. Needs a migrated PostgreSQL database (the app
+settings' POSTGRES_*); skipped when none is reachable.
+"""
+
+import json
+import uuid
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+from sqlalchemy import func, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql import Select
+from sqlmodel import Session, select
+
+from app.models import Document, News, NewsImage, Person
+
+_SAMPLE_ID = uuid.UUID(int=0)
+_PUBLISHED = News.is_published.is_(True)  # type: ignore[union-attr]
+
+# Query shapes used by routes, paired with the index each one must use
+LISTING_QUERIES: list[tuple[str, Select[Any], str]] = [
+    (
+        "public news feed",
+        select(News)
+        .where(_PUBLISHED)
+        .order_by(News.published_at.desc().nulls_last(), News.created_at.desc())  # type: ignore[union-attr]
+        .limit(10),
+        "ix_news_published_feed",
+    ),
+    (
+        "public news count",
+        select(func.count()).select_from(News).where(_PUBLISHED),
+        "ix_news_published_feed",
+    ),
+    (
+        "admin news list",
+        select(News).order_by(News.created_at.desc()).limit(100),  # type: ignore[union-attr]
+        "ix_news_created_at",
+    ),
+    (
+        "news images",
+        select(NewsImage)
+        .where(NewsImage.news_id == _SAMPLE_ID)
+        .order_by(NewsImage.order),  # type: ignore[arg-type]
+        "ix_newsimage_news_id_order",
+    ),
+    (
+        "documents by category",
+        select(Document)
+        .where(Document.category_id == _SAMPLE_ID)
+        .order_by(Document.created_at.desc())  # type: ignore[union-attr]
+        .limit(100),
+        "ix_document_category_id_created_at",
+    ),
+    (
+        "all documents",
+        select(Document).order_by(Document.created_at.desc()).limit(100),  # type: ignore[union-attr]
+        "ix_document_created_at",
+    ),
+    (
+        "persons by position",
+        select(Person).where(Person.position_id == _SAMPLE_ID),
+        "ix_person_position_id",
+    ),
+    (
+        "persons list",
+        select(Person)
+        .order_by(Person.last_name, Person.first_name, Person.middle_name)
+        .limit(100),
+        "uq_person_full_name",
+    ),
+]
+
+
+@pytest.fixture(scope="module")
+def session() -> Iterator[Session]:
+    try:
+        from app.core.db import engine
+
+        connection = engine.connect()
+    except Exception as e:
+        pytest.skip(f"PostgreSQL is not available: {e}")
+    with connection, Session(bind=connection) as session:
+        if connection.dialect.name != "postgresql":
+            pytest.skip("Query plans are checked on PostgreSQL only")
+        session.execute(text("SET LOCAL enable_seqscan = off"))
+        yield session
+        session.rollback()
+
+
+def _index_names(plan: dict[str, Any]) -> Iterator[str]:
+    if "Index Name" in plan:
+        yield plan["Index Name"]
+    for child in plan.get("Plans", []):
+        yield from _index_names(child)
+
+
+@pytest.mark.parametrize(
+    ("statement", "expected"),
+    [(statement, expected) for _, statement, expected in LISTING_QUERIES],
+    ids=[name for name, _, _ in LISTING_QUERIES],
+)
+def test_listing_query_uses_index(
+    session: Session, statement: Select[Any], expected: str
+) -> None:
+    sql = statement.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    raw = session.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar_one()
+    plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+    assert expected in set(_index_names(plan))
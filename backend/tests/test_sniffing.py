@@ -0,0 +1,105 @@
+import io
+import os
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from app.core.sniffing import (
+    DOCX,
+    PPTX,
+    SNIFF_BYTES,
+    XLSX,
+    ooxml_type,
+    sniff,
+    sniff_file,
+)
+
+
+def _zip(entries: list[tuple[str, bytes]]) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in entries:
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+def _openpyxl_like(rows: int) -> bytes:
+    """Workbook with entries in openpyxl's order: [Content_Types].xml last."""
+    cells = "".join(
+        f'<row r="{i}"><c r="A{i}"><v>{i}</v></c></row>' for i in range(1, rows + 1)
+    )
+    return _zip(
+        [
+            ("docProps/app.xml", b"<Properties/>"),
+            ("docProps/core.xml", b"<cp:coreProperties/>"),
+            ("xl/theme/theme1.xml", b"<a:theme/>"),
+            ("xl/worksheets/sheet1.xml", f"<worksheet>{cells}</worksheet>".encode()),
+            ("xl/workbook.xml", b"<workbook/>"),
+            ("_rels/.rels", b"<Relationships/>"),
+            ("[Content_Types].xml", b"<Types/>"),
+        ]
+    )
+
+
+def test_large_xlsx_with_content_types_last(tmp_path: Path) -> None:
+    data = _openpyxl_like(rows=100_000)
+    assert len(data) > 10 * SNIFF_BYTES
+    assert b"[Content_Types].xml" not in data[:SNIFF_BYTES]
+
+    path = tmp_path / "upload"
+    path.write_bytes(data)
+    assert sniff_file(path) == XLSX
+    assert sniff(data[:SNIFF_BYTES]) == XLSX
+
+
+@pytest.mark.parametrize(
+    ("part", "mime_type"),
+    [("word/document.xml", DOCX), ("ppt/presentation.xml", PPTX)],
+)
+def test_part_name_without_content_types(part: str, mime_type: str) -> None:
+    data = _zip([("docProps/app.xml", b"<Properties/>"), (part, b"<x/>")])
+    assert sniff(data, complete=True) == mime_type
+
+
+def test_zip_without_known_part_in_head_uses_hints() -> None:
+    # Incompressible first entry pushes every part name past the head
+    data = _zip(
+        [
+            ("docProps/thumbnail.jpeg", os.urandom(2 * SNIFF_BYTES)),
+            ("xl/workbook.xml", b"<workbook/>"),
+        ]
+    )
+    head = data[:SNIFF_BYTES]
+    assert sniff(head, filename="report.xlsx") == XLSX
+    assert sniff(head, claimed=DOCX) == DOCX
+    assert sniff(head) is None
+
+
+def test_central_directory_confirms_hinted_type(tmp_path: Path) -> None:
+    path = tmp_path / "report.xlsx"
+    path.write_bytes(
+        _zip(
+            [
+                ("docProps/thumbnail.jpeg", os.urandom(2 * SNIFF_BYTES)),
+                ("xl/workbook.xml", b"<workbook/>"),
+                ("[Content_Types].xml", b"<Types/>"),
+            ]
+        )
+    )
+    assert ooxml_type(path) == XLSX
+    assert sniff_file(path) == XLSX
+
+
+def test_arbitrary_zip_is_not_a_document(tmp_path: Path) -> None:
+    path = tmp_path / "report.docx"
+    path.write_bytes(_zip([("payload.bin", os.urandom(2 * SNIFF_BYTES))]))
+    assert sniff(path.read_bytes()[:SNIFF_BYTES], filename=path.name) == DOCX
+    assert ooxml_type(path) is None
+    assert sniff_file(path) is None
+
+
+def test_parts_without_content_types_are_not_a_document(tmp_path: Path) -> None:
+    path = tmp_path / "report.docx"
+    path.write_bytes(_zip([("word/document.xml", b"<x/>")]))
+    assert ooxml_type(path) is None
@@ -31,6 +31,8 @@ export const errorMessages: Record<string, string> = {
   DOCUMENT_NOT_FOUND: "Документ не найден",
   DOCUMENT_FILE_NOT_FOUND: "Файл документа не найден",
   DOCUMENT_FORBIDDEN: "Недостаточно прав для этого действия",
+  DOCUMENT_EXPORT_INVALID: "Выберите категорию или документы для скачивания",
+  DOCUMENT_EXPORT_TOO_LARGE: "Слишком много документов для одного архива",
 
   // Document Categories
   CATEGORY_NOT_FOUND: "Категория не найдена",
@@ -19,6 +19,8 @@ import { routeTree } from "./routeTree.gen"
 // Auth function reads from localStorage dynamically, so no need to update on every change
 client.setConfig({
   baseURL: import.meta.env.VITE_API_URL || "",
+  // Send the API's read-your-writes cookie so reads after edits skip the replica
+  withCredentials: true,
   auth: async (auth) => {
     // Return token for bearer auth scheme
     if (auth.scheme === 'bearer') {